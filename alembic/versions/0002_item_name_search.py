@@ -0,0 +1,69 @@
+"""item name search
+
+Adds a pg_trgm GIN index on items.name for PostgreSQL and an FTS5
+trigram table kept in sync by triggers for SQLite. Databases without
+pg_trgm or the FTS5 trigram tokenizer are left as they are, and item
+search falls back to LIKE.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 09:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from app.models.item import create_pg_trgm, supports_fts5_trigram
+
+
+# revision identifiers, used by Alembic.
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    dialect = bind.dialect.name
+
+    if dialect == 'postgresql' and create_pg_trgm(bind):
+        op.create_index(
+            'ix_items_name_trgm',
+            'items',
+            ['name'],
+            postgresql_using='gin',
+            postgresql_ops={'name': 'gin_trgm_ops'},
+        )
+    elif dialect == 'sqlite' and supports_fts5_trigram(bind):
+        op.execute(
+            "CREATE VIRTUAL TABLE items_fts USING fts5("
+            "name, content='items', content_rowid='id', tokenize='trigram')"
+        )
+        op.execute(
+            "CREATE TRIGGER items_fts_ai AFTER INSERT ON items BEGIN "
+            "INSERT INTO items_fts(rowid, name) VALUES (new.id, new.name); END"
+        )
+        op.execute(
+            "CREATE TRIGGER items_fts_ad AFTER DELETE ON items BEGIN "
+            "INSERT INTO items_fts(items_fts, rowid, name) VALUES ('delete', old.id, old.name); END"
+        )
+        op.execute(
+            "CREATE TRIGGER items_fts_au AFTER UPDATE OF name ON items BEGIN "
+            "INSERT INTO items_fts(items_fts, rowid, name) VALUES ('delete', old.id, old.name); "
+            "INSERT INTO items_fts(rowid, name) VALUES (new.id, new.name); END"
+        )
+        # Index rows that existed before the migration
+        op.execute("INSERT INTO items_fts(items_fts) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    dialect = op.get_bind().dialect.name
+
+    if dialect == 'postgresql':
+        op.execute("DROP INDEX IF EXISTS ix_items_name_trgm")
+    elif dialect == 'sqlite':
+        op.execute("DROP TRIGGER IF EXISTS items_fts_au")
+        op.execute("DROP TRIGGER IF EXISTS items_fts_ad")
+        op.execute("DROP TRIGGER IF EXISTS items_fts_ai")
+        op.execute("DROP TABLE IF EXISTS items_fts")
@@ -1,7 +1,19 @@
 from fastapi import Depends, Query
-from typing import Optional
+from typing import List, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.config import settings
 from app.core.exceptions import ValidationException
+from app.models.base import get_db, get_session_factory
+from app.repositories.item_repository import ITEM_COLUMNS
+from app.repositories.user_repository import USER_COLUMNS
+from app.services.item_service import ItemService
+from app.services.user_service import UserService
+from app.utils.fields import parse_fields
+from app.utils.pagination import CountMode, decode_cursor
+
+# Field names of each resource, in response order
+ITEM_FIELDS = [column.key for column in ITEM_COLUMNS]
+USER_FIELDS = [column.key for column in USER_COLUMNS]
 
 
 def get_pagination_params(
@@ -15,13 +27,86 @@ def get_pagination_params(
         default=0,
         ge=0,
         description="Number of items to skip (offset)"
+    ),
+    after: Optional[str] = Query(
+        default=None,
+        description="Cursor from a previous page's next_cursor; when set, offset is ignored"
     )
-) -> tuple[int, int]:
+) -> tuple[int, int, Optional[int]]:
     """
     Dependency for pagination parameters.
-    Returns a tuple of (limit, offset).
+    Returns a tuple of (limit, offset, after_id), where after_id is the
+    decoded cursor position or None in offset mode.
     """
     if limit > settings.MAX_LIMIT:
         raise ValidationException(f"Maximum limit is {settings.MAX_LIMIT}")
     
-    return limit, offset
+    after_id = decode_cursor(after) if after is not None else None
+    
+    return limit, offset, after_id
+
+
+def get_count_mode(
+    count: Optional[CountMode] = Query(
+        default=None,
+        description="Total count strategy: exact, estimated, cached or none"
+    )
+) -> CountMode:
+    """
+    Dependency for the total count strategy.
+    Falls back to the DEFAULT_COUNT_MODE setting.
+    """
+    return count or CountMode(settings.DEFAULT_COUNT_MODE)
+
+
+def get_item_fields(
+    fields: Optional[str] = Query(
+        default=None,
+        description="Comma-separated item fields to return, e.g. id,name,price; id and updated_at are always included"
+    )
+) -> Optional[List[str]]:
+    """
+    Dependency for the item sparse fieldset.
+    Returns None when all fields are requested.
+    """
+    return parse_fields(fields, ITEM_FIELDS)
+
+
+def get_user_fields(
+    fields: Optional[str] = Query(
+        default=None,
+        description="Comma-separated user fields to return, e.g. id,username; id and updated_at are always included"
+    )
+) -> Optional[List[str]]:
+    """
+    Dependency for the user sparse fieldset.
+    Returns None when all fields are requested.
+    """
+    return parse_fields(fields, USER_FIELDS)
+
+
+def validate_bulk_size(size: int) -> None:
+    """
+    Check the number of rows in a bulk request.
+    Raises ValidationException when it is empty or above BULK_MAX_ITEMS.
+    """
+    if size == 0:
+        raise ValidationException("At least one row is required")
+    if size > settings.BULK_MAX_ITEMS:
+        raise ValidationException(f"Maximum batch size is {settings.BULK_MAX_ITEMS}")
+
+
+def get_item_service(db: AsyncSession = Depends(get_db)) -> ItemService:
+    """
+    Dependency for the item service.
+    Binds the service to the session of the current request.
+    """
+    return ItemService(db)
+
+
+def get_user_service(db: AsyncSession = Depends(get_db)) -> UserService:
+    """
+    Dependency for the user service.
+    Binds the service to the session of the current request.
+    """
+    return UserService(db)
@@ -1,86 +1,231 @@
-from fastapi import APIRouter, Depends, Path, Body
+from fastapi import APIRouter, Depends, Path, Body, Query, Request
 from typing import List, Optional
-from app.api.dependencies import get_pagination_params
-from app.schemas.item import ItemCreate, ItemResponse, ItemUpdate
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from app.api.dependencies import (
+    ITEM_FIELDS,
+    get_pagination_params,
+    get_count_mode,
+    get_item_fields,
+    get_item_service,
+    get_session_factory,
+    validate_bulk_size,
+)
+from app.schemas.item import ItemBulkDelete, ItemBulkUpdate, ItemCreate, ItemResponse, ItemSort, ItemUpdate
 from app.services.item_service import ItemService
-from app.core.exceptions import NotFoundException
+from app.core.exceptions import NotFoundException, ValidationException
+from app.utils.conditional import (
+    collection_etag,
+    entity_etag,
+    is_not_modified,
+    not_modified_response,
+    set_etag,
+)
+from app.utils.bulk_import import read_records
+from app.utils.export import ExportFormat, export_response
+from app.utils.pagination import CountMode, next_cursor
 from app.utils.response import success_response, pagination_response
 
 router = APIRouter()
-item_service = ItemService()
 
 
-@router.get("/", response_model_exclude_none=True)
+@router.get("/")
 async def get_items(
-    pagination: tuple[int, int] = Depends(get_pagination_params),
-    name: Optional[str] = None
+    request: Request,
+    pagination: tuple[int, int, Optional[int]] = Depends(get_pagination_params),
+    name: Optional[str] = None,
+    sort: ItemSort = Query(default=ItemSort.ID, description="Order by id, or by relevance when searching by name"),
+    count_mode: CountMode = Depends(get_count_mode),
+    fields: Optional[List[str]] = Depends(get_item_fields),
+    item_service: ItemService = Depends(get_item_service)
 ):
     """
     Get all items with pagination.
     
     - **limit**: Maximum number of items to return
     - **offset**: Number of items to skip
+    - **after**: Cursor from `next_cursor` of the previous page (optional, replaces offset)
     - **name**: Filter by name (optional)
+    - **sort**: `id` (default) or `relevance` to rank name matches; relevance is offset-only
+    - **count**: Total count strategy: exact, estimated, cached or none (optional)
+    - **fields**: Comma-separated fields to return, e.g. `id,name` (optional)
+    
+    Supports conditional requests with `If-None-Match`.
     """
-    limit, offset = pagination
-    items, total = item_service.get_items(limit=limit, offset=offset, name=name)
+    limit, offset, after_id = pagination
+    if sort == ItemSort.RELEVANCE and after_id is not None:
+        raise ValidationException("Cursor pagination is only supported with sort=id")
     
-    return pagination_response(
-        items=items,
-        total=total,
+    page = await item_service.get_items(
         limit=limit,
-        offset=offset
+        offset=offset,
+        name=name,
+        after_id=after_id,
+        count_mode=count_mode,
+        sort=sort,
+        fields=fields
     )
+    etag = collection_etag("items", page, fields)
+    if is_not_modified(request, etag):
+        return not_modified_response(etag)
+    
+    response = pagination_response(
+        items=page.items,
+        total=page.total,
+        limit=limit,
+        offset=offset,
+        next_cursor=next_cursor(page.items, limit) if sort == ItemSort.ID else None,
+        has_more=page.has_more,
+        count_mode=page.count_mode.value
+    )
+    set_etag(response, etag)
+    return response
+
+
+@router.get("/export")
+async def export_items(
+    name: Optional[str] = None,
+    format: ExportFormat = Query(default=ExportFormat.NDJSON, description="Body format: ndjson or csv"),
+    fields: Optional[List[str]] = Depends(get_item_fields),
+    sessions: async_sessionmaker = Depends(get_session_factory),
+    item_service: ItemService = Depends(get_item_service)
+):
+    """
+    Export all items as a streamed download.
+    
+    - **name**: Filter by name (optional)
+    - **format**: `ndjson` (default, one item per line) or `csv`
+    - **fields**: Comma-separated fields to return, e.g. `id,name` (optional)
+    
+    Items are read with a server-side cursor and sent as they are read, in ID order.
+    """
+    batches = await item_service.stream_items(sessions, name=name, fields=fields)
+    return export_response(batches, format, "items", fields or ITEM_FIELDS)
+
+
+@router.post("/bulk", status_code=201)
+async def create_items(
+    items_data: List[ItemCreate] = Body(...),
+    item_service: ItemService = Depends(get_item_service)
+):
+    """
+    Create several items in one transaction.
+    """
+    validate_bulk_size(len(items_data))
+    results = await item_service.create_items(items_data)
+    return success_response({"results": results}, status_code=201)
+
+
+@router.patch("/bulk")
+async def update_items(
+    items_data: List[ItemBulkUpdate] = Body(...),
+    item_service: ItemService = Depends(get_item_service)
+):
+    """
+    Update several items in one transaction.
+    
+    Each row carries the item `id` and the fields to change.
+    """
+    validate_bulk_size(len(items_data))
+    results = await item_service.update_items(items_data)
+    return success_response({"results": results})
+
+
+@router.delete("/bulk")
+async def delete_items(
+    delete_data: ItemBulkDelete = Body(...),
+    item_service: ItemService = Depends(get_item_service)
+):
+    """
+    Delete several items in one transaction.
+    """
+    validate_bulk_size(len(delete_data.ids))
+    results = await item_service.delete_items(delete_data.ids)
+    return success_response({"results": results})
+
+
+@router.post("/import")
+async def import_items(
+    request: Request,
+    format: ExportFormat = Query(default=ExportFormat.NDJSON, description="Body format: ndjson or csv"),
+    item_service: ItemService = Depends(get_item_service)
+):
+    """
+    Import items from an NDJSON or CSV body, e.g. a file from `/export`.
+    
+    - **format**: `ndjson` (default, one item per line) or `csv` with a header row
+    
+    The body is parsed as it is received and inserted in transactions of
+    `IMPORT_BATCH_SIZE` rows. Rows that fail validation or are rejected
+    by the database are listed by line number; the rest are imported.
+    """
+    result = await item_service.import_items(read_records(request.stream(), format))
+    return success_response(result.to_dict())
 
 
-@router.get("/{item_id}", response_model_exclude_none=True)
+@router.get("/{item_id}")
 async def get_item(
-    item_id: int = Path(..., description="The ID of the item to get")
+    request: Request,
+    item_id: int = Path(..., description="The ID of the item to get"),
+    fields: Optional[List[str]] = Depends(get_item_fields),
+    item_service: ItemService = Depends(get_item_service)
 ):
     """
     Get a specific item by ID.
+    
+    - **fields**: Comma-separated fields to return, e.g. `id,name` (optional)
+    
+    Supports conditional requests with `If-None-Match`.
     """
-    item = item_service.get_item(item_id)
+    item = await item_service.get_item(item_id, fields)
     if not item:
         raise NotFoundException(f"Item with ID {item_id} not found")
     
-    return success_response(item)
+    etag = entity_etag("item", item, fields)
+    if is_not_modified(request, etag):
+        return not_modified_response(etag)
+    
+    response = success_response(item)
+    set_etag(response, etag)
+    return response
 
 
-@router.post("/", status_code=201, response_model_exclude_none=True)
+@router.post("/", status_code=201)
 async def create_item(
-    item_data: ItemCreate = Body(...)
+    item_data: ItemCreate = Body(...),
+    item_service: ItemService = Depends(get_item_service)
 ):
     """
     Create a new item.
     """
-    item = item_service.create_item(item_data)
-    return success_response(item)
+    item = await item_service.create_item(item_data)
+    return success_response(item, status_code=201)
 
 
-@router.put("/{item_id}", response_model_exclude_none=True)
+@router.put("/{item_id}")
 async def update_item(
     item_id: int = Path(..., description="The ID of the item to update"),
-    item_data: ItemUpdate = Body(...)
+    item_data: ItemUpdate = Body(...),
+    item_service: ItemService = Depends(get_item_service)
 ):
     """
     Update an existing item.
     """
-    item = item_service.update_item(item_id, item_data)
+    item = await item_service.update_item(item_id, item_data)
     if not item:
         raise NotFoundException(f"Item with ID {item_id} not found")
     
     return success_response(item)
 
 
-@router.delete("/{item_id}", response_model_exclude_none=True)
+@router.delete("/{item_id}")
 async def delete_item(
-    item_id: int = Path(..., description="The ID of the item to delete")
+    item_id: int = Path(..., description="The ID of the item to delete"),
+    item_service: ItemService = Depends(get_item_service)
 ):
     """
     Delete an item.
     """
-    success = item_service.delete_item(item_id)
+    success = await item_service.delete_item(item_id)
     if not success:
         raise NotFoundException(f"Item with ID {item_id} not found")
     
@@ -1,86 +1,178 @@
-from fastapi import APIRouter, Depends, Path, Body
+from fastapi import APIRouter, Depends, Path, Body, Query, Request
 from typing import List, Optional
-from app.api.dependencies import get_pagination_params
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from app.api.dependencies import USER_FIELDS, get_pagination_params, get_count_mode, get_user_fields, get_user_service, get_session_factory
 from app.schemas.user import UserCreate, UserResponse, UserUpdate
 from app.services.user_service import UserService
 from app.core.exceptions import NotFoundException
+from app.utils.conditional import (
+    collection_etag,
+    entity_etag,
+    is_not_modified,
+    not_modified_response,
+    set_etag,
+)
+from app.utils.bulk_import import read_records
+from app.utils.export import ExportFormat, export_response
+from app.utils.pagination import CountMode, next_cursor
 from app.utils.response import success_response, pagination_response
 
 router = APIRouter()
-user_service = UserService()
 
 
-@router.get("/", response_model_exclude_none=True)
+@router.get("/")
 async def get_users(
-    pagination: tuple[int, int] = Depends(get_pagination_params),
-    email: Optional[str] = None
+    request: Request,
+    pagination: tuple[int, int, Optional[int]] = Depends(get_pagination_params),
+    email: Optional[str] = None,
+    count_mode: CountMode = Depends(get_count_mode),
+    fields: Optional[List[str]] = Depends(get_user_fields),
+    user_service: UserService = Depends(get_user_service)
 ):
     """
     Get all users with pagination.
     
     - **limit**: Maximum number of users to return
     - **offset**: Number of users to skip
+    - **after**: Cursor from `next_cursor` of the previous page (optional, replaces offset)
     - **email**: Filter by email (optional)
+    - **count**: Total count strategy: exact, estimated, cached or none (optional)
+    - **fields**: Comma-separated fields to return, e.g. `id,name` (optional)
+    
+    Supports conditional requests with `If-None-Match`.
     """
-    limit, offset = pagination
-    users, total = user_service.get_users(limit=limit, offset=offset, email=email)
+    limit, offset, after_id = pagination
+    
+    page = await user_service.get_users(
+        limit=limit,
+        offset=offset,
+        email=email,
+        after_id=after_id,
+        count_mode=count_mode,
+        fields=fields
+    )
+    etag = collection_etag("users", page, fields)
+    if is_not_modified(request, etag):
+        return not_modified_response(etag)
     
-    return pagination_response(
-        items=users,
-        total=total,
+    response = pagination_response(
+        items=page.items,
+        total=page.total,
         limit=limit,
-        offset=offset
+        offset=offset,
+        next_cursor=next_cursor(page.items, limit),
+        has_more=page.has_more,
+        count_mode=page.count_mode.value
     )
+    set_etag(response, etag)
+    return response
+
+
+@router.get("/export")
+async def export_users(
+    email: Optional[str] = None,
+    format: ExportFormat = Query(default=ExportFormat.NDJSON, description="Body format: ndjson or csv"),
+    fields: Optional[List[str]] = Depends(get_user_fields),
+    sessions: async_sessionmaker = Depends(get_session_factory),
+    user_service: UserService = Depends(get_user_service)
+):
+    """
+    Export all users as a streamed download.
+    
+    - **email**: Filter by email (optional)
+    - **format**: `ndjson` (default, one user per line) or `csv`
+    - **fields**: Comma-separated fields to return, e.g. `id,username` (optional)
+    
+    Users are read with a server-side cursor and sent as they are read, in ID order.
+    """
+    batches = await user_service.stream_users(sessions, email=email, fields=fields)
+    return export_response(batches, format, "users", fields or USER_FIELDS)
 
 
-@router.get("/{user_id}", response_model_exclude_none=True)
+@router.post("/import")
+async def import_users(
+    request: Request,
+    format: ExportFormat = Query(default=ExportFormat.NDJSON, description="Body format: ndjson or csv"),
+    user_service: UserService = Depends(get_user_service)
+):
+    """
+    Import users from an NDJSON or CSV body, e.g. a file from `/export`.
+    
+    - **format**: `ndjson` (default, one user per line) or `csv` with a header row
+    
+    The body is parsed as it is received and inserted in transactions of
+    `IMPORT_BATCH_SIZE` rows, hashing each batch's passwords in parallel.
+    Rows that fail validation or are rejected by the database, e.g. taken
+    emails, are listed by line number; the rest are imported.
+    """
+    result = await user_service.import_users(read_records(request.stream(), format))
+    return success_response(result.to_dict())
+
+
+@router.get("/{user_id}")
 async def get_user(
-    user_id: int = Path(..., description="The ID of the user to get")
+    request: Request,
+    user_id: int = Path(..., description="The ID of the user to get"),
+    fields: Optional[List[str]] = Depends(get_user_fields),
+    user_service: UserService = Depends(get_user_service)
 ):
     """
     Get a specific user by ID.
+    
+    - **fields**: Comma-separated fields to return, e.g. `id,name` (optional)
+    
+    Supports conditional requests with `If-None-Match`.
     """
-    user = user_service.get_user(user_id)
+    user = await user_service.get_user(user_id, fields)
     if not user:
         raise NotFoundException(f"User with ID {user_id} not found")
     
-    return success_response(user)
+    etag = entity_etag("user", user, fields)
+    if is_not_modified(request, etag):
+        return not_modified_response(etag)
+    
+    response = success_response(user)
+    set_etag(response, etag)
+    return response
 
 
-@router.post("/", status_code=201, response_model_exclude_none=True)
+@router.post("/", status_code=201)
 async def create_user(
-    user_data: UserCreate = Body(...)
+    user_data: UserCreate = Body(...),
+    user_service: UserService = Depends(get_user_service)
 ):
     """
     Create a new user.
     """
-    user = user_service.create_user(user_data)
-    return success_response(user)
+    user = await user_service.create_user(user_data)
+    return success_response(user, status_code=201)
 
 
-@router.put("/{user_id}", response_model_exclude_none=True)
+@router.put("/{user_id}")
 async def update_user(
     user_id: int = Path(..., description="The ID of the user to update"),
-    user_data: UserUpdate = Body(...)
+    user_data: UserUpdate = Body(...),
+    user_service: UserService = Depends(get_user_service)
 ):
     """
     Update an existing user.
     """
-    user = user_service.update_user(user_id, user_data)
+    user = await user_service.update_user(user_id, user_data)
     if not user:
         raise NotFoundException(f"User with ID {user_id} not found")
     
     return success_response(user)
 
 
-@router.delete("/{user_id}", response_model_exclude_none=True)
+@router.delete("/{user_id}")
 async def delete_user(
-    user_id: int = Path(..., description="The ID of the user to delete")
+    user_id: int = Path(..., description="The ID of the user to delete"),
+    user_service: UserService = Depends(get_user_service)
 ):
     """
     Delete a user.
     """
-    success = user_service.delete_user(user_id)
+    success = await user_service.delete_user(user_id)
     if not success:
         raise NotFoundException(f"User with ID {user_id} not found")
     
@@ -0,0 +1,240 @@
+import json
+import logging
+import time
+from collections import OrderedDict
+from datetime import date, datetime
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class CacheBackend:
+    """Interface for key/value stores used by EntityCache."""
+    
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        raise NotImplementedError
+    
+    async def set(self, key: str, value: Dict[str, Any], ttl: int) -> None:
+        raise NotImplementedError
+    
+    async def delete(self, *keys: str) -> None:
+        raise NotImplementedError
+    
+    async def clear(self) -> None:
+        raise NotImplementedError
+
+
+class MemoryCacheBackend(CacheBackend):
+    """In-process LRU cache with per-entry TTL and a size bound."""
+    
+    def __init__(self, max_size: int = 10000):
+        self.max_size = max_size
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+    
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        
+        self._entries.move_to_end(key)
+        return dict(value)
+    
+    async def set(self, key: str, value: Dict[str, Any], ttl: int) -> None:
+        self._entries[key] = (time.monotonic() + ttl, dict(value))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+    
+    async def delete(self, *keys: str) -> None:
+        for key in keys:
+            self._entries.pop(key, None)
+    
+    async def clear(self) -> None:
+        self._entries.clear()
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class RedisCacheBackend(CacheBackend):
+    """
+    Cache stored in a Redis-protocol server.
+    
+    Accepts any client exposing the asyncio redis-py API (get, set with ex,
+    delete, scan_iter). Values are stored as JSON with datetimes in ISO format.
+    """
+    
+    def __init__(self, client: Any = None, url: Optional[str] = None, prefix: str = "cache:"):
+        if client is None:
+            try:
+                from redis import asyncio as redis
+            except ImportError:
+                raise ImportError("The redis cache backend requires the 'redis' package")
+            client = redis.from_url(url)
+        
+        self.client = client
+        self.prefix = prefix
+    
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        raw = await self.client.get(self.prefix + key)
+        if raw is None:
+            return None
+        
+        return json.loads(raw, object_hook=_decode_datetimes)
+    
+    async def set(self, key: str, value: Dict[str, Any], ttl: int) -> None:
+        await self.client.set(self.prefix + key, json.dumps(value, default=_encode_datetime), ex=ttl)
+    
+    async def delete(self, *keys: str) -> None:
+        if keys:
+            await self.client.delete(*[self.prefix + key for key in keys])
+    
+    async def clear(self) -> None:
+        async for key in self.client.scan_iter(match=f"{self.prefix}*"):
+            await self.client.delete(key)
+
+
+class EntityCache:
+    """
+    Read-through cache for single-entity lookups.
+    
+    Misses are loaded from the database and stored; writers invalidate the
+    affected keys. A load that a key was invalidated during may have read
+    the row from before the write, so its result is returned but not
+    stored. Backend failures are logged and treated as misses so the cache
+    can never take reads down with it.
+    """
+    
+    def __init__(self, backend: Optional[CacheBackend], ttl: int = 60):
+        self.backend = backend
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        # Loads in flight and invalidations seen meanwhile, per key
+        self._loading: Dict[str, int] = {}
+        self._generations: Dict[str, int] = {}
+    
+    async def get_or_load(
+        self,
+        key: str,
+        loader: Callable[[], Awaitable[Optional[Dict[str, Any]]]]
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Return the cached value for key, loading and storing it on a miss.
+        
+        Args:
+            key: Cache key, e.g. "item:1"
+            loader: Coroutine function returning the value, or None if absent
+        
+        Returns:
+            Entity data or None if not found; None results are not cached
+        """
+        if self.backend is None:
+            return await loader()
+        
+        try:
+            value = await self.backend.get(key)
+        except Exception:
+            logger.warning("Cache read failed for %s", key, exc_info=True)
+            value = None
+        
+        if value is not None:
+            self.hits += 1
+            return value
+        
+        self.misses += 1
+        self._loading[key] = self._loading.get(key, 0) + 1
+        generation = self._generations.get(key, 0)
+        try:
+            value = await loader()
+            invalidated = self._generations.get(key, 0) != generation
+        finally:
+            self._loading[key] -= 1
+            if not self._loading[key]:
+                del self._loading[key]
+                self._generations.pop(key, None)
+        
+        if value is not None and not invalidated:
+            try:
+                await self.backend.set(key, value, self.ttl)
+            except Exception:
+                logger.warning("Cache write failed for %s", key, exc_info=True)
+        
+        return value
+    
+    async def invalidate(self, *keys: str) -> None:
+        """Remove keys after the entities they refer to changed."""
+        if self.backend is None:
+            return
+        
+        for key in keys:
+            if key in self._loading:
+                self._generations[key] = self._generations.get(key, 0) + 1
+        
+        try:
+            await self.backend.delete(*keys)
+        except Exception:
+            logger.warning("Cache invalidation failed for %s", keys, exc_info=True)
+    
+    async def clear(self) -> None:
+        """Drop every entry and reset the counters."""
+        if self.backend is not None:
+            await self.backend.clear()
+        self.hits = 0
+        self.misses = 0
+    
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters for sizing the cache."""
+        lookups = self.hits + self.misses
+        stats = {
+            "backend": settings.CACHE_BACKEND if self.backend is not None else "none",
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
+        if isinstance(self.backend, MemoryCacheBackend):
+            stats["size"] = len(self.backend)
+            stats["max_size"] = self.backend.max_size
+        return stats
+
+
+def _encode_datetime(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return {"__datetime__": value.isoformat()}
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _decode_datetimes(value: Dict[str, Any]) -> Any:
+    if "__datetime__" in value:
+        return datetime.fromisoformat(value["__datetime__"])
+    return value
+
+
+def create_cache_backend(backend: str) -> Optional[CacheBackend]:
+    """
+    Create the cache backend named by the CACHE_BACKEND setting.
+    
+    Args:
+        backend: "memory", "redis" or "none"
+    
+    Returns:
+        Cache backend, or None when caching is disabled
+    """
+    if backend == "memory":
+        return MemoryCacheBackend(max_size=settings.CACHE_MAX_SIZE)
+    if backend == "redis":
+        return RedisCacheBackend(url=settings.CACHE_REDIS_URL)
+    if backend == "none":
+        return None
+    
+    raise ValueError(f"Unknown cache backend: {backend}")
+
+
+# Create entity cache instance
+entity_cache = EntityCache(create_cache_backend(settings.CACHE_BACKEND), ttl=settings.CACHE_TTL)
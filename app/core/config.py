@@ -1,5 +1,6 @@
-from pydantic_settings import BaseSettings
-from typing import List
+from pydantic import field_validator
+from pydantic_settings import BaseSettings, NoDecode
+from typing import Annotated, Any, List
 import os
 from dotenv import load_dotenv
 
@@ -19,14 +20,115 @@ class Settings(BaseSettings):
     
     # Database Settings
     DATABASE_URL: str = os.getenv("DATABASE_URL", "sqlite:///./app.db")
+    # Async driver URL; derived from DATABASE_URL (asyncpg / aiosqlite) when empty
+    ASYNC_DATABASE_URL: str = os.getenv("ASYNC_DATABASE_URL", "")
+    # Comma-separated read replica URLs; list reads are spread across them
+    DATABASE_READ_URLS: Annotated[List[str], NoDecode] = []
+    DB_REPLICA_RETRY_SECONDS: float = float(os.getenv("DB_REPLICA_RETRY_SECONDS", 30))  # skip a failed replica this long
+    # After a write, the client reads from the primary for this long; 0 disables
+    READ_YOUR_WRITES_SECONDS: int = int(os.getenv("READ_YOUR_WRITES_SECONDS", 5))
+    
+    # Connection Pool Settings
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", 5))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", 10))
+    DB_POOL_TIMEOUT: float = float(os.getenv("DB_POOL_TIMEOUT", 30))  # seconds to wait for a connection
+    DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", -1))  # seconds; -1 never recycles
+    DB_POOL_PRE_PING: bool = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+    DB_POOL_USE_LIFO: bool = os.getenv("DB_POOL_USE_LIFO", "false").lower() == "true"
+    # Behind pgbouncer in transaction mode: no app-side pool, no prepared statements
+    DB_PGBOUNCER: bool = os.getenv("DB_PGBOUNCER", "false").lower() == "true"
     
     # Security Settings
     SECRET_KEY: str = os.getenv("SECRET_KEY", "your-secret-key-here")
     ACCESS_TOKEN_EXPIRE_MINUTES: int = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", 60 * 24 * 7))  # Default: 7 days
+    # bcrypt runs in a "thread" or "process" pool; 0 means CPU count / 4x workers
+    PASSWORD_HASH_EXECUTOR: str = os.getenv("PASSWORD_HASH_EXECUTOR", "thread")
+    PASSWORD_HASH_WORKERS: int = int(os.getenv("PASSWORD_HASH_WORKERS", 0))
+    PASSWORD_HASH_MAX_PENDING: int = int(os.getenv("PASSWORD_HASH_MAX_PENDING", 0))
+    PASSWORD_HASH_BULK_WORKERS: int = int(os.getenv("PASSWORD_HASH_BULK_WORKERS", 0))  # 0 means half the workers
+    
+    # Server Settings (used by run.py)
+    SERVER_HOST: str = os.getenv("SERVER_HOST", "0.0.0.0")
+    SERVER_PORT: int = int(os.getenv("SERVER_PORT", 8000))
+    SERVER_WORKERS: int = int(os.getenv("SERVER_WORKERS", 0))  # 0 = one per available CPU
+    SERVER_KEEP_ALIVE: int = int(os.getenv("SERVER_KEEP_ALIVE", 5))  # seconds
+    SERVER_BACKLOG: int = int(os.getenv("SERVER_BACKLOG", 2048))
+    # Restart a worker after this many requests (plus up to the jitter); 0 = never
+    SERVER_MAX_REQUESTS: int = int(os.getenv("SERVER_MAX_REQUESTS", 0))
+    SERVER_MAX_REQUESTS_JITTER: int = int(os.getenv("SERVER_MAX_REQUESTS_JITTER", 0))
+    SERVER_GRACEFUL_TIMEOUT: int = int(os.getenv("SERVER_GRACEFUL_TIMEOUT", 30))  # seconds
+    SERVER_RELOAD: bool = os.getenv("SERVER_RELOAD", "false").lower() == "true"  # development only
     
     # Pagination Settings
     DEFAULT_LIMIT: int = int(os.getenv("DEFAULT_LIMIT", 10))
     MAX_LIMIT: int = int(os.getenv("MAX_LIMIT", 100))
+    # Total count strategy for lists: exact, estimated, cached or none
+    DEFAULT_COUNT_MODE: str = os.getenv("DEFAULT_COUNT_MODE", "exact")
+    COUNT_CACHE_TTL: int = int(os.getenv("COUNT_CACHE_TTL", 60))  # seconds
+    COUNT_CACHE_SIZE: int = int(os.getenv("COUNT_CACHE_SIZE", 1024))
+    
+    # Cache Settings
+    CACHE_BACKEND: str = os.getenv("CACHE_BACKEND", "memory")  # memory, redis or none
+    CACHE_TTL: int = int(os.getenv("CACHE_TTL", 60))  # seconds
+    CACHE_MAX_SIZE: int = int(os.getenv("CACHE_MAX_SIZE", 10000))
+    CACHE_REDIS_URL: str = os.getenv("CACHE_REDIS_URL", "redis://localhost:6379/0")
+    
+    # Bulk Settings
+    BULK_MAX_ITEMS: int = int(os.getenv("BULK_MAX_ITEMS", 1000))
+    
+    # Coalesce concurrent identical reads into one query
+    SINGLE_FLIGHT_ENABLED: bool = os.getenv("SINGLE_FLIGHT_ENABLED", "true").lower() == "true"
+    
+    # Export Settings
+    EXPORT_BATCH_SIZE: int = int(os.getenv("EXPORT_BATCH_SIZE", 1000))  # rows per cursor fetch
+    
+    # Import Settings
+    IMPORT_BATCH_SIZE: int = int(os.getenv("IMPORT_BATCH_SIZE", 1000))  # rows per transaction
+    IMPORT_MAX_ERRORS: int = int(os.getenv("IMPORT_MAX_ERRORS", 100))  # row errors listed in the response
+    
+    # Response Settings
+    JSON_RESPONSE_BACKEND: str = os.getenv("JSON_RESPONSE_BACKEND", "orjson")  # orjson, pydantic or json
+    
+    # Rate Limit Settings: token bucket per client IP, or per key header when set
+    RATE_LIMIT_BACKEND: str = os.getenv("RATE_LIMIT_BACKEND", "memory")  # memory, redis or none
+    RATE_LIMIT_REDIS_URL: str = os.getenv("RATE_LIMIT_REDIS_URL", "redis://localhost:6379/0")
+    RATE_LIMIT_CAPACITY: float = float(os.getenv("RATE_LIMIT_CAPACITY", 200))  # burst size in tokens
+    RATE_LIMIT_REFILL_RATE: float = float(os.getenv("RATE_LIMIT_REFILL_RATE", 20))  # tokens per second
+    RATE_LIMIT_LIST_COST: float = float(os.getenv("RATE_LIMIT_LIST_COST", 5))
+    RATE_LIMIT_SEARCH_COST: float = float(os.getenv("RATE_LIMIT_SEARCH_COST", 20))
+    RATE_LIMIT_BULK_COST: float = float(os.getenv("RATE_LIMIT_BULK_COST", 50))  # bulk, export and import
+    # Only set when a gateway validates the header; clients can rotate arbitrary values otherwise
+    RATE_LIMIT_KEY_HEADER: str = os.getenv("RATE_LIMIT_KEY_HEADER", "")
+    # Only behind a proxy that sets X-Forwarded-For; clients can forge it otherwise
+    RATE_LIMIT_TRUST_PROXY: bool = os.getenv("RATE_LIMIT_TRUST_PROXY", "false").lower() == "true"
+    RATE_LIMIT_MAX_CLIENTS: int = int(os.getenv("RATE_LIMIT_MAX_CLIENTS", 100000))  # memory backend only
+    
+    # Compression Settings; zstd and Brotli need the zstandard / brotli packages
+    COMPRESSION_ENABLED: bool = os.getenv("COMPRESSION_ENABLED", "true").lower() == "true"
+    COMPRESSION_MINIMUM_SIZE: int = int(os.getenv("COMPRESSION_MINIMUM_SIZE", 1024))  # bytes
+    COMPRESSION_GZIP_LEVEL: int = int(os.getenv("COMPRESSION_GZIP_LEVEL", 6))  # 1-9
+    COMPRESSION_BROTLI_QUALITY: int = int(os.getenv("COMPRESSION_BROTLI_QUALITY", 4))  # 0-11
+    COMPRESSION_ZSTD_LEVEL: int = int(os.getenv("COMPRESSION_ZSTD_LEVEL", 3))  # 1-22
+    
+    # Observability Settings
+    SERVER_TIMING_ENABLED: bool = os.getenv("SERVER_TIMING_ENABLED", "true").lower() == "true"
+    REQUEST_TIMING_LOG: bool = os.getenv("REQUEST_TIMING_LOG", "false").lower() == "true"
+    # Prometheus /metrics; set PROMETHEUS_MULTIPROC_DIR to aggregate across workers
+    METRICS_ENABLED: bool = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+    # Log statements slower than this, with their plan; 0 disables
+    SLOW_QUERY_MS: float = float(os.getenv("SLOW_QUERY_MS", 200))
+    SLOW_QUERY_EXPLAIN: bool = os.getenv("SLOW_QUERY_EXPLAIN", "true").lower() == "true"
+    SLOW_QUERY_EXPLAIN_INTERVAL: float = float(os.getenv("SLOW_QUERY_EXPLAIN_INTERVAL", 300))  # seconds per statement shape
+    # Warn when a request runs the same statement more often than this; 0 disables
+    N_PLUS_ONE_THRESHOLD: int = int(os.getenv("N_PLUS_ONE_THRESHOLD", 10))
+
+    @field_validator("DATABASE_READ_URLS", mode="before")
+    @classmethod
+    def split_urls(cls, value: Any) -> Any:
+        # Read from the environment as a plain comma-separated list
+        if isinstance(value, str):
+            return [url.strip() for url in value.split(",") if url.strip()]
+        return value
 
     class Config:
         case_sensitive = True
@@ -91,3 +91,18 @@ class DatabaseException(CustomException):
             headers=headers,
             error_type="DATABASE_ERROR"
         )
+
+
+class ServiceUnavailableException(CustomException):
+    """Exception raised when the server is temporarily overloaded."""
+    def __init__(
+        self,
+        detail: str = "Service temporarily unavailable",
+        headers: Optional[Dict[str, str]] = None
+    ):
+        super().__init__(
+            status_code=503,
+            detail=detail,
+            headers=headers,
+            error_type="SERVICE_UNAVAILABLE"
+        )
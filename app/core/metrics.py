@@ -0,0 +1,261 @@
+import functools
+import inspect
+import os
+import time
+from contextvars import ContextVar
+from typing import Any, Dict, Optional, Tuple, Type, TypeVar
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import Pool
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+T = TypeVar("T")
+
+# Set by prometheus_client users to share metrics between worker processes
+MULTIPROCESS_DIR = os.getenv("PROMETHEUS_MULTIPROC_DIR")
+
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency up to the start of the response",
+    ["method", "route", "status"],
+)
+HTTP_RESPONSE_SIZE = Histogram(
+    "http_response_size_bytes",
+    "HTTP response body size",
+    ["method", "route"],
+    buckets=(100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000),
+)
+HTTP_REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress",
+    "HTTP requests being handled",
+    ["method"],
+    multiprocess_mode="livesum",
+)
+DB_POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out_connections",
+    "Database connections checked out of the pool",
+    multiprocess_mode="livesum",
+)
+DB_POOL_OVERFLOW = Gauge(
+    "db_pool_overflow_connections",
+    "Database connections opened beyond the pool size",
+    multiprocess_mode="livesum",
+)
+DB_POOL_WAITERS = Gauge(
+    "db_pool_waiters",
+    "Callers waiting for a pooled database connection",
+    multiprocess_mode="livesum",
+)
+DB_QUERIES = Counter(
+    "db_queries_total",
+    "Database statements executed, by repository method",
+    ["repository", "method"],
+)
+
+RATE_LIMIT_DECISIONS = Counter(
+    "rate_limit_decisions_total",
+    "API requests checked by the rate limiter, by decision",
+    ["decision"],
+)
+
+SINGLE_FLIGHT_CALLS = Counter(
+    "single_flight_calls_total",
+    "Service reads that ran a query (leader) or joined an identical one in flight (shared)",
+    ["role"],
+)
+
+_current_repository: ContextVar[Tuple[str, str]] = ContextVar("current_repository", default=("none", "none"))
+
+
+def count_queries(cls: Type[T]) -> Type[T]:
+    """
+    Class decorator labelling the queries of a repository's public methods.
+
+    Statements executed while a public coroutine method runs are counted in
+    db_queries_total under the repository class and method name.
+    """
+    for name, method in list(vars(cls).items()):
+        if name.startswith("_") or not inspect.iscoroutinefunction(method):
+            continue
+        setattr(cls, name, _labelled(cls.__name__, name, method))
+    return cls
+
+
+def _labelled(repository: str, name: str, method: Any) -> Any:
+    @functools.wraps(method)
+    async def wrapper(*args: Any, **kwargs: Any) -> Any:
+        token = _current_repository.set((repository, name))
+        try:
+            return await method(*args, **kwargs)
+        finally:
+            _current_repository.reset(token)
+    return wrapper
+
+
+def observe_engine(engine: Engine, pool_metrics: bool = True) -> None:
+    """
+    Attach query counters and pool gauges to an engine.
+
+    Args:
+        engine: Sync engine, or the ``sync_engine`` of an async engine
+        pool_metrics: Whether this engine's pool feeds the pool gauges;
+            only one engine (the primary) can
+    """
+    event.listen(engine, "after_cursor_execute", _count_query)
+    if pool_metrics:
+        event.listen(engine.pool, "checkout", lambda *args: update_pool_metrics(engine.pool))
+        event.listen(engine.pool, "checkin", lambda *args: update_pool_metrics(engine.pool))
+
+
+def pool_stats(pool: Pool) -> Dict[str, Any]:
+    """
+    Describe the current state of a connection pool.
+
+    Args:
+        pool: Engine connection pool
+
+    Returns:
+        Pool class, plus size, idle, checked out, overflow and waiting
+        callers for queue pools
+    """
+    stats: Dict[str, Any] = {"pool": type(pool).__name__}
+    # Only queue pools track checkouts; NullPool and StaticPool report nothing
+    if not hasattr(pool, "checkedout"):
+        return stats
+
+    stats.update(
+        size=pool.size(),
+        max_overflow=getattr(pool, "_max_overflow", None),
+        timeout=pool.timeout(),
+        idle=pool.checkedin(),
+        checked_out=pool.checkedout(),
+        # overflow() starts at -pool_size and only turns positive past the pool size
+        overflow=max(pool.overflow(), 0),
+        waiters=_pool_waiters(pool),
+    )
+    return stats
+
+
+def update_pool_metrics(pool: Pool) -> None:
+    """Refresh the pool gauges from the pool's current state."""
+    stats = pool_stats(pool)
+    if "checked_out" not in stats:
+        return
+
+    DB_POOL_CHECKED_OUT.set(stats["checked_out"])
+    DB_POOL_OVERFLOW.set(stats["overflow"])
+    DB_POOL_WAITERS.set(stats["waiters"])
+
+
+def _pool_waiters(pool: Pool) -> int:
+    # Neither queue exposes its waiters publicly: the async queue wraps an
+    # asyncio.Queue (created lazily) and the sync queue waits on a Condition
+    queue = getattr(pool, "_pool", None)
+    asyncio_queue = vars(queue).get("_queue") if queue is not None else None
+    if asyncio_queue is not None:
+        return len(getattr(asyncio_queue, "_getters", ()))
+
+    condition = getattr(queue, "not_empty", None)
+    return len(getattr(condition, "_waiters", ()))
+
+
+def _count_query(conn, cursor, statement, parameters, context, executemany) -> None:
+    DB_QUERIES.labels(*_current_repository.get()).inc()
+
+
+def render_metrics(pool: Optional[Pool] = None) -> Tuple[bytes, str]:
+    """
+    Render all metrics in the Prometheus text exposition format.
+
+    In multiprocess mode the samples of every worker are aggregated.
+
+    Args:
+        pool: Pool whose gauges are refreshed before rendering (optional)
+
+    Returns:
+        Tuple containing the body and its content type
+    """
+    if pool is not None:
+        update_pool_metrics(pool)
+
+    if MULTIPROCESS_DIR:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+def mark_process_dead(pid: Optional[int] = None) -> None:
+    """Drop the live gauges of a finished worker in multiprocess mode."""
+    if MULTIPROCESS_DIR:
+        multiprocess.mark_process_dead(pid or os.getpid())
+
+
+class PrometheusMiddleware:
+    """
+    Record latency, response size and in-flight requests per route template.
+
+    Requests that match no route are labelled "unmatched" so arbitrary
+    paths cannot blow up the number of series.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        started = time.perf_counter()
+        responded = False
+        size = 0
+
+        async def send_with_metrics(message: Message) -> None:
+            nonlocal responded, size
+            if message["type"] == "http.response.start":
+                responded = True
+                HTTP_REQUEST_DURATION.labels(method, route_template(scope), message["status"]).observe(
+                    time.perf_counter() - started
+                )
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        in_progress = HTTP_REQUESTS_IN_PROGRESS.labels(method)
+        in_progress.inc()
+        try:
+            await self.app(scope, receive, send_with_metrics)
+        finally:
+            in_progress.dec()
+            # Unhandled errors are answered by the server error middleware outside
+            if not responded:
+                HTTP_REQUEST_DURATION.labels(method, route_template(scope), 500).observe(time.perf_counter() - started)
+            HTTP_RESPONSE_SIZE.labels(method, route_template(scope)).observe(size)
+
+
+def route_template(scope: Scope) -> str:
+    """Route template of a request, e.g. "/api/v1/items/{item_id}"."""
+    # Nested routers only know their own part of the template, so rebuild
+    # the full one by putting the path parameters back into the path
+    if "route" not in scope:
+        return "unmatched"
+
+    params = {str(value): name for name, value in scope.get("path_params", {}).items()}
+    return "/".join(
+        f"{{{params[segment]}}}" if segment in params else segment
+        for segment in scope["path"].split("/")
+    )
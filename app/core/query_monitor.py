@@ -0,0 +1,218 @@
+import logging
+import re
+import time
+from collections import Counter, OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, Optional, Tuple
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.types import ASGIApp, Receive, Scope, Send
+from app.core.config import settings
+from app.core.metrics import route_template
+
+logger = logging.getLogger(__name__)
+
+# Bound parameters whose values never reach the log
+REDACTED_PARAMETERS = ("password", "secret", "token")
+REDACTED = "***"
+
+EXPLAIN_PREFIXES = {
+    "postgresql": "EXPLAIN ",
+    "sqlite": "EXPLAIN QUERY PLAN ",
+}
+EXPLAINABLE_STATEMENTS = {"SELECT", "INSERT", "UPDATE", "DELETE", "WITH"}
+# Dialects where a failed statement aborts the transaction, so EXPLAIN runs in a savepoint
+SAVEPOINT_DIALECTS = {"postgresql"}
+EXPLAIN_SAVEPOINT = "query_monitor_explain"
+
+# Plans of recently explained statement shapes, oldest first, with their expiry
+PLAN_CACHE_SIZE = 256
+_plans: "OrderedDict[str, Tuple[float, Optional[str]]]" = OrderedDict()
+
+# Expanded IN lists vary in length; "IN (?, ?, ?)" and "IN (?)" are one shape
+_PLACEHOLDER_LIST = re.compile(r"\((?:\s*(?:\?|%s|%\(\w+\)s|\$\d+|:\w+)\s*,?)+\)")
+
+
+@dataclass
+class RequestQueries:
+    """Statement shapes executed while handling one request."""
+    scope: Scope
+    shapes: Counter = field(default_factory=Counter)
+
+    @property
+    def route(self) -> str:
+        return f"{self.scope['method']} {route_template(self.scope)}"
+
+
+_current_queries: ContextVar[Optional[RequestQueries]] = ContextVar("request_queries", default=None)
+
+
+def monitor_engine(engine: Engine) -> None:
+    """
+    Attach the slow query log and N+1 detection to an engine.
+
+    Args:
+        engine: Sync engine, or the ``sync_engine`` of an async engine
+    """
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
+
+
+@contextmanager
+def track_request(scope: Scope) -> Iterator[RequestQueries]:
+    """
+    Collect the statement shapes of a request and report repeated ones.
+
+    A shape running more than N_PLUS_ONE_THRESHOLD times usually means rows
+    are loaded one at a time in a loop.
+    """
+    queries = RequestQueries(scope=scope)
+    token = _current_queries.set(queries)
+    try:
+        yield queries
+    finally:
+        _current_queries.reset(token)
+        _report_repeated(queries)
+
+
+def statement_shape(statement: str) -> str:
+    """Normalize a statement so executions differing only in IN-list length match."""
+    return _PLACEHOLDER_LIST.sub("(?)", " ".join(statement.split()))
+
+
+def redact_parameters(parameters: Dict[str, Any]) -> Dict[str, Any]:
+    """Mask sensitive values and shorten long ones for logging."""
+    redacted = {}
+    for name, value in parameters.items():
+        if any(marker in name.lower() for marker in REDACTED_PARAMETERS):
+            value = REDACTED
+        elif isinstance(value, (str, bytes)) and len(value) > 100:
+            value = value[:100] + (b"..." if isinstance(value, bytes) else "...")
+        redacted[name] = value
+    return redacted
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    conn.info.setdefault("query_monitor_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    elapsed = time.perf_counter() - conn.info["query_monitor_started"].pop()
+
+    queries = _current_queries.get()
+    if queries is not None:
+        queries.shapes[statement_shape(statement)] += 1
+
+    if 0 < settings.SLOW_QUERY_MS <= elapsed * 1000:
+        _log_slow_query(conn, statement, parameters, context, executemany, elapsed, queries)
+
+
+def _handle_error(exception_context: Any) -> None:
+    connection = exception_context.connection
+    if connection is not None and connection.info.get("query_monitor_started"):
+        connection.info["query_monitor_started"].pop()
+
+
+def _log_slow_query(conn, statement, parameters, context, executemany, elapsed, queries) -> None:
+    # Compiled parameters keep the bind names, which is what redaction keys on
+    compiled_parameters = getattr(context, "compiled_parameters", None)
+    if compiled_parameters:
+        logged_parameters = [redact_parameters(params) for params in compiled_parameters[:10]]
+    else:
+        logged_parameters = "<not available>"
+
+    plan = None
+    if settings.SLOW_QUERY_EXPLAIN and not executemany:
+        plan = _cached_plan(conn, statement, parameters)
+
+    logger.warning(
+        "Slow query (%.2f ms) on %s: %s; parameters=%s; plan=%s",
+        elapsed * 1000,
+        queries.route if queries is not None else "-",
+        " ".join(statement.split()),
+        logged_parameters,
+        plan or "<not available>"
+    )
+
+
+def _cached_plan(conn, statement: str, parameters: Any) -> Optional[str]:
+    # EXPLAIN costs another round trip on a database that is already slow,
+    # so each statement shape is explained at most once per interval
+    shape = statement_shape(statement)
+    now = time.monotonic()
+    cached = _plans.get(shape)
+    if cached is not None and cached[0] > now:
+        return cached[1]
+
+    plan = _explain(conn, statement, parameters)
+    _plans[shape] = (now + settings.SLOW_QUERY_EXPLAIN_INTERVAL, plan)
+    _plans.move_to_end(shape)
+    while len(_plans) > PLAN_CACHE_SIZE:
+        _plans.popitem(last=False)
+    return plan
+
+
+def _explain(conn, statement: str, parameters: Any) -> Optional[str]:
+    prefix = EXPLAIN_PREFIXES.get(conn.dialect.name)
+    words = statement.lstrip().split(None, 1)
+    if prefix is None or not words or words[0].upper() not in EXPLAINABLE_STATEMENTS:
+        return None
+
+    # The raw DBAPI cursor keeps EXPLAIN out of the engine's own events; the
+    # savepoint keeps a failing EXPLAIN from aborting the request's transaction
+    savepoint = conn.dialect.name in SAVEPOINT_DIALECTS
+    try:
+        cursor = conn.connection.dbapi_connection.cursor()
+        try:
+            if savepoint:
+                cursor.execute(f"SAVEPOINT {EXPLAIN_SAVEPOINT}")
+            try:
+                cursor.execute(prefix + statement, parameters)
+                rows = cursor.fetchall()
+            except Exception:
+                if savepoint:
+                    cursor.execute(f"ROLLBACK TO SAVEPOINT {EXPLAIN_SAVEPOINT}")
+                raise
+            finally:
+                if savepoint:
+                    cursor.execute(f"RELEASE SAVEPOINT {EXPLAIN_SAVEPOINT}")
+        finally:
+            cursor.close()
+    except Exception:
+        logger.debug("EXPLAIN failed for slow query", exc_info=True)
+        return None
+
+    return " | ".join(str(row[-1]) for row in rows)
+
+
+def _report_repeated(queries: RequestQueries) -> None:
+    threshold = settings.N_PLUS_ONE_THRESHOLD
+    if threshold <= 0:
+        return
+
+    for shape, count in queries.shapes.items():
+        if count > threshold:
+            logger.warning(
+                "Possible N+1: %s ran the same statement %d times: %s",
+                queries.route,
+                count,
+                shape
+            )
+
+
+class QueryMonitorMiddleware:
+    """Track the statements of each HTTP request for N+1 detection and slow query context."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with track_request(scope):
+            await self.app(scope, receive, send)
@@ -0,0 +1,300 @@
+import hashlib
+import logging
+import math
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import parse_qsl
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Receive, Scope, Send
+from app.core.config import settings
+from app.core.metrics import RATE_LIMIT_DECISIONS
+from app.utils.response import error_response
+
+logger = logging.getLogger(__name__)
+
+# Query parameters that turn a list into a search
+SEARCH_PARAMETERS = ("name", "email")
+# Collection operations touching many rows, relative to the API prefix
+BULK_OPERATIONS = ("bulk", "export", "import")
+
+
+@dataclass
+class RateLimitDecision:
+    """Outcome of taking tokens from a client's bucket."""
+    allowed: bool
+    remaining: float
+    retry_after: float
+
+
+def _decision(allowed: bool, tokens: float, cost: float, refill_rate: float) -> RateLimitDecision:
+    retry_after = 0.0 if allowed else (cost - tokens) / refill_rate
+    return RateLimitDecision(allowed=allowed, remaining=tokens, retry_after=retry_after)
+
+
+class RateLimitBackend:
+    """Interface for token bucket stores used by RateLimiter."""
+
+    async def take(self, key: str, cost: float, capacity: float, refill_rate: float) -> RateLimitDecision:
+        raise NotImplementedError
+
+    async def clear(self) -> None:
+        raise NotImplementedError
+
+
+class MemoryRateLimitBackend(RateLimitBackend):
+    """
+    Token buckets held in this process, bounded to max_keys clients.
+
+    Each worker process limits on its own, so with N workers a client gets
+    up to N times the configured rate; use a shared backend for exact limits.
+    """
+
+    def __init__(self, max_keys: int = 100000):
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+
+    async def take(self, key: str, cost: float, capacity: float, refill_rate: float) -> RateLimitDecision:
+        now = time.monotonic()
+        tokens, updated = self._buckets.get(key, (capacity, now))
+        tokens = min(capacity, tokens + (now - updated) * refill_rate)
+
+        allowed = tokens >= cost
+        if allowed:
+            tokens -= cost
+        self._buckets[key] = (tokens, now)
+        self._buckets.move_to_end(key)
+        while len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+
+        return _decision(allowed, tokens, cost, refill_rate)
+
+    async def clear(self) -> None:
+        self._buckets.clear()
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+
+# Refill and take atomically, on the server's clock so workers agree
+_TAKE_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local refill_rate = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local time = redis.call('TIME')
+local now = tonumber(time[1]) + tonumber(time[2]) / 1000000
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+local tokens = tonumber(bucket[1]) or capacity
+local updated = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + math.max(now - updated, 0) * refill_rate)
+local allowed = 0
+if tokens >= cost then
+    tokens = tokens - cost
+    allowed = 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'updated', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / refill_rate) + 1)
+return {allowed, tostring(tokens)}
+"""
+
+
+class RedisRateLimitBackend(RateLimitBackend):
+    """
+    Token buckets shared by all workers through a Redis-protocol server.
+
+    Accepts any client exposing the asyncio redis-py API (eval, scan_iter,
+    delete). Buckets expire once they would be full again.
+    """
+
+    def __init__(self, client: Any = None, url: Optional[str] = None, prefix: str = "ratelimit:"):
+        if client is None:
+            try:
+                from redis import asyncio as redis
+            except ImportError:
+                raise ImportError("The redis rate limit backend requires the 'redis' package")
+            client = redis.from_url(url)
+
+        self.client = client
+        self.prefix = prefix
+
+    async def take(self, key: str, cost: float, capacity: float, refill_rate: float) -> RateLimitDecision:
+        allowed, tokens = await self.client.eval(_TAKE_SCRIPT, 1, self.prefix + key, capacity, refill_rate, cost)
+        return _decision(bool(int(allowed)), float(tokens), cost, refill_rate)
+
+    async def clear(self) -> None:
+        async for key in self.client.scan_iter(match=f"{self.prefix}*"):
+            await self.client.delete(key)
+
+
+class RateLimiter:
+    """
+    Token bucket limiter keyed by client.
+
+    Buckets hold up to capacity tokens and refill at refill_rate tokens per
+    second; each request takes tokens according to its cost. Backend
+    failures are logged and let the request through, so the limiter can
+    never take the API down with it.
+    """
+
+    def __init__(self, backend: Optional[RateLimitBackend], capacity: float = 100, refill_rate: float = 10):
+        self.backend = backend
+        self.capacity = capacity
+        self.refill_rate = refill_rate
+        self.allowed = 0
+        self.limited = 0
+
+    async def take(self, key: str, cost: float = 1) -> RateLimitDecision:
+        """
+        Take cost tokens from the bucket of a client.
+
+        Args:
+            key: Client identity, e.g. "ip:203.0.113.7"
+            cost: Tokens the request costs; capped at the bucket capacity
+
+        Returns:
+            Whether the request may proceed and, if not, how long to wait
+        """
+        if self.backend is None:
+            return RateLimitDecision(allowed=True, remaining=self.capacity, retry_after=0.0)
+
+        cost = min(cost, self.capacity)
+        try:
+            decision = await self.backend.take(key, cost, self.capacity, self.refill_rate)
+        except Exception:
+            logger.warning("Rate limit check failed for %s", key, exc_info=True)
+            decision = RateLimitDecision(allowed=True, remaining=self.capacity, retry_after=0.0)
+
+        if decision.allowed:
+            self.allowed += 1
+        else:
+            self.limited += 1
+        RATE_LIMIT_DECISIONS.labels("allowed" if decision.allowed else "limited").inc()
+        return decision
+
+    async def clear(self) -> None:
+        """Refill every bucket and reset the counters."""
+        if self.backend is not None:
+            await self.backend.clear()
+        self.allowed = 0
+        self.limited = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Decision counters and bucket settings."""
+        stats = {
+            "backend": settings.RATE_LIMIT_BACKEND if self.backend is not None else "none",
+            "capacity": self.capacity,
+            "refill_rate": self.refill_rate,
+            "allowed": self.allowed,
+            "limited": self.limited,
+        }
+        if isinstance(self.backend, MemoryRateLimitBackend):
+            stats["clients"] = len(self.backend)
+            stats["max_clients"] = self.backend.max_keys
+        return stats
+
+
+def create_rate_limit_backend(backend: str) -> Optional[RateLimitBackend]:
+    """
+    Create the rate limit backend named by the RATE_LIMIT_BACKEND setting.
+
+    Args:
+        backend: "memory", "redis" or "none"
+
+    Returns:
+        Rate limit backend, or None when rate limiting is disabled
+    """
+    if backend == "memory":
+        return MemoryRateLimitBackend(max_keys=settings.RATE_LIMIT_MAX_CLIENTS)
+    if backend == "redis":
+        return RedisRateLimitBackend(url=settings.RATE_LIMIT_REDIS_URL)
+    if backend == "none":
+        return None
+
+    raise ValueError(f"Unknown rate limit backend: {backend}")
+
+
+def client_key(scope: Scope) -> str:
+    """
+    Identify the client of a request.
+
+    The client IP, taken from X-Forwarded-For only when
+    RATE_LIMIT_TRUST_PROXY is set. When RATE_LIMIT_KEY_HEADER names a
+    header, e.g. an API key validated by a gateway in front of the app,
+    that header wins; it is hashed so raw keys never sit in the backend.
+    The header is opt-in because the app itself does not validate it, and
+    a client rotating its value would get a fresh bucket every request.
+    """
+    headers = Headers(scope=scope)
+    identity = headers.get(settings.RATE_LIMIT_KEY_HEADER) if settings.RATE_LIMIT_KEY_HEADER else None
+    if identity:
+        return "key:" + hashlib.sha256(identity.encode()).hexdigest()[:32]
+
+    forwarded_for = headers.get("x-forwarded-for") if settings.RATE_LIMIT_TRUST_PROXY else None
+    if forwarded_for:
+        return "ip:" + forwarded_for.split(",")[0].strip()
+
+    client = scope.get("client")
+    return "ip:" + (client[0] if client else "unknown")
+
+
+def request_cost(scope: Scope) -> float:
+    """
+    Tokens a request costs.
+
+    Searches cost RATE_LIMIT_SEARCH_COST, other list reads
+    RATE_LIMIT_LIST_COST, bulk, export and import calls RATE_LIMIT_BULK_COST,
+    and everything else, such as point reads, 1.
+    """
+    path = scope["path"][len(settings.API_V1_STR):].strip("/")
+    segments = path.split("/") if path else []
+
+    if len(segments) == 2 and segments[1] in BULK_OPERATIONS:
+        return settings.RATE_LIMIT_BULK_COST
+    if len(segments) == 1 and scope["method"] == "GET":
+        query = dict(parse_qsl(scope.get("query_string", b"").decode("latin-1")))
+        if any(query.get(parameter) for parameter in SEARCH_PARAMETERS):
+            return settings.RATE_LIMIT_SEARCH_COST
+        return settings.RATE_LIMIT_LIST_COST
+    return 1
+
+
+class RateLimitMiddleware:
+    """
+    Reject API requests from clients that used up their token bucket.
+
+    Limited requests get a 429 with Retry-After before reaching any route,
+    so they never touch the database. Paths outside the API prefix (docs,
+    health checks, metrics) are not limited.
+    """
+
+    def __init__(self, app: ASGIApp, limiter: RateLimiter):
+        self.app = app
+        self.limiter = limiter
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not scope["path"].startswith(settings.API_V1_STR):
+            await self.app(scope, receive, send)
+            return
+
+        decision = await self.limiter.take(client_key(scope), request_cost(scope))
+        if decision.allowed:
+            await self.app(scope, receive, send)
+            return
+
+        retry_after = max(math.ceil(decision.retry_after), 1)
+        response = error_response(
+            "429",
+            "RATE_LIMITED",
+            f"Rate limit exceeded, retry in {retry_after} seconds",
+            headers={"Retry-After": str(retry_after)}
+        )
+        await response(scope, receive, send)
+
+
+# Create rate limiter instance
+rate_limiter = RateLimiter(
+    create_rate_limit_backend(settings.RATE_LIMIT_BACKEND),
+    capacity=settings.RATE_LIMIT_CAPACITY,
+    refill_rate=settings.RATE_LIMIT_REFILL_RATE
+)
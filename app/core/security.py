@@ -0,0 +1,152 @@
+import asyncio
+import logging
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, List, Optional
+from passlib.context import CryptContext
+from app.core.config import settings
+from app.core.exceptions import ServiceUnavailableException
+from app.core.timing import timed
+
+logger = logging.getLogger(__name__)
+
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+
+# Module-level so they can be pickled into a process pool
+def _hash_password(password: str) -> str:
+    return pwd_context.hash(password)
+
+
+def _verify_password(plain_password: str, hashed_password: str) -> bool:
+    return pwd_context.verify(plain_password, hashed_password)
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt hashing and verification off the event loop.
+    
+    Work goes to a bounded thread or process pool. Once max_pending calls
+    are queued or running, new calls fail fast with a 503 instead of
+    waiting behind the queue. Bulk hashing instead waits its turn and
+    holds at most bulk_workers workers, so interactive calls get through.
+    """
+    
+    def __init__(
+        self,
+        executor_type: str = "thread",
+        max_workers: Optional[int] = None,
+        max_pending: Optional[int] = None,
+        bulk_workers: Optional[int] = None
+    ):
+        if executor_type not in ("thread", "process"):
+            raise ValueError(f"Unknown password hash executor: {executor_type}")
+        
+        self.executor_type = executor_type
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_pending = max_pending if max_pending is not None else self.max_workers * 4
+        self.bulk_workers = bulk_workers or max(self.max_workers // 2, 1)
+        self.pending = 0
+        self._executor: Optional[Executor] = None
+        self._bulk_slots: Optional[asyncio.Semaphore] = None
+        self._bulk_loop: Optional[asyncio.AbstractEventLoop] = None
+    
+    async def hash(self, password: str) -> str:
+        """
+        Hash a password.
+        
+        Args:
+            password: Plain text password
+            
+        Returns:
+            Hashed password
+        """
+        return await self._run(_hash_password, password)
+    
+    async def hash_many(self, passwords: List[str]) -> List[Optional[str]]:
+        """
+        Hash the passwords of a bulk job, such as an import.
+        
+        Waits for capacity instead of failing fast. Passwords go to the pool
+        one at a time on at most bulk_workers workers, so signups queue
+        behind a few hashes rather than the whole batch.
+        
+        Args:
+            passwords: Plain text passwords
+            
+        Returns:
+            Hashed passwords in the order given, None where hashing failed
+        """
+        slots = self._get_bulk_slots()
+        
+        async def hash_one(password: str) -> Optional[str]:
+            async with slots:
+                try:
+                    return await self._submit(_hash_password, password)
+                except Exception:
+                    logger.warning("Password hashing failed in a bulk job", exc_info=True)
+                    return None
+        
+        return list(await asyncio.gather(*(hash_one(password) for password in passwords)))
+    
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        """
+        Verify a password against a hash.
+        
+        Args:
+            plain_password: Plain text password
+            hashed_password: Hashed password
+            
+        Returns:
+            True if password matches, False otherwise
+        """
+        return await self._run(_verify_password, plain_password, hashed_password)
+    
+    def shutdown(self) -> None:
+        """Stop the worker pool; it is recreated on next use."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+    
+    async def _run(self, func: Callable[..., Any], *args: Any) -> Any:
+        if self.pending >= self.max_pending:
+            raise ServiceUnavailableException(
+                "Password hashing is at capacity, please retry",
+                headers={"Retry-After": "1"}
+            )
+        
+        self.pending += 1
+        try:
+            return await self._submit(func, *args)
+        finally:
+            self.pending -= 1
+    
+    async def _submit(self, func: Callable[..., Any], *args: Any) -> Any:
+        loop = asyncio.get_running_loop()
+        with timed("hash"):
+            return await loop.run_in_executor(self._get_executor(), func, *args)
+    
+    def _get_bulk_slots(self) -> asyncio.Semaphore:
+        # Semaphores belong to one event loop
+        loop = asyncio.get_running_loop()
+        if self._bulk_slots is None or self._bulk_loop is not loop:
+            self._bulk_slots = asyncio.Semaphore(self.bulk_workers)
+            self._bulk_loop = loop
+        return self._bulk_slots
+    
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.executor_type == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="password-hash")
+        return self._executor
+
+
+# Create password hasher instance
+password_hasher = PasswordHasher(
+    executor_type=settings.PASSWORD_HASH_EXECUTOR,
+    max_workers=settings.PASSWORD_HASH_WORKERS or None,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING or None,
+    bulk_workers=settings.PASSWORD_HASH_BULK_WORKERS or None
+)
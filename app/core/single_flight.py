@@ -0,0 +1,84 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple, TypeVar
+from app.core.config import settings
+from app.core.metrics import SINGLE_FLIGHT_CALLS
+
+T = TypeVar("T")
+
+
+class _LeaderCancelled(Exception):
+    """The call being shared was cancelled; followers must run their own."""
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent identical reads into one call.
+
+    The first caller for a key runs the call; callers arriving while it is
+    in flight wait for it and get the same result or exception. Keys are
+    tuples whose first item names the resource, so writers can drop the
+    in-flight reads of a resource with forget(). Results are shared, so
+    callers must treat them as read-only.
+    """
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self._calls: Dict[Tuple[Hashable, ...], "asyncio.Future[Any]"] = {}
+
+    async def do(self, key: Tuple[Hashable, ...], call: Callable[[], Awaitable[T]]) -> T:
+        """
+        Run call, or join the identical call already in flight.
+
+        Args:
+            key: Identity of the call, e.g. ("item", 1, None)
+            call: Coroutine function performing the read
+
+        Returns:
+            Result of the call
+        """
+        if not self.enabled:
+            return await call()
+
+        while key in self._calls:
+            SINGLE_FLIGHT_CALLS.labels("shared").inc()
+            try:
+                # Shielded so a follower giving up does not cancel the shared call
+                return await asyncio.shield(self._calls[key])
+            except _LeaderCancelled:
+                continue
+
+        SINGLE_FLIGHT_CALLS.labels("leader").inc()
+        future: "asyncio.Future[Any]" = asyncio.get_running_loop().create_future()
+        self._calls[key] = future
+        try:
+            result = await call()
+        except asyncio.CancelledError:
+            _fail(future, _LeaderCancelled())
+            raise
+        except BaseException as e:
+            _fail(future, e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            if self._calls.get(key) is future:
+                del self._calls[key]
+
+    def forget(self, *resources: Hashable) -> None:
+        """Let reads of the resources starting from now on run afresh, e.g. after a write."""
+        for key in [key for key in self._calls if key[0] in resources]:
+            del self._calls[key]
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+
+def _fail(future: "asyncio.Future[Any]", error: BaseException) -> None:
+    future.set_exception(error)
+    # Mark it retrieved, so no warning is logged when nobody was waiting
+    future.exception()
+
+
+# Create single-flight instance
+single_flight = SingleFlight(enabled=settings.SINGLE_FLIGHT_ENABLED)
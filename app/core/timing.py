@@ -0,0 +1,138 @@
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, Optional
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class RequestTimings:
+    """Time spent by one request, broken down by phase."""
+    started: float = field(default_factory=time.perf_counter)
+    durations: Dict[str, float] = field(default_factory=dict)
+    queries: int = 0
+
+    def add(self, name: str, seconds: float) -> None:
+        """Add time to a phase, e.g. "db" or "serialize"."""
+        self.durations[name] = self.durations.get(name, 0.0) + seconds
+
+    def server_timing(self, total: float) -> str:
+        """Format the breakdown as a Server-Timing header value."""
+        metrics = [f'db;dur={self.durations.get("db", 0.0) * 1000:.2f};desc="{self.queries} queries"']
+        metrics.extend(
+            f"{name};dur={seconds * 1000:.2f}"
+            for name, seconds in self.durations.items()
+            if name != "db"
+        )
+        metrics.append(f"total;dur={total * 1000:.2f}")
+        return ", ".join(metrics)
+
+    def summary(self, total: float) -> str:
+        """Format the breakdown for the log."""
+        parts = [f"total={total * 1000:.2f}ms", f"queries={self.queries}"]
+        parts.extend(f"{name}={seconds * 1000:.2f}ms" for name, seconds in self.durations.items())
+        return " ".join(parts)
+
+
+_current_timings: ContextVar[Optional[RequestTimings]] = ContextVar("request_timings", default=None)
+
+
+def current_timings() -> Optional[RequestTimings]:
+    """Timings of the request being handled, or None outside a request."""
+    return _current_timings.get()
+
+
+@contextmanager
+def timed(name: str) -> Iterator[None]:
+    """Add the time spent in the block to a phase of the current request."""
+    timings = _current_timings.get()
+    if timings is None:
+        yield
+        return
+
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.add(name, time.perf_counter() - started)
+
+
+def instrument_engine(engine: Engine) -> None:
+    """
+    Attach query timing hooks to an engine.
+
+    Args:
+        engine: Sync engine, or the ``sync_engine`` of an async engine
+    """
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    elapsed = time.perf_counter() - conn.info["query_started"].pop()
+    timings = _current_timings.get()
+    if timings is not None:
+        timings.add("db", elapsed)
+        timings.queries += 1
+
+
+def _handle_error(exception_context: Any) -> None:
+    # Failed statements never reach after_cursor_execute
+    connection = exception_context.connection
+    if connection is not None and connection.info.get("query_started"):
+        connection.info["query_started"].pop()
+
+
+class ServerTimingMiddleware:
+    """
+    Measure each HTTP request and report where the time went.
+
+    Emits a Server-Timing header with database time and query count, any
+    other recorded phases (serialize, hash) and the total up to the start
+    of the response. Optionally logs the same breakdown.
+    """
+
+    def __init__(self, app: ASGIApp, header: bool = True, log: bool = False):
+        self.app = app
+        self.header = header
+        self.log = log
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timings = RequestTimings()
+        token = _current_timings.set(timings)
+
+        async def send_with_timings(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                total = time.perf_counter() - timings.started
+                if self.header:
+                    MutableHeaders(scope=message).append("Server-Timing", timings.server_timing(total))
+                if self.log:
+                    logger.info(
+                        "%s %s %s %s",
+                        scope["method"],
+                        scope["path"],
+                        message["status"],
+                        timings.summary(total)
+                    )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timings)
+        finally:
+            _current_timings.reset(token)
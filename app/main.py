@@ -1,9 +1,20 @@
-from fastapi import FastAPI, Request
-from fastapi.responses import JSONResponse
+import time
+from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from sqlalchemy import text
 from app.core.config import settings
 from app.api.v1.router import api_router
-from app.core.exceptions import CustomException
+from app.core.cache import entity_cache
+from app.core.compression import CompressionMiddleware
+from app.core.exceptions import CustomException, ServiceUnavailableException
+from app.core.metrics import PrometheusMiddleware, mark_process_dead, pool_stats, render_metrics
+from app.core.query_monitor import QueryMonitorMiddleware
+from app.core.rate_limit import RateLimitMiddleware, rate_limiter
+from app.core.security import password_hasher
+from app.core.timing import ServerTimingMiddleware
+from app.models.base import async_engine
+from app.models.routing import ReadYourWritesMiddleware, replica_set
+from app.utils.response import FastJSONResponse, error_response, success_response
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
@@ -12,6 +23,7 @@ app = FastAPI(
     openapi_url=f"{settings.API_V1_STR}/openapi.json",
     docs_url=f"{settings.API_V1_STR}/docs",
     redoc_url=f"{settings.API_V1_STR}/redoc",
+    default_response_class=FastJSONResponse,
 )
 
 # Set up CORS middleware
@@ -23,29 +35,100 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Inside the metrics and timing middlewares, so they see the bytes on the wire
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.COMPRESSION_MINIMUM_SIZE,
+        gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+        brotli_quality=settings.COMPRESSION_BROTLI_QUALITY,
+        zstd_level=settings.COMPRESSION_ZSTD_LEVEL,
+    )
+
+app.add_middleware(QueryMonitorMiddleware)
+
+# Clients that just wrote read from the primary until replicas catch up
+if settings.DATABASE_READ_URLS and settings.READ_YOUR_WRITES_SECONDS > 0:
+    app.add_middleware(ReadYourWritesMiddleware, window=settings.READ_YOUR_WRITES_SECONDS)
+
+# Rejects over-limit clients before they reach a route or the database
+if rate_limiter.backend is not None:
+    app.add_middleware(RateLimitMiddleware, limiter=rate_limiter)
+
+if settings.METRICS_ENABLED:
+    app.add_middleware(PrometheusMiddleware)
+
+# Outermost middleware, so the total covers the whole request
+app.add_middleware(
+    ServerTimingMiddleware,
+    header=settings.SERVER_TIMING_ENABLED,
+    log=settings.REQUEST_TIMING_LOG,
+)
+
 # Include API router
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
+@app.on_event("shutdown")
+async def shutdown_password_hasher():
+    password_hasher.shutdown()
+
+
+@app.on_event("shutdown")
+async def shutdown_metrics():
+    mark_process_dead()
+
+
 # Exception handler
 @app.exception_handler(CustomException)
 async def custom_exception_handler(request: Request, exc: CustomException):
-    return JSONResponse(
-        status_code=exc.status_code,
-        content={
-            "responseCode": str(exc.status_code),
-            "responseStatus": exc.error_type,
-            "data": {"message": exc.detail}
-        }
+    return error_response(
+        str(exc.status_code),
+        exc.error_type,
+        exc.detail,
+        headers=exc.headers
     )
 
 @app.get("/")
 async def root():
-    return {
-        "responseCode": "200",
-        "responseStatus": "SUCCESS",
-        "data": {
-            "message": f"Welcome to {settings.PROJECT_NAME} API",
-            "version": settings.PROJECT_VERSION,
-            "docs": f"{settings.API_V1_STR}/docs"
-        }
-    }
+    return success_response({
+        "message": f"Welcome to {settings.PROJECT_NAME} API",
+        "version": settings.PROJECT_VERSION,
+        "docs": f"{settings.API_V1_STR}/docs"
+    })
+
+
+@app.get("/health/cache")
+async def cache_health():
+    return success_response(entity_cache.stats())
+
+
+@app.get("/health/rate-limit")
+async def rate_limit_health():
+    return success_response(rate_limiter.stats())
+
+
+@app.get("/health/db")
+async def db_health():
+    # Round trip through the pool, so a saturated pool shows up as latency
+    started = time.perf_counter()
+    try:
+        async with async_engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+    except Exception as e:
+        raise ServiceUnavailableException(f"Database unavailable: {type(e).__name__}")
+    latency_ms = (time.perf_counter() - started) * 1000
+    
+    return success_response({
+        "status": "ok",
+        "latency_ms": round(latency_ms, 2),
+        "pgbouncer": settings.DB_PGBOUNCER,
+        "replicas": replica_set.status(),
+        **pool_stats(async_engine.sync_engine.pool)
+    })
+
+
+if settings.METRICS_ENABLED:
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics():
+        body, content_type = render_metrics(async_engine.sync_engine.pool)
+        return Response(content=body, media_type=content_type)
@@ -1,26 +1,146 @@
+import os
+from typing import Any, Dict
+from uuid import uuid4
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
 from app.core.config import settings
+from app.core.metrics import observe_engine
+from app.core.query_monitor import monitor_engine
+from app.core.timing import instrument_engine
+from app.models.routing import RoutingSession, replica_set
+
+# Async drivers used for each sync dialect
+ASYNC_DRIVERS = {
+    "postgresql": "asyncpg",
+    "sqlite": "aiosqlite",
+}
+
+
+def get_async_database_url(database_url: str) -> str:
+    """
+    Derive the async driver URL from a sync database URL.
+
+    Args:
+        database_url: Database URL, e.g. ``postgresql://...`` or ``sqlite:///./app.db``
+
+    Returns:
+        The same URL using the async driver for its dialect
+    """
+    url = make_url(database_url)
+    driver = ASYNC_DRIVERS.get(url.get_backend_name())
+    if driver is None or url.get_driver_name() == driver:
+        return database_url
+
+    return url.set(drivername=f"{url.get_backend_name()}+{driver}").render_as_string(hide_password=False)
+
+
+def get_pool_options(database_url: str) -> Dict[str, Any]:
+    """
+    Build the engine pool arguments from the connection pool settings.
+
+    Args:
+        database_url: Database URL the engine connects to
+
+    Returns:
+        Keyword arguments for create_engine / create_async_engine
+    """
+    url = make_url(database_url)
+
+    # pgbouncer pools server connections itself; prepared statements do not
+    # survive its transaction mode, so asyncpg must not cache them
+    if settings.DB_PGBOUNCER:
+        options: Dict[str, Any] = {"poolclass": NullPool}
+        if url.get_driver_name() == "asyncpg":
+            options["connect_args"] = {
+                "statement_cache_size": 0,
+                "prepared_statement_cache_size": 0,
+                "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__",
+            }
+        return options
+
+    options = {"pool_pre_ping": settings.DB_POOL_PRE_PING}
+    # In-memory SQLite uses a single static connection that cannot be sized
+    if url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:"):
+        return options
+
+    options.update(
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_use_lifo=settings.DB_POOL_USE_LIFO,
+    )
+    return options
+
 
 # Create SQLAlchemy engine
 engine = create_engine(
     settings.DATABASE_URL,
-    pool_pre_ping=True,
-    echo=False
+    echo=False,
+    **get_pool_options(settings.DATABASE_URL)
 )
 
 # Create SessionLocal class
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Create async SQLAlchemy engine used by the API
+ASYNC_DATABASE_URL = settings.ASYNC_DATABASE_URL or get_async_database_url(settings.DATABASE_URL)
+async_engine = create_async_engine(
+    ASYNC_DATABASE_URL,
+    echo=False,
+    **get_pool_options(ASYNC_DATABASE_URL)
+)
+instrument_engine(async_engine.sync_engine)
+observe_engine(async_engine.sync_engine)
+monitor_engine(async_engine.sync_engine)
+
+# Read replicas serving the repository methods marked with read_replica
+replica_engines = []
+for read_url in settings.DATABASE_READ_URLS:
+    async_read_url = get_async_database_url(read_url)
+    replica_engine = create_async_engine(async_read_url, echo=False, **get_pool_options(async_read_url))
+    instrument_engine(replica_engine.sync_engine)
+    observe_engine(replica_engine.sync_engine, pool_metrics=False)
+    monitor_engine(replica_engine.sync_engine)
+    replica_engines.append(replica_engine)
+replica_set.configure(replica_engines, settings.DB_REPLICA_RETRY_SECONDS)
+
+
+def _dispose_engines_after_fork() -> None:
+    # Pooled connections inherited from the parent must not be shared with
+    # it; drop them without closing so the parent's sockets stay intact
+    engine.dispose(close=False)
+    async_engine.sync_engine.dispose(close=False)
+    for replica_engine in replica_engines:
+        replica_engine.sync_engine.dispose(close=False)
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_dispose_engines_after_fork)
+
+# Create AsyncSessionLocal class
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    sync_session_class=RoutingSession,
+    autoflush=False,
+    expire_on_commit=False
+)
+
 # Create Base class
 Base = declarative_base()
 
 
 # Dependency to get DB session
-def get_db():
-    db = SessionLocal()
-    try:
+async def get_db():
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
+
+
+# Dependency to get the session factory, for work that outlives the request such as streamed bodies
+def get_session_factory() -> async_sessionmaker:
+    return AsyncSessionLocal
@@ -1,12 +1,26 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean
+import logging
+from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, Index, event
+from sqlalchemy.engine import Connection
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.sql import func
 from app.models.base import Base
 
+logger = logging.getLogger(__name__)
+
 
 class Item(Base):
     """Item database model."""
     
     __tablename__ = "items"
+    __table_args__ = (
+        # Trigram index so substring searches on name can avoid a sequential scan
+        Index(
+            "ix_items_name_trgm",
+            "name",
+            postgresql_using="gin",
+            postgresql_ops={"name": "gin_trgm_ops"},
+        ).ddl_if(dialect="postgresql", callable_=lambda ddl, target, bind, **kw: bind is None or has_pg_trgm(bind)),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(255), index=True, nullable=False)
@@ -18,3 +32,70 @@ class Item(Base):
     
     def __repr__(self):
         return f"<Item(id={self.id}, name='{self.name}')>"
+
+
+# Search support for item names, mirrored by the item_name_search migration.
+# PostgreSQL needs pg_trgm for the trigram index; SQLite keeps an FTS5
+# trigram table in sync with items through triggers. Either is skipped when
+# the database lacks it, and searches fall back to LIKE.
+ITEM_SEARCH_SQLITE_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS items_fts USING fts5("
+    "name, content='items', content_rowid='id', tokenize='trigram')",
+    "CREATE TRIGGER IF NOT EXISTS items_fts_ai AFTER INSERT ON items BEGIN "
+    "INSERT INTO items_fts(rowid, name) VALUES (new.id, new.name); END",
+    "CREATE TRIGGER IF NOT EXISTS items_fts_ad AFTER DELETE ON items BEGIN "
+    "INSERT INTO items_fts(items_fts, rowid, name) VALUES ('delete', old.id, old.name); END",
+    "CREATE TRIGGER IF NOT EXISTS items_fts_au AFTER UPDATE OF name ON items BEGIN "
+    "INSERT INTO items_fts(items_fts, rowid, name) VALUES ('delete', old.id, old.name); "
+    "INSERT INTO items_fts(rowid, name) VALUES (new.id, new.name); END",
+]
+
+# The FTS5 trigram tokenizer was added in SQLite 3.34
+FTS5_TRIGRAM_MIN_SQLITE_VERSION = (3, 34, 0)
+
+
+def create_pg_trgm(connection: Connection) -> bool:
+    """Create the pg_trgm extension if possible; returns whether it is installed."""
+    try:
+        with connection.begin_nested():
+            connection.exec_driver_sql("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    except DBAPIError as e:
+        logger.warning("pg_trgm is unavailable, item search falls back to LIKE: %s", e.orig)
+    return has_pg_trgm(connection)
+
+
+def has_pg_trgm(connection: Connection) -> bool:
+    """Whether the pg_trgm extension is installed in the database."""
+    return bool(connection.exec_driver_sql("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'").scalar())
+
+
+def supports_fts5_trigram(connection: Connection) -> bool:
+    """Whether SQLite is built with FTS5 and recent enough for its trigram tokenizer."""
+    version = connection.exec_driver_sql("SELECT sqlite_version()").scalar()
+    if tuple(int(part) for part in version.split(".")) < FTS5_TRIGRAM_MIN_SQLITE_VERSION:
+        return False
+    options = connection.exec_driver_sql("PRAGMA compile_options").scalars().all()
+    return "ENABLE_FTS5" in options
+
+
+@event.listens_for(Item.__table__, "before_create")
+def _create_search_extension(target, connection, **kw):
+    if connection.dialect.name == "postgresql":
+        create_pg_trgm(connection)
+
+
+@event.listens_for(Item.__table__, "after_create")
+def _create_search_table(target, connection, **kw):
+    if connection.dialect.name != "sqlite":
+        return
+    if not supports_fts5_trigram(connection):
+        logger.warning("SQLite lacks the FTS5 trigram tokenizer, item search falls back to LIKE")
+        return
+    for statement in ITEM_SEARCH_SQLITE_DDL:
+        connection.exec_driver_sql(statement)
+
+
+@event.listens_for(Item.__table__, "before_drop")
+def _drop_search_table(target, connection, **kw):
+    if connection.dialect.name == "sqlite":
+        connection.exec_driver_sql("DROP TABLE IF EXISTS items_fts")
@@ -0,0 +1,174 @@
+import functools
+import itertools
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, TypeVar
+from sqlalchemy.exc import DBAPIError, InterfaceError, OperationalError
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.orm import Session
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+# Cookie marking a client that wrote recently and must read from the primary
+PRIMARY_COOKIE = "db_primary"
+UNSAFE_METHODS = {"POST", "PUT", "PATCH", "DELETE"}
+
+# Replica serving the read method that is running, if any
+_current_replica: ContextVar[Optional[AsyncEngine]] = ContextVar("current_replica", default=None)
+# Set for requests that must see their own writes
+_primary_pinned: ContextVar[bool] = ContextVar("primary_pinned", default=False)
+
+
+class ReplicaSet:
+    """
+    Read replicas picked in round-robin order.
+
+    A replica whose connection fails is skipped for retry_seconds, then
+    tried again by the next read that reaches it.
+    """
+
+    def __init__(self, engines: Sequence[AsyncEngine] = (), retry_seconds: float = 30):
+        self.configure(engines, retry_seconds)
+
+    def configure(self, engines: Sequence[AsyncEngine], retry_seconds: float = 30) -> None:
+        """Replace the replicas, all starting out healthy."""
+        self.engines: List[AsyncEngine] = list(engines)
+        self.retry_seconds = retry_seconds
+        self._failed_until: Dict[int, float] = {}
+        self._next = itertools.cycle(range(len(self.engines)))
+
+    def choose(self) -> Optional[AsyncEngine]:
+        """Next healthy replica, or None when all are down or none are configured."""
+        now = time.monotonic()
+        for _ in range(len(self.engines)):
+            index = next(self._next)
+            if self._failed_until.get(index, 0) <= now:
+                return self.engines[index]
+        return None
+
+    def mark_failed(self, engine: AsyncEngine) -> None:
+        """Take a replica out of rotation for retry_seconds."""
+        index = self.engines.index(engine)
+        self._failed_until[index] = time.monotonic() + self.retry_seconds
+        logger.warning("Read replica %s failed; using other servers for %ss", index, self.retry_seconds)
+
+    def status(self) -> List[Dict[str, Any]]:
+        """Health of each replica, for the health endpoint."""
+        now = time.monotonic()
+        return [
+            {"replica": index, "healthy": self._failed_until.get(index, 0) <= now}
+            for index in range(len(self.engines))
+        ]
+
+
+replica_set = ReplicaSet()
+
+
+class RoutingSession(Session):
+    """Session sending the statements of replica reads to the chosen replica."""
+
+    def get_bind(self, mapper: Any = None, clause: Any = None, **kwargs: Any) -> Any:
+        replica = _current_replica.get()
+        if replica is not None and not self._flushing:
+            return replica.sync_engine
+        return super().get_bind(mapper, clause=clause, **kwargs)
+
+
+def read_replica(method: F) -> F:
+    """
+    Run a repository read method on a read replica.
+
+    Falls back to the primary when no replica is healthy, when the request
+    is pinned to the primary, or when the replica connection fails, in
+    which case the replica is taken out of rotation.
+    """
+    @functools.wraps(method)
+    async def wrapper(self: Any, *args: Any, **kwargs: Any) -> Any:
+        replica = None if _primary_pinned.get() else replica_set.choose()
+        if replica is None:
+            return await method(self, *args, **kwargs)
+
+        token = _current_replica.set(replica)
+        try:
+            return await method(self, *args, **kwargs)
+        except (DBAPIError, OSError) as e:
+            if not _is_connection_error(e):
+                raise
+            replica_set.mark_failed(replica)
+            await self.db.rollback()
+        finally:
+            _current_replica.reset(token)
+
+        return await method(self, *args, **kwargs)
+    return wrapper  # type: ignore[return-value]
+
+
+def primary_pinned() -> bool:
+    """Whether the running request must read from the primary."""
+    return _primary_pinned.get()
+
+
+@contextmanager
+def on_primary() -> Iterator[None]:
+    """Send the statements in the block to the primary, even inside a replica read."""
+    token = _current_replica.set(None)
+    try:
+        yield
+    finally:
+        _current_replica.reset(token)
+
+
+class ReadYourWritesMiddleware:
+    """
+    Pin clients to the primary for a short window after they write.
+
+    Write requests read from the primary themselves and set a cookie that
+    expires after window seconds; requests carrying it skip the replicas,
+    so a client sees its own changes despite replication lag. Being a
+    cookie, the pin holds across worker processes.
+    """
+
+    def __init__(self, app: ASGIApp, window: int = 5):
+        self.app = app
+        self.window = window
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        writes = scope["method"] in UNSAFE_METHODS
+        token = _primary_pinned.set(writes or _has_primary_cookie(scope))
+
+        async def send_with_cookie(message: Message) -> None:
+            if message["type"] == "http.response.start" and writes and message["status"] < 400:
+                MutableHeaders(scope=message).append(
+                    "Set-Cookie",
+                    f"{PRIMARY_COOKIE}=1; Max-Age={self.window}; Path=/; HttpOnly; SameSite=Lax"
+                )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_cookie)
+        finally:
+            _primary_pinned.reset(token)
+
+
+def _is_connection_error(error: Exception) -> bool:
+    # Failures to reach the server, as opposed to errors in the statement
+    if isinstance(error, DBAPIError):
+        return error.connection_invalidated or isinstance(error, (OperationalError, InterfaceError))
+    return True
+
+
+def _has_primary_cookie(scope: Scope) -> bool:
+    for name, value in scope["headers"]:
+        if name == b"cookie" and f"{PRIMARY_COOKIE}=".encode() in value:
+            return True
+    return False
@@ -0,0 +1,38 @@
+from typing import Any, Dict, List
+from sqlalchemy import Table, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+async def insert_rows(db: AsyncSession, table: Table, rows: List[Dict[str, Any]]) -> None:
+    """
+    Insert rows in the current transaction as fast as the driver allows.
+
+    On PostgreSQL with asyncpg the rows are sent with COPY ... FROM STDIN;
+    elsewhere they go through an executemany INSERT, which SQLAlchemy
+    batches into multi-row statements. Columns left out of the rows get
+    their server defaults.
+
+    Args:
+        db: Database session
+        table: Table to insert into
+        rows: Rows with the same keys
+    """
+    if not rows:
+        return
+
+    connection = await db.connection()
+    if connection.dialect.driver == "asyncpg":
+        # The adapter only sends BEGIN with its first statement, and COPY on the
+        # raw connection bypasses it; without this the rows would be autocommitted
+        await connection.exec_driver_sql("SELECT 1")
+        columns = list(rows[0])
+        raw_connection = await connection.get_raw_connection()
+        await raw_connection.driver_connection.copy_records_to_table(
+            table.name,
+            records=[tuple(row[column] for column in columns) for row in rows],
+            columns=columns,
+            schema_name=table.schema
+        )
+        return
+
+    await db.execute(insert(table), rows)
@@ -0,0 +1,105 @@
+import json
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+from sqlalchemy import Select, func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.utils.pagination import CountMode
+
+# Cached totals keyed by compiled query: {key: (expires_at, total)}
+_count_cache: "OrderedDict[str, Tuple[float, int]]" = OrderedDict()
+
+
+async def count_rows(db: AsyncSession, query: Select, mode: CountMode) -> Tuple[Optional[int], CountMode]:
+    """
+    Count the rows matched by a list query using the requested strategy.
+    
+    Args:
+        db: Database session
+        query: Filtered select, without ordering or pagination
+        mode: Count strategy to use
+        
+    Returns:
+        Tuple containing the total (None for CountMode.NONE) and the
+        strategy actually used. Estimates fall back to an exact count when
+        the database cannot provide one.
+    """
+    if mode == CountMode.NONE:
+        return None, CountMode.NONE
+    
+    if mode == CountMode.ESTIMATED:
+        estimate = await _estimate_count(db, query)
+        if estimate is not None:
+            return estimate, CountMode.ESTIMATED
+        return await _exact_count(db, query), CountMode.EXACT
+    
+    if mode == CountMode.CACHED:
+        return await _cached_count(db, query), CountMode.CACHED
+    
+    return await _exact_count(db, query), CountMode.EXACT
+
+
+def clear_count_cache() -> None:
+    """Drop all cached totals."""
+    _count_cache.clear()
+
+
+async def _exact_count(db: AsyncSession, query: Select) -> int:
+    """Run SELECT count(*) over the filtered query."""
+    return await db.scalar(select(func.count()).select_from(query.subquery()))
+
+
+async def _cached_count(db: AsyncSession, query: Select) -> int:
+    """Return a per-filter total, recounting once its TTL has expired."""
+    key = _compile(db, query)
+    now = time.monotonic()
+    
+    cached = _count_cache.get(key)
+    if cached is not None and cached[0] > now:
+        _count_cache.move_to_end(key)
+        return cached[1]
+    
+    total = await _exact_count(db, query)
+    _count_cache[key] = (now + settings.COUNT_CACHE_TTL, total)
+    _count_cache.move_to_end(key)
+    while len(_count_cache) > settings.COUNT_CACHE_SIZE:
+        _count_cache.popitem(last=False)
+    
+    return total
+
+
+async def _estimate_count(db: AsyncSession, query: Select) -> Optional[int]:
+    """
+    Estimate the total from PostgreSQL statistics.
+    
+    Unfiltered queries read pg_class.reltuples; filtered queries use the
+    planner's row estimate. Returns None on other databases or when the
+    table has never been analyzed.
+    """
+    if db.bind.dialect.name != "postgresql":
+        return None
+    
+    if query.whereclause is None:
+        table = query.get_final_froms()[0]
+        estimate = await db.scalar(
+            text("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:table)"),
+            {"table": table.name}
+        )
+    else:
+        connection = await db.connection()
+        result = await connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {_compile(db, query)}")
+        plan = result.scalar()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        estimate = plan[0]["Plan"]["Plan Rows"]
+    
+    if estimate is None or estimate < 0:
+        return None
+    
+    return int(estimate)
+
+
+def _compile(db: AsyncSession, query: Select) -> str:
+    """Render a query with its parameters inlined for the session's dialect."""
+    return str(query.compile(dialect=db.bind.dialect, compile_kwargs={"literal_binds": True}))
@@ -1,18 +1,47 @@
-from typing import List, Optional, Tuple, Dict, Any
-from sqlalchemy.orm import Session
-from sqlalchemy import func, or_
-from app.models.base import SessionLocal
+from typing import AsyncIterator, List, Optional, Tuple, Dict, Any
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import Select, delete, insert, select, update
+from sqlalchemy.sql.elements import ColumnElement
+from app.core.cache import entity_cache
+from app.core.metrics import count_queries
 from app.models.item import Item
-from app.schemas.item import ItemCreate, ItemUpdate
+from app.models.routing import on_primary, read_replica
+from app.schemas.item import ItemBulkUpdate, ItemCreate, ItemSort, ItemUpdate
+from app.repositories.bulk_insert import insert_rows
+from app.repositories.counting import count_rows
+from app.repositories.search import search_item_names
+from app.utils.pagination import CountMode, Page
 
+# Columns of the item representation returned by the API
+ITEM_COLUMNS = (
+    Item.id,
+    Item.name,
+    Item.description,
+    Item.price,
+    Item.is_active,
+    Item.created_at,
+    Item.updated_at,
+)
 
+
+@count_queries
 class ItemRepository:
     """Repository for item database operations."""
     
-    def __init__(self):
-        self.db: Session = SessionLocal()
+    def __init__(self, db: AsyncSession):
+        self.db = db
     
-    def get_items(self, limit: int, offset: int, name: Optional[str] = None) -> Tuple[List[Dict[str, Any]], int]:
+    @read_replica
+    async def get_items(
+        self,
+        limit: int,
+        offset: int,
+        name: Optional[str] = None,
+        after_id: Optional[int] = None,
+        count_mode: CountMode = CountMode.EXACT,
+        sort: ItemSort = ItemSort.ID,
+        fields: Optional[List[str]] = None
+    ) -> Page:
         """
         Get items with pagination and optional filtering.
         
@@ -20,44 +49,83 @@ class ItemRepository:
             limit: Maximum number of items to return
             offset: Number of items to skip
             name: Filter by name (optional)
+            after_id: Return only items with an ID greater than this (keyset mode, optional)
+            count_mode: Strategy for computing the total count
+            sort: Order by ID, or by search relevance when filtering by name
+            fields: Columns to load (optional, defaults to all)
             
         Returns:
-            Tuple containing list of items and total count
+            Page of items with total count and whether more items exist
         """
-        query = self.db.query(Item)
-        
-        # Apply filters if provided
-        if name:
-            query = query.filter(Item.name.ilike(f"%{name}%"))
+        # Rows are read as mappings; no ORM instances are built
+        entity = select(*self._item_columns(fields))
+        query, rank = await self._filter_items(entity, name)
         
         # Get total count
-        total = query.count()
+        total, count_mode = await count_rows(self.db, query, count_mode)
         
-        # Apply pagination
-        items = query.order_by(Item.id).offset(offset).limit(limit).all()
+        query = self._paginate_items(query, rank, limit, offset, after_id, sort)
+        result = await self.db.execute(query)
+        items = result.mappings().all()
+        items_dict = [dict(item) for item in items[:limit]]
         
-        # Convert to dict
-        items_dict = [self._item_to_dict(item) for item in items]
+        return Page(items=items_dict, total=total, has_more=len(items) > limit, count_mode=count_mode)
+    
+    async def stream_items(
+        self,
+        name: Optional[str] = None,
+        fields: Optional[List[str]] = None,
+        batch_size: int = 1000
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        Stream all matching items in ID order, for exports.
         
-        return items_dict, total
+        Args:
+            name: Filter by name (optional)
+            fields: Columns to load (optional, defaults to all)
+            batch_size: Rows fetched from the cursor at a time
+            
+        Yields:
+            Batches of up to batch_size items
+        """
+        query, _ = await self._filter_items(select(*self._item_columns(fields)), name)
+        
+        # Server-side cursor: only one batch of rows is held in memory at a time
+        result = await self.db.stream(query.order_by(Item.id).execution_options(yield_per=batch_size))
+        async for rows in result.mappings().partitions():
+            yield [dict(row) for row in rows]
     
-    def get_item(self, item_id: int) -> Optional[Dict[str, Any]]:
+    @read_replica
+    async def get_item(self, item_id: int, fields: Optional[List[str]] = None) -> Optional[Dict[str, Any]]:
         """
         Get a specific item by ID.
         
         Args:
             item_id: ID of the item to retrieve
+            fields: Columns to load (optional, defaults to all)
             
         Returns:
             Item data or None if not found
         """
-        item = self.db.query(Item).filter(Item.id == item_id).first()
-        if not item:
-            return None
+        # Sparse fieldsets are projected in SQL; only full items are cached
+        if fields:
+            return await self._load_item(item_id, fields)
         
-        return self._item_to_dict(item)
+        # Cached items are shared by all clients, so never filled from a lagging replica
+        async def load_from_primary() -> Optional[Dict[str, Any]]:
+            with on_primary():
+                return await self._load_item(item_id)
+        
+        return await entity_cache.get_or_load(f"item:{item_id}", load_from_primary)
+    
+    async def _load_item(self, item_id: int, fields: Optional[List[str]] = None) -> Optional[Dict[str, Any]]:
+        """Load an item from the database as a mapping, bypassing the cache."""
+        result = await self.db.execute(select(*self._item_columns(fields)).where(Item.id == item_id))
+        row = result.mappings().first()
+        
+        return dict(row) if row else None
     
-    def create_item(self, item_data: ItemCreate) -> Dict[str, Any]:
+    async def create_item(self, item_data: ItemCreate) -> Dict[str, Any]:
         """
         Create a new item.
         
@@ -69,49 +137,175 @@ class ItemRepository:
         """
         item = Item(**item_data.dict())
         self.db.add(item)
-        self.db.commit()
-        self.db.refresh(item)
+        await self.db.commit()
+        await self.db.refresh(item)
         
         return self._item_to_dict(item)
     
-    def update_item(self, item_id: int, item_data: ItemUpdate) -> Dict[str, Any]:
+    async def update_item(self, item_id: int, item_data: ItemUpdate) -> Optional[Dict[str, Any]]:
         """
-        Update an existing item.
+        Update an existing item with a single UPDATE ... RETURNING.
         
         Args:
             item_id: ID of the item to update
             item_data: Item data for update
             
         Returns:
-            Updated item data
+            Updated item data or None if not found
         """
-        item = self.db.query(Item).filter(Item.id == item_id).first()
-        
-        # Update only provided fields
+        # Update only provided fields; an empty update leaves the row untouched
         update_data = item_data.dict(exclude_unset=True)
-        for key, value in update_data.items():
-            setattr(item, key, value)
+        if not update_data:
+            return await self.get_item(item_id)
         
-        self.db.commit()
-        self.db.refresh(item)
+        result = await self.db.execute(
+            update(Item).where(Item.id == item_id).values(**update_data).returning(*ITEM_COLUMNS)
+        )
+        row = result.mappings().first()
+        await self.db.commit()
+        if row is None:
+            return None
         
-        return self._item_to_dict(item)
+        await entity_cache.invalidate(f"item:{item_id}")
+        return dict(row)
     
-    def delete_item(self, item_id: int) -> bool:
+    async def delete_item(self, item_id: int) -> bool:
         """
-        Delete an item.
+        Delete an item with a single DELETE ... RETURNING.
         
         Args:
             item_id: ID of the item to delete
             
         Returns:
-            True if deleted
+            True if deleted, False if not found
+        """
+        result = await self.db.execute(delete(Item).where(Item.id == item_id).returning(Item.id))
+        deleted = result.scalar_one_or_none() is not None
+        await self.db.commit()
+        if deleted:
+            await entity_cache.invalidate(f"item:{item_id}")
+        
+        return deleted
+    
+    async def create_items(self, items_data: List[ItemCreate]) -> List[Dict[str, Any]]:
+        """
+        Create several items in one transaction with a multi-row INSERT ... RETURNING.
+        
+        Args:
+            items_data: Item data for creation
+            
+        Returns:
+            Created items data, in the order given
+        """
+        result = await self.db.scalars(
+            insert(Item).returning(Item, sort_by_parameter_order=True),
+            [item_data.dict() for item_data in items_data]
+        )
+        items = result.all()
+        await self.db.commit()
+        
+        return [self._item_to_dict(item) for item in items]
+    
+    async def insert_items(self, rows: List[Dict[str, Any]]) -> None:
+        """
+        Insert items in one transaction, with COPY on PostgreSQL.
+        
+        Args:
+            rows: Column values of each item, all with the same keys
+        """
+        try:
+            await insert_rows(self.db, Item.__table__, rows)
+            await self.db.commit()
+        except Exception:
+            await self.db.rollback()
+            raise
+    
+    async def update_items(self, items_data: List[ItemBulkUpdate]) -> Dict[int, Dict[str, Any]]:
+        """
+        Update several items in one transaction with an executemany UPDATE.
+        
+        Args:
+            items_data: Item data for update, each carrying the item ID
+            
+        Returns:
+            Updated items data keyed by ID; IDs that do not exist are absent
+        """
+        ids = {item_data.id for item_data in items_data}
+        existing = set(await self.db.scalars(select(Item.id).where(Item.id.in_(ids))))
+        
+        # Update only provided fields of items that exist
+        rows = [
+            item_data.dict(exclude_unset=True)
+            for item_data in items_data
+            if item_data.id in existing and item_data.dict(exclude_unset=True).keys() - {"id"}
+        ]
+        if rows:
+            await self.db.execute(update(Item), rows)
+        
+        result = await self.db.execute(select(*ITEM_COLUMNS).where(Item.id.in_(existing)))
+        items = {item["id"]: dict(item) for item in result.mappings()}
+        await self.db.commit()
+        await entity_cache.invalidate(*[f"item:{item_id}" for item_id in items])
+        
+        return items
+    
+    async def delete_items(self, item_ids: List[int]) -> List[int]:
+        """
+        Delete several items in one transaction with DELETE ... WHERE id IN.
+        
+        Args:
+            item_ids: IDs of the items to delete
+            
+        Returns:
+            IDs that were deleted
         """
-        item = self.db.query(Item).filter(Item.id == item_id).first()
-        self.db.delete(item)
-        self.db.commit()
+        result = await self.db.scalars(
+            delete(Item).where(Item.id.in_(item_ids)).returning(Item.id)
+        )
+        deleted = result.all()
+        await self.db.commit()
+        await entity_cache.invalidate(*[f"item:{item_id}" for item_id in deleted])
+        
+        return deleted
+    
+    async def _filter_items(self, query: Select, name: Optional[str]) -> Tuple[Select, Optional[ColumnElement]]:
+        """Apply list filters; returns the query and a relevance expression, if any."""
+        rank = None
+        
+        # Apply filters if provided
+        if name:
+            query, rank = await search_item_names(self.db, query, name)
+        
+        return query, rank
+    
+    def _paginate_items(
+        self,
+        query: Select,
+        rank: Optional[ColumnElement],
+        limit: int,
+        offset: int,
+        after_id: Optional[int],
+        sort: ItemSort
+    ) -> Select:
+        """Apply list ordering and pagination."""
+        # Best matches first when ranking is available; ID breaks ties
+        if sort == ItemSort.RELEVANCE and rank is not None:
+            query = query.order_by(rank)
+        
+        # Keyset mode seeks on the primary key instead of skipping rows.
+        # One extra row tells whether another page exists without needing the total.
+        query = query.order_by(Item.id).limit(limit + 1)
+        if after_id is not None:
+            return query.where(Item.id > after_id)
+        
+        return query.offset(offset)
+    
+    def _item_columns(self, fields: Optional[List[str]]) -> Tuple[ColumnElement, ...]:
+        """Columns of the item representation, restricted to a sparse fieldset."""
+        if not fields:
+            return ITEM_COLUMNS
         
-        return True
+        return tuple(column for column in ITEM_COLUMNS if column.key in fields)
     
     def _item_to_dict(self, item: Item) -> Dict[str, Any]:
         """Convert an Item model to a dictionary."""
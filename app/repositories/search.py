@@ -0,0 +1,82 @@
+from typing import Dict, Optional, Tuple
+from sqlalchemy import Select, column, func, literal_column, table, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.elements import ColumnElement
+from app.models.item import Item
+
+# Search backends, detected once per database URL
+TRIGRAM = "trigram"
+FTS5 = "fts5"
+LIKE = "like"
+
+# Trigram matching needs at least three characters
+MIN_INDEXED_TERM_LENGTH = 3
+
+items_fts = table("items_fts", column("rowid"), column("rank"))
+
+_search_backends: Dict[str, str] = {}
+
+
+async def get_search_backend(db: AsyncSession) -> str:
+    """
+    Detect the name search backend available in the database.
+    
+    Args:
+        db: Database session
+        
+    Returns:
+        TRIGRAM when PostgreSQL has pg_trgm, FTS5 when SQLite has the
+        items_fts table, otherwise LIKE
+    """
+    key = str(db.bind.url)
+    if key in _search_backends:
+        return _search_backends[key]
+    
+    backend = LIKE
+    dialect = db.bind.dialect.name
+    if dialect == "postgresql":
+        if await db.scalar(text("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")):
+            backend = TRIGRAM
+    elif dialect == "sqlite":
+        if await db.scalar(text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'items_fts'")):
+            backend = FTS5
+    
+    _search_backends[key] = backend
+    return backend
+
+
+async def search_item_names(
+    db: AsyncSession,
+    query: Select,
+    term: str
+) -> Tuple[Select, Optional[ColumnElement]]:
+    """
+    Filter an item query by a substring of the item name.
+    
+    Args:
+        db: Database session
+        query: Item select to filter
+        term: Substring to search for
+        
+    Returns:
+        Tuple containing the filtered query and a relevance expression to
+        order by ascending (best match first), or None when the fallback
+        ILIKE filter was used
+    """
+    backend = await get_search_backend(db)
+    if len(term) < MIN_INDEXED_TERM_LENGTH:
+        backend = LIKE
+    
+    if backend == TRIGRAM:
+        # ILIKE is served by the GIN trigram index on name
+        query = query.where(Item.name.ilike(f"%{term}%"))
+        return query, -func.similarity(Item.name, term)
+    
+    if backend == FTS5:
+        phrase = '"' + term.replace('"', '""') + '"'
+        query = query.join(items_fts, items_fts.c.rowid == Item.id).where(
+            literal_column("items_fts").op("MATCH")(phrase)
+        )
+        return query, items_fts.c.rank
+    
+    return query.where(Item.name.ilike(f"%{term}%")), None
@@ -1,17 +1,44 @@
-from typing import List, Optional, Tuple, Dict, Any
-from sqlalchemy.orm import Session
-from sqlalchemy import func, or_
-from app.models.base import SessionLocal
+from typing import AsyncIterator, List, Optional, Tuple, Dict, Any
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import Select, delete, select, update
+from sqlalchemy.sql.elements import ColumnElement
+from app.core.cache import entity_cache
+from app.core.metrics import count_queries
 from app.models.user import User
+from app.models.routing import on_primary, read_replica
+from app.repositories.bulk_insert import insert_rows
+from app.repositories.counting import count_rows
+from app.utils.pagination import CountMode, Page
 
+# Columns of the user representation returned by the API; never the password hash
+USER_COLUMNS = (
+    User.id,
+    User.email,
+    User.username,
+    User.is_active,
+    User.is_superuser,
+    User.created_at,
+    User.updated_at,
+)
 
+
+@count_queries
 class UserRepository:
     """Repository for user database operations."""
     
-    def __init__(self):
-        self.db: Session = SessionLocal()
+    def __init__(self, db: AsyncSession):
+        self.db = db
     
-    def get_users(self, limit: int, offset: int, email: Optional[str] = None) -> Tuple[List[Dict[str, Any]], int]:
+    @read_replica
+    async def get_users(
+        self,
+        limit: int,
+        offset: int,
+        email: Optional[str] = None,
+        after_id: Optional[int] = None,
+        count_mode: CountMode = CountMode.EXACT,
+        fields: Optional[List[str]] = None
+    ) -> Page:
         """
         Get users with pagination and optional filtering.
         
@@ -19,44 +46,83 @@ class UserRepository:
             limit: Maximum number of users to return
             offset: Number of users to skip
             email: Filter by email (optional)
+            after_id: Return only users with an ID greater than this (keyset mode, optional)
+            count_mode: Strategy for computing the total count
+            fields: Columns to load (optional, defaults to all)
             
         Returns:
-            Tuple containing list of users and total count
+            Page of users with total count and whether more users exist
         """
-        query = self.db.query(User)
-        
-        # Apply filters if provided
-        if email:
-            query = query.filter(User.email.ilike(f"%{email}%"))
+        # Rows are read as mappings; no ORM instances are built
+        entity = select(*self._user_columns(fields))
+        query = self._filter_users(entity, email)
         
         # Get total count
-        total = query.count()
+        total, count_mode = await count_rows(self.db, query, count_mode)
         
-        # Apply pagination
-        users = query.order_by(User.id).offset(offset).limit(limit).all()
+        query = self._paginate_users(query, limit, offset, after_id)
+        result = await self.db.execute(query)
+        users = result.mappings().all()
+        users_dict = [dict(user) for user in users[:limit]]
+        
+        return Page(items=users_dict, total=total, has_more=len(users) > limit, count_mode=count_mode)
+    
+    async def stream_users(
+        self,
+        email: Optional[str] = None,
+        fields: Optional[List[str]] = None,
+        batch_size: int = 1000
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        Stream all matching users in ID order, for exports.
         
-        # Convert to dict
-        users_dict = [self._user_to_dict(user) for user in users]
+        Args:
+            email: Filter by email (optional)
+            fields: Columns to load (optional, defaults to all)
+            batch_size: Rows fetched from the cursor at a time
+            
+        Yields:
+            Batches of up to batch_size users
+        """
+        query = self._filter_users(select(*self._user_columns(fields)), email)
         
-        return users_dict, total
+        # Server-side cursor: only one batch of rows is held in memory at a time
+        result = await self.db.stream(query.order_by(User.id).execution_options(yield_per=batch_size))
+        async for rows in result.mappings().partitions():
+            yield [dict(row) for row in rows]
     
-    def get_user(self, user_id: int) -> Optional[Dict[str, Any]]:
+    @read_replica
+    async def get_user(self, user_id: int, fields: Optional[List[str]] = None) -> Optional[Dict[str, Any]]:
         """
         Get a specific user by ID.
         
         Args:
             user_id: ID of the user to retrieve
+            fields: Columns to load (optional, defaults to all)
             
         Returns:
             User data or None if not found
         """
-        user = self.db.query(User).filter(User.id == user_id).first()
-        if not user:
-            return None
+        # Sparse fieldsets are projected in SQL; only full users are cached
+        if fields:
+            return await self._load_user(user_id, fields)
         
-        return self._user_to_dict(user)
+        # Cached users are shared by all clients, so never filled from a lagging replica
+        async def load_from_primary() -> Optional[Dict[str, Any]]:
+            with on_primary():
+                return await self._load_user(user_id)
+        
+        return await entity_cache.get_or_load(f"user:{user_id}", load_from_primary)
+    
+    async def _load_user(self, user_id: int, fields: Optional[List[str]] = None) -> Optional[Dict[str, Any]]:
+        """Load a user from the database as a mapping, bypassing the cache."""
+        result = await self.db.execute(select(*self._user_columns(fields)).where(User.id == user_id))
+        row = result.mappings().first()
+        
+        return dict(row) if row else None
     
-    def get_user_by_email(self, email: str) -> Optional[Dict[str, Any]]:
+    @read_replica
+    async def get_user_by_email(self, email: str) -> Optional[Dict[str, Any]]:
         """
         Get a specific user by email.
         
@@ -66,13 +132,12 @@ class UserRepository:
         Returns:
             User data or None if not found
         """
-        user = self.db.query(User).filter(User.email == email).first()
-        if not user:
-            return None
+        result = await self.db.execute(select(*USER_COLUMNS).where(User.email == email))
+        row = result.mappings().first()
         
-        return self._user_to_dict(user)
+        return dict(row) if row else None
     
-    def create_user(self, user_data: Dict[str, Any]) -> Dict[str, Any]:
+    async def create_user(self, user_data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Create a new user.
         
@@ -84,48 +149,105 @@ class UserRepository:
         """
         user = User(**user_data)
         self.db.add(user)
-        self.db.commit()
-        self.db.refresh(user)
+        await self.db.commit()
+        await self.db.refresh(user)
         
         return self._user_to_dict(user)
     
-    def update_user(self, user_id: int, user_data: Dict[str, Any]) -> Dict[str, Any]:
+    async def insert_users(self, rows: List[Dict[str, Any]]) -> None:
         """
-        Update an existing user.
+        Insert users in one transaction, with COPY on PostgreSQL.
+        
+        Args:
+            rows: Column values of each user, all with the same keys
+        """
+        try:
+            await insert_rows(self.db, User.__table__, rows)
+            await self.db.commit()
+        except Exception:
+            await self.db.rollback()
+            raise
+    
+    async def user_exists(self, user_id: int) -> bool:
+        """
+        Check whether a user exists with a primary-key-only query.
+        
+        Args:
+            user_id: ID of the user
+            
+        Returns:
+            True if the user exists
+        """
+        result = await self.db.scalar(select(User.id).where(User.id == user_id))
+        return result is not None
+    
+    async def update_user(self, user_id: int, user_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Update an existing user with a single UPDATE ... RETURNING.
         
         Args:
             user_id: ID of the user to update
             user_data: User data for update
             
         Returns:
-            Updated user data
+            Updated user data or None if not found
         """
-        user = self.db.query(User).filter(User.id == user_id).first()
-        
-        # Update only provided fields
-        for key, value in user_data.items():
-            setattr(user, key, value)
+        # Update only provided fields; an empty update leaves the row untouched
+        if not user_data:
+            return await self.get_user(user_id)
         
-        self.db.commit()
-        self.db.refresh(user)
+        result = await self.db.execute(
+            update(User).where(User.id == user_id).values(**user_data).returning(*USER_COLUMNS)
+        )
+        row = result.mappings().first()
+        await self.db.commit()
+        if row is None:
+            return None
         
-        return self._user_to_dict(user)
+        await entity_cache.invalidate(f"user:{user_id}")
+        return dict(row)
     
-    def delete_user(self, user_id: int) -> bool:
+    async def delete_user(self, user_id: int) -> bool:
         """
-        Delete a user.
+        Delete a user with a single DELETE ... RETURNING.
         
         Args:
             user_id: ID of the user to delete
             
         Returns:
-            True if deleted
+            True if deleted, False if not found
         """
-        user = self.db.query(User).filter(User.id == user_id).first()
-        self.db.delete(user)
-        self.db.commit()
+        result = await self.db.execute(delete(User).where(User.id == user_id).returning(User.id))
+        deleted = result.scalar_one_or_none() is not None
+        await self.db.commit()
+        if deleted:
+            await entity_cache.invalidate(f"user:{user_id}")
+        
+        return deleted
+    
+    def _filter_users(self, query: Select, email: Optional[str]) -> Select:
+        """Apply list filters."""
+        if email:
+            query = query.where(User.email.ilike(f"%{email}%"))
+        
+        return query
+    
+    def _paginate_users(self, query: Select, limit: int, offset: int, after_id: Optional[int]) -> Select:
+        """Apply list ordering and pagination."""
+        # Keyset mode seeks on the primary key instead of skipping rows.
+        # One extra row tells whether another page exists without needing the total.
+        query = query.order_by(User.id).limit(limit + 1)
+        if after_id is not None:
+            return query.where(User.id > after_id)
+        
+        return query.offset(offset)
+    
+    def _user_columns(self, fields: Optional[List[str]]) -> Tuple[ColumnElement, ...]:
+        """Columns of the user representation, restricted to a sparse fieldset."""
+        if not fields:
+            return USER_COLUMNS
         
-        return True
+        return tuple(column for column in USER_COLUMNS if column.key in fields)
     
     def _user_to_dict(self, user: User) -> Dict[str, Any]:
         """Convert a User model to a dictionary."""
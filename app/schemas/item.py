@@ -1,6 +1,13 @@
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
+from enum import Enum
+
+
+class ItemSort(str, Enum):
+    """Orderings for item lists."""
+    ID = "id"
+    RELEVANCE = "relevance"
 
 
 class ItemBase(BaseModel):
@@ -24,6 +31,16 @@ class ItemUpdate(BaseModel):
     is_active: Optional[bool] = Field(None, description="Whether the item is active")
 
 
+class ItemBulkUpdate(ItemUpdate):
+    """Schema for one row of a bulk Item update."""
+    id: int = Field(..., description="ID of the item to update", example=1)
+
+
+class ItemBulkDelete(BaseModel):
+    """Schema for a bulk Item delete."""
+    ids: List[int] = Field(..., min_length=1, description="IDs of the items to delete", example=[1, 2, 3])
+
+
 class ItemResponse(ItemBase):
     """Schema for Item response."""
     id: int = Field(..., description="Item ID")
@@ -1,16 +1,33 @@
-from typing import List, Optional, Tuple, Dict, Any
+from typing import AsyncIterator, List, Optional, Dict, Any
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 from app.repositories.item_repository import ItemRepository
-from app.schemas.item import ItemCreate, ItemUpdate
+from app.schemas.item import ItemBulkUpdate, ItemCreate, ItemSort, ItemUpdate
+from app.core.config import settings
 from app.core.exceptions import NotFoundException, DatabaseException
+from app.core.single_flight import single_flight
+from app.models.routing import primary_pinned
+from app.utils.bulk_import import ImportResult, Record, batched, load_rows, validation_message
+from app.utils.export import start_stream
+from app.utils.pagination import CountMode, Page
 
 
 class ItemService:
     """Service for item operations."""
     
-    def __init__(self):
-        self.repository = ItemRepository()
+    def __init__(self, db: AsyncSession):
+        self.repository = ItemRepository(db)
     
-    def get_items(self, limit: int, offset: int, name: Optional[str] = None) -> Tuple[List[Dict[str, Any]], int]:
+    async def get_items(
+        self,
+        limit: int,
+        offset: int,
+        name: Optional[str] = None,
+        after_id: Optional[int] = None,
+        count_mode: CountMode = CountMode.EXACT,
+        sort: ItemSort = ItemSort.ID,
+        fields: Optional[List[str]] = None
+    ) -> Page:
         """
         Get items with pagination and optional filtering.
         
@@ -18,31 +35,76 @@ class ItemService:
             limit: Maximum number of items to return
             offset: Number of items to skip
             name: Filter by name (optional)
+            after_id: Return only items after this ID (keyset mode, optional)
+            count_mode: Strategy for computing the total count
+            sort: Order by ID, or by search relevance when filtering by name
+            fields: Fields to load (optional, defaults to all)
             
         Returns:
-            Tuple containing list of items and total count
+            Page of items with total count and whether more items exist
         """
+        async def load() -> Page:
+            try:
+                return await self.repository.get_items(limit, offset, name, after_id, count_mode, sort, fields)
+            except Exception as e:
+                raise DatabaseException(f"Error retrieving items: {str(e)}")
+        
+        # Concurrent identical reads share one query; pinned requests only share with each other
+        key = ("items", limit, offset, name, after_id, count_mode, sort, tuple(fields or ()), primary_pinned())
+        return await single_flight.do(key, load)
+    
+    async def stream_items(
+        self,
+        sessions: async_sessionmaker,
+        name: Optional[str] = None,
+        fields: Optional[List[str]] = None
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        Stream all matching items in batches of EXPORT_BATCH_SIZE.
+        
+        The stream reads with a session of its own, since the response body
+        is sent after the request's session has been released.
+        
+        Args:
+            sessions: Factory of the session the stream reads with
+            name: Filter by name (optional)
+            fields: Fields to load (optional, defaults to all)
+            
+        Returns:
+            Batches of items, read from the database as they are consumed
+        """
+        async def batches() -> AsyncIterator[List[Dict[str, Any]]]:
+            async with sessions() as db:
+                async for batch in ItemRepository(db).stream_items(name, fields, settings.EXPORT_BATCH_SIZE):
+                    yield batch
+        
         try:
-            return self.repository.get_items(limit, offset, name)
+            return await start_stream(batches())
         except Exception as e:
-            raise DatabaseException(f"Error retrieving items: {str(e)}")
+            raise DatabaseException(f"Error exporting items: {str(e)}")
     
-    def get_item(self, item_id: int) -> Optional[Dict[str, Any]]:
+    async def get_item(self, item_id: int, fields: Optional[List[str]] = None) -> Optional[Dict[str, Any]]:
         """
         Get a specific item by ID.
         
         Args:
             item_id: ID of the item to retrieve
+            fields: Fields to load (optional, defaults to all)
             
         Returns:
             Item data or None if not found
         """
-        try:
-            return self.repository.get_item(item_id)
-        except Exception as e:
-            raise DatabaseException(f"Error retrieving item: {str(e)}")
+        async def load() -> Optional[Dict[str, Any]]:
+            try:
+                return await self.repository.get_item(item_id, fields)
+            except Exception as e:
+                raise DatabaseException(f"Error retrieving item: {str(e)}")
+        
+        # Concurrent identical reads share one query; pinned requests only share with each other
+        key = ("item", item_id, tuple(fields or ()), primary_pinned())
+        return await single_flight.do(key, load)
     
-    def create_item(self, item_data: ItemCreate) -> Dict[str, Any]:
+    async def create_item(self, item_data: ItemCreate) -> Dict[str, Any]:
         """
         Create a new item.
         
@@ -53,11 +115,13 @@ class ItemService:
             Created item data
         """
         try:
-            return self.repository.create_item(item_data)
+            return await self.repository.create_item(item_data)
         except Exception as e:
             raise DatabaseException(f"Error creating item: {str(e)}")
+        finally:
+            single_flight.forget("item", "items")
     
-    def update_item(self, item_id: int, item_data: ItemUpdate) -> Optional[Dict[str, Any]]:
+    async def update_item(self, item_id: int, item_data: ItemUpdate) -> Optional[Dict[str, Any]]:
         """
         Update an existing item.
         
@@ -69,15 +133,13 @@ class ItemService:
             Updated item data or None if not found
         """
         try:
-            item = self.repository.get_item(item_id)
-            if not item:
-                return None
-            
-            return self.repository.update_item(item_id, item_data)
+            return await self.repository.update_item(item_id, item_data)
         except Exception as e:
             raise DatabaseException(f"Error updating item: {str(e)}")
+        finally:
+            single_flight.forget("item", "items")
     
-    def delete_item(self, item_id: int) -> bool:
+    async def delete_item(self, item_id: int) -> bool:
         """
         Delete an item.
         
@@ -88,10 +150,106 @@ class ItemService:
             True if deleted, False if not found
         """
         try:
-            item = self.repository.get_item(item_id)
-            if not item:
-                return False
-            
-            return self.repository.delete_item(item_id)
+            return await self.repository.delete_item(item_id)
         except Exception as e:
             raise DatabaseException(f"Error deleting item: {str(e)}")
+        finally:
+            single_flight.forget("item", "items")
+    
+    async def create_items(self, items_data: List[ItemCreate]) -> List[Dict[str, Any]]:
+        """
+        Create several items in one transaction.
+        
+        Args:
+            items_data: Item data for creation
+            
+        Returns:
+            Per-row results with the index of each row and the created item
+        """
+        try:
+            items = await self.repository.create_items(items_data)
+        except Exception as e:
+            raise DatabaseException(f"Error creating items: {str(e)}")
+        finally:
+            single_flight.forget("item", "items")
+        
+        return [
+            {"index": index, "status": "created", "item": item}
+            for index, item in enumerate(items)
+        ]
+    
+    async def import_items(self, records: AsyncIterator[Record]) -> ImportResult:
+        """
+        Import items from a parsed NDJSON or CSV body.
+        
+        Rows are validated and inserted in transactions of IMPORT_BATCH_SIZE
+        rows; invalid or rejected rows are reported and the load continues.
+        
+        Args:
+            records: Line numbers and rows from read_records
+            
+        Returns:
+            Counts of imported and failed rows with the first row errors
+        """
+        result = ImportResult(max_errors=settings.IMPORT_MAX_ERRORS)
+        async for batch in batched(records, settings.IMPORT_BATCH_SIZE):
+            rows = []
+            for line, record in batch:
+                if isinstance(record, str):
+                    result.add_error(line, record)
+                    continue
+                try:
+                    rows.append((line, ItemCreate(**record).dict()))
+                except ValidationError as e:
+                    result.add_error(line, validation_message(e))
+            
+            await load_rows(rows, self.repository.insert_items, result)
+        
+        single_flight.forget("items")
+        return result
+    
+    async def update_items(self, items_data: List[ItemBulkUpdate]) -> List[Dict[str, Any]]:
+        """
+        Update several items in one transaction.
+        
+        Args:
+            items_data: Item data for update, each carrying the item ID
+            
+        Returns:
+            Per-row results; rows whose item does not exist are reported as not_found
+        """
+        try:
+            items = await self.repository.update_items(items_data)
+        except Exception as e:
+            raise DatabaseException(f"Error updating items: {str(e)}")
+        finally:
+            single_flight.forget("item", "items")
+        
+        return [
+            {"index": index, "id": item_data.id, "status": "updated", "item": items[item_data.id]}
+            if item_data.id in items
+            else {"index": index, "id": item_data.id, "status": "not_found"}
+            for index, item_data in enumerate(items_data)
+        ]
+    
+    async def delete_items(self, item_ids: List[int]) -> List[Dict[str, Any]]:
+        """
+        Delete several items in one transaction.
+        
+        Args:
+            item_ids: IDs of the items to delete
+            
+        Returns:
+            Per-row results; IDs that do not exist are reported as not_found
+        """
+        try:
+            deleted = set(await self.repository.delete_items(item_ids))
+        except Exception as e:
+            raise DatabaseException(f"Error deleting items: {str(e)}")
+        finally:
+            single_flight.forget("item", "items")
+        
+        return [
+            {"index": index, "id": item_id, "status": "deleted" if item_id in deleted else "not_found"}
+            for index, item_id in enumerate(item_ids)
+        ]
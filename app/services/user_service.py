@@ -1,18 +1,34 @@
-from typing import List, Optional, Tuple, Dict, Any
+from typing import AsyncIterator, List, Optional, Dict, Any
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 from app.repositories.user_repository import UserRepository
 from app.schemas.user import UserCreate, UserUpdate
+from app.core.config import settings
 from app.core.exceptions import NotFoundException, DatabaseException
-from passlib.context import CryptContext
+from app.core.single_flight import single_flight
+from app.models.routing import primary_pinned
+from app.core.security import password_hasher
+from app.utils.bulk_import import ImportResult, Record, batched, load_rows, validation_message
+from app.utils.export import start_stream
+from app.utils.pagination import CountMode, Page
 
 
 class UserService:
     """Service for user operations."""
     
-    def __init__(self):
-        self.repository = UserRepository()
-        self.pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+    def __init__(self, db: AsyncSession):
+        self.repository = UserRepository(db)
+        self.password_hasher = password_hasher
     
-    def get_users(self, limit: int, offset: int, email: Optional[str] = None) -> Tuple[List[Dict[str, Any]], int]:
+    async def get_users(
+        self,
+        limit: int,
+        offset: int,
+        email: Optional[str] = None,
+        after_id: Optional[int] = None,
+        count_mode: CountMode = CountMode.EXACT,
+        fields: Optional[List[str]] = None
+    ) -> Page:
         """
         Get users with pagination and optional filtering.
         
@@ -20,31 +36,75 @@ class UserService:
             limit: Maximum number of users to return
             offset: Number of users to skip
             email: Filter by email (optional)
+            after_id: Return only users after this ID (keyset mode, optional)
+            count_mode: Strategy for computing the total count
+            fields: Fields to load (optional, defaults to all)
             
         Returns:
-            Tuple containing list of users and total count
+            Page of users with total count and whether more users exist
         """
+        async def load() -> Page:
+            try:
+                return await self.repository.get_users(limit, offset, email, after_id, count_mode, fields)
+            except Exception as e:
+                raise DatabaseException(f"Error retrieving users: {str(e)}")
+        
+        # Concurrent identical reads share one query; pinned requests only share with each other
+        key = ("users", limit, offset, email, after_id, count_mode, tuple(fields or ()), primary_pinned())
+        return await single_flight.do(key, load)
+    
+    async def stream_users(
+        self,
+        sessions: async_sessionmaker,
+        email: Optional[str] = None,
+        fields: Optional[List[str]] = None
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        Stream all matching users in batches of EXPORT_BATCH_SIZE.
+        
+        The stream reads with a session of its own, since the response body
+        is sent after the request's session has been released.
+        
+        Args:
+            sessions: Factory of the session the stream reads with
+            email: Filter by email (optional)
+            fields: Fields to load (optional, defaults to all)
+            
+        Returns:
+            Batches of users, read from the database as they are consumed
+        """
+        async def batches() -> AsyncIterator[List[Dict[str, Any]]]:
+            async with sessions() as db:
+                async for batch in UserRepository(db).stream_users(email, fields, settings.EXPORT_BATCH_SIZE):
+                    yield batch
+        
         try:
-            return self.repository.get_users(limit, offset, email)
+            return await start_stream(batches())
         except Exception as e:
-            raise DatabaseException(f"Error retrieving users: {str(e)}")
+            raise DatabaseException(f"Error exporting users: {str(e)}")
     
-    def get_user(self, user_id: int) -> Optional[Dict[str, Any]]:
+    async def get_user(self, user_id: int, fields: Optional[List[str]] = None) -> Optional[Dict[str, Any]]:
         """
         Get a specific user by ID.
         
         Args:
             user_id: ID of the user to retrieve
+            fields: Fields to load (optional, defaults to all)
             
         Returns:
             User data or None if not found
         """
-        try:
-            return self.repository.get_user(user_id)
-        except Exception as e:
-            raise DatabaseException(f"Error retrieving user: {str(e)}")
+        async def load() -> Optional[Dict[str, Any]]:
+            try:
+                return await self.repository.get_user(user_id, fields)
+            except Exception as e:
+                raise DatabaseException(f"Error retrieving user: {str(e)}")
+        
+        # Concurrent identical reads share one query; pinned requests only share with each other
+        key = ("user", user_id, tuple(fields or ()), primary_pinned())
+        return await single_flight.do(key, load)
     
-    def create_user(self, user_data: UserCreate) -> Dict[str, Any]:
+    async def create_user(self, user_data: UserCreate) -> Dict[str, Any]:
         """
         Create a new user.
         
@@ -54,20 +114,63 @@ class UserService:
         Returns:
             Created user data
         """
+        # Hash the password off the event loop
+        hashed_password = await self.password_hasher.hash(user_data.password)
+        
         try:
-            # Hash the password
-            hashed_password = self.pwd_context.hash(user_data.password)
-            
             # Create user with hashed password
             user_dict = user_data.dict()
             user_dict.pop("password")
             user_dict["hashed_password"] = hashed_password
             
-            return self.repository.create_user(user_dict)
+            return await self.repository.create_user(user_dict)
         except Exception as e:
             raise DatabaseException(f"Error creating user: {str(e)}")
+        finally:
+            single_flight.forget("user", "users")
     
-    def update_user(self, user_id: int, user_data: UserUpdate) -> Optional[Dict[str, Any]]:
+    async def import_users(self, records: AsyncIterator[Record]) -> ImportResult:
+        """
+        Import users from a parsed NDJSON or CSV body.
+        
+        Rows are validated and inserted in transactions of IMPORT_BATCH_SIZE
+        rows; passwords are hashed on the bulk share of the hash workers,
+        waiting for capacity rather than failing. Invalid or rejected rows,
+        e.g. taken emails or passwords that failed to hash, are reported and
+        the load continues.
+        
+        Args:
+            records: Line numbers and rows from read_records
+            
+        Returns:
+            Counts of imported and failed rows with the first row errors
+        """
+        result = ImportResult(max_errors=settings.IMPORT_MAX_ERRORS)
+        async for batch in batched(records, settings.IMPORT_BATCH_SIZE):
+            users = []
+            for line, record in batch:
+                if isinstance(record, str):
+                    result.add_error(line, record)
+                    continue
+                try:
+                    users.append((line, UserCreate(**record)))
+                except ValidationError as e:
+                    result.add_error(line, validation_message(e))
+            
+            hashed_passwords = await self.password_hasher.hash_many([user.password for _, user in users])
+            rows = []
+            for (line, user), hashed_password in zip(users, hashed_passwords):
+                if hashed_password is None:
+                    result.add_error(line, "Password could not be hashed")
+                    continue
+                rows.append((line, {**user.dict(exclude={"password"}), "hashed_password": hashed_password}))
+            
+            await load_rows(rows, self.repository.insert_users, result)
+        
+        single_flight.forget("users")
+        return result
+    
+    async def update_user(self, user_id: int, user_data: UserUpdate) -> Optional[Dict[str, Any]]:
         """
         Update an existing user.
         
@@ -78,21 +181,25 @@ class UserService:
         Returns:
             Updated user data or None if not found
         """
-        try:
-            user = self.repository.get_user(user_id)
-            if not user:
+        # Handle password update if provided; hashing is slow, so unknown users are rejected first
+        user_dict = user_data.dict(exclude_unset=True)
+        if "password" in user_dict:
+            try:
+                exists = await self.repository.user_exists(user_id)
+            except Exception as e:
+                raise DatabaseException(f"Error updating user: {str(e)}")
+            if not exists:
                 return None
-            
-            # Handle password update if provided
-            user_dict = user_data.dict(exclude_unset=True)
-            if "password" in user_dict:
-                user_dict["hashed_password"] = self.pwd_context.hash(user_dict.pop("password"))
-            
-            return self.repository.update_user(user_id, user_dict)
+            user_dict["hashed_password"] = await self.password_hasher.hash(user_dict.pop("password"))
+        
+        try:
+            return await self.repository.update_user(user_id, user_dict)
         except Exception as e:
             raise DatabaseException(f"Error updating user: {str(e)}")
+        finally:
+            single_flight.forget("user", "users")
     
-    def delete_user(self, user_id: int) -> bool:
+    async def delete_user(self, user_id: int) -> bool:
         """
         Delete a user.
         
@@ -103,15 +210,13 @@ class UserService:
             True if deleted, False if not found
         """
         try:
-            user = self.repository.get_user(user_id)
-            if not user:
-                return False
-            
-            return self.repository.delete_user(user_id)
+            return await self.repository.delete_user(user_id)
         except Exception as e:
             raise DatabaseException(f"Error deleting user: {str(e)}")
+        finally:
+            single_flight.forget("user", "users")
             
-    def verify_password(self, plain_password: str, hashed_password: str) -> bool:
+    async def verify_password(self, plain_password: str, hashed_password: str) -> bool:
         """
         Verify a password against a hash.
         
@@ -122,4 +227,4 @@ class UserService:
         Returns:
             True if password matches, False otherwise
         """
-        return self.pwd_context.verify(plain_password, hashed_password)
+        return await self.password_hasher.verify(plain_password, hashed_password)
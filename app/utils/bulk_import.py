@@ -0,0 +1,191 @@
+import codecs
+import csv
+import json
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple, Union
+from pydantic import ValidationError
+from app.utils.export import ExportFormat
+
+# Bound on a single record, so a body without newlines cannot fill memory
+MAX_RECORD_SIZE = 1024 * 1024
+
+# (line number, parsed row or the reason it could not be parsed)
+Record = Tuple[int, Union[Dict[str, Any], str]]
+
+
+class _RecordTooLong(Exception):
+    """A record exceeded MAX_RECORD_SIZE; the rest of the body cannot be parsed."""
+
+    def __init__(self, line: int, message: str):
+        super().__init__(message)
+        self.line = line
+
+
+@dataclass
+class ImportResult:
+    """Outcome of a bulk import; only the first max_errors row errors are kept."""
+    max_errors: int = 100
+    imported: int = 0
+    failed: int = 0
+    errors: List[Dict[str, Any]] = field(default_factory=list)
+
+    def add_error(self, line: int, message: str) -> None:
+        """Record a row that was not imported."""
+        self.failed += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append({"line": line, "error": message})
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"imported": self.imported, "failed": self.failed, "errors": self.errors}
+
+
+def read_records(chunks: AsyncIterator[bytes], format: ExportFormat) -> AsyncIterator[Record]:
+    """
+    Parse an NDJSON or CSV body as it arrives.
+
+    Accepts what the export endpoints produce. Blank lines are skipped; in
+    CSV the first line is the header and empty values are left out so
+    schema defaults apply. A record longer than MAX_RECORD_SIZE is reported
+    as an error and ends the body, so rows already imported are still
+    counted in the result.
+
+    Args:
+        chunks: Raw request body chunks
+        format: NDJSON or CSV
+
+    Returns:
+        Line number and the row as a dict, or an error message for rows
+        that are not valid JSON objects or do not match the header
+    """
+    if format == ExportFormat.CSV:
+        return _csv_records(chunks)
+    return _ndjson_records(chunks)
+
+
+async def batched(records: AsyncIterator[Record], size: int) -> AsyncIterator[List[Record]]:
+    """Group records into lists of up to size."""
+    batch: List[Record] = []
+    async for record in records:
+        batch.append(record)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+async def load_rows(
+    rows: List[Tuple[int, Dict[str, Any]]],
+    insert: Callable[[List[Dict[str, Any]]], Awaitable[None]],
+    result: ImportResult
+) -> None:
+    """
+    Insert a batch of valid rows in one transaction, isolating failures.
+
+    When the batch is rejected, e.g. by a unique constraint, its rows are
+    retried one at a time so only the offending rows are reported.
+
+    Args:
+        rows: Line numbers and rows to insert
+        insert: Repository method inserting and committing rows
+        result: Import outcome to update
+    """
+    if not rows:
+        return
+
+    if len(rows) > 1:
+        try:
+            await insert([row for _, row in rows])
+            result.imported += len(rows)
+            return
+        except Exception:
+            pass
+
+    for line, row in rows:
+        try:
+            await insert([row])
+            result.imported += 1
+        except Exception as e:
+            result.add_error(line, database_message(e))
+
+
+def database_message(error: Exception) -> str:
+    """Driver message of a failed insert, without the statement or its parameters."""
+    return str(getattr(error, "orig", None) or error).splitlines()[0]
+
+
+def validation_message(error: ValidationError) -> str:
+    """Condense a pydantic error into one line, e.g. "price: Input should be a valid integer"."""
+    return "; ".join(
+        f"{'.'.join(str(part) for part in detail['loc']) or 'row'}: {detail['msg']}"
+        for detail in error.errors()
+    )
+
+
+async def _lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[Tuple[int, str]]:
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    pending = ""
+    number = 0
+
+    async for chunk in chunks:
+        pending += decoder.decode(chunk)
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            number += 1
+            yield number, line + "\n"
+        if len(pending) > MAX_RECORD_SIZE:
+            raise _RecordTooLong(number + 1, f"Line is longer than {MAX_RECORD_SIZE} bytes")
+
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield number + 1, pending
+
+
+async def _ndjson_records(chunks: AsyncIterator[bytes]) -> AsyncIterator[Record]:
+    try:
+        async for number, line in _lines(chunks):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError as e:
+                yield number, f"Invalid JSON: {e}"
+                continue
+            yield number, row if isinstance(row, dict) else "Expected a JSON object"
+    except _RecordTooLong as e:
+        yield e.line, str(e)
+
+
+async def _csv_records(chunks: AsyncIterator[bytes]) -> AsyncIterator[Record]:
+    header: Optional[List[str]] = None
+    record = ""
+    start = 0
+
+    try:
+        async for number, line in _lines(chunks):
+            if not record:
+                start = number
+            record += line
+            # A quoted value may contain newlines; the record ends once quotes balance
+            if record.count('"') % 2:
+                if len(record) > MAX_RECORD_SIZE:
+                    raise _RecordTooLong(start, f"Record is longer than {MAX_RECORD_SIZE} bytes")
+                continue
+
+            values = next(csv.reader([record]), [])
+            record = ""
+            if not values:
+                continue
+            if header is None:
+                header = [name.strip() for name in values]
+                continue
+            if len(values) != len(header):
+                yield start, f"Expected {len(header)} values, got {len(values)}"
+                continue
+            yield start, {name: value for name, value in zip(header, values) if value != ""}
+    except _RecordTooLong as e:
+        yield e.line, str(e)
+        return
+
+    if record.strip():
+        yield start, "Unterminated quoted value"
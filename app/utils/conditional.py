@@ -0,0 +1,83 @@
+import hashlib
+from typing import Any, Dict, List, Optional
+from fastapi import Request, Response
+from app.utils.pagination import Page
+
+
+def entity_etag(kind: str, entity: Dict[str, Any], fields: Optional[List[str]] = None) -> str:
+    """
+    Build the ETag of a single entity from its content.
+
+    Update times may have one-second precision (SQLite's CURRENT_TIMESTAMP),
+    so a write within the same second would keep an ETag built from the ID
+    and update time. The ETag therefore covers the entity as served, and no
+    Last-Modified is sent.
+
+    Args:
+        kind: Entity type, e.g. "item"
+        entity: Entity data as returned to the client
+        fields: Sparse fieldset of the representation (optional)
+
+    Returns:
+        Weak ETag of the entity
+    """
+    return _etag(_representation(kind, fields), entity)
+
+
+def collection_etag(kind: str, page: Page, fields: Optional[List[str]] = None) -> str:
+    """
+    Build the ETag of a list page from its content.
+
+    Deletes and rows shifting between pages change a page without raising
+    any update time, so the ETag covers the rows as served, whether another
+    page follows and the total, or the count mode when no total was
+    computed.
+
+    Args:
+        kind: Entity type, e.g. "items"
+        page: Page returned by the service
+        fields: Sparse fieldset of the representation (optional)
+
+    Returns:
+        Weak ETag of the page
+    """
+    total = page.total if page.total is not None else page.count_mode.value
+    return _etag(_representation(kind, fields), page.items, page.has_more, total)
+
+
+def is_not_modified(request: Request, etag: str) -> bool:
+    """Evaluate If-None-Match against the current ETag, using weak comparison."""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is None:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = {_weak_opaque(tag) for tag in if_none_match.split(",")}
+    return _weak_opaque(etag) in candidates
+
+
+def set_etag(response: Response, etag: str) -> None:
+    """Attach the ETag header to a response."""
+    response.headers["ETag"] = etag
+
+
+def not_modified_response(etag: str) -> Response:
+    """Create an empty 304 Not Modified response carrying the ETag."""
+    response = Response(status_code=304)
+    set_etag(response, etag)
+    return response
+
+
+def _representation(kind: str, fields: Optional[List[str]]) -> str:
+    # Sparse fieldsets are distinct representations and need distinct ETags
+    return f"{kind}?fields={','.join(fields)}" if fields else kind
+
+
+def _etag(*parts: Any) -> str:
+    digest = hashlib.sha1(repr(parts).encode()).hexdigest()
+    return f'W/"{digest}"'
+
+
+def _weak_opaque(tag: str) -> str:
+    tag = tag.strip()
+    return tag[2:] if tag.startswith("W/") else tag
@@ -0,0 +1,110 @@
+import csv
+import io
+from datetime import date, datetime
+from enum import Enum
+from typing import Any, AsyncIterator, Dict, List, Sequence
+from fastapi.responses import StreamingResponse
+from app.utils.response import json_dumps
+
+# Rows arrive from the repository in batches; each batch is one body chunk
+Batches = AsyncIterator[List[Dict[str, Any]]]
+
+
+class ExportFormat(str, Enum):
+    """Body formats of the export endpoints."""
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+MEDIA_TYPES = {
+    ExportFormat.NDJSON: "application/x-ndjson",
+    ExportFormat.CSV: "text/csv; charset=utf-8",
+}
+
+
+async def start_stream(batches: Batches) -> Batches:
+    """
+    Run the export query and fetch its first batch before responding.
+
+    Errors raised here still become a regular error response; once the
+    body has started, a failure can only abort the connection.
+
+    Args:
+        batches: Rows from a repository stream method
+
+    Returns:
+        The same batches, starting with the one already fetched
+    """
+    try:
+        first = await batches.__anext__()
+    except StopAsyncIteration:
+        first = None
+    return _resume(first, batches)
+
+
+async def ndjson_chunks(batches: Batches) -> AsyncIterator[bytes]:
+    """Serialize batches of rows as newline-delimited JSON, one chunk per batch."""
+    async for rows in batches:
+        yield b"".join(json_dumps(row) + b"\n" for row in rows)
+
+
+async def csv_chunks(batches: Batches, columns: Sequence[str]) -> AsyncIterator[bytes]:
+    """Serialize batches of rows as CSV with a header row, one chunk per batch."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    yield _drain(buffer)
+
+    async for rows in batches:
+        writer.writerows([_csv_value(row.get(column)) for column in columns] for row in rows)
+        yield _drain(buffer)
+
+
+def export_response(batches: Batches, format: ExportFormat, name: str, columns: Sequence[str]) -> StreamingResponse:
+    """
+    Stream rows to the client as a file download.
+
+    The next batch is only fetched once the previous chunk has been handed
+    to the server, so a slow client slows down the database cursor instead
+    of rows piling up in memory.
+
+    Args:
+        batches: Rows from a repository stream method
+        format: NDJSON or CSV
+        name: Download file name without extension, e.g. "items"
+        columns: Fields of each row, in output order (the CSV header)
+
+    Returns:
+        Streaming response with a Content-Disposition attachment header
+    """
+    if format == ExportFormat.CSV:
+        body = csv_chunks(batches, columns)
+    else:
+        body = ndjson_chunks(batches)
+
+    return StreamingResponse(
+        body,
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{name}.{format.value}"'}
+    )
+
+
+async def _resume(first: Any, batches: Batches) -> Batches:
+    if first is not None:
+        yield first
+    async for rows in batches:
+        yield rows
+
+
+def _csv_value(value: Any) -> Any:
+    # Match the timestamp format of the JSON representation
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def _drain(buffer: io.StringIO) -> bytes:
+    chunk = buffer.getvalue().encode("utf-8")
+    buffer.seek(0)
+    buffer.truncate()
+    return chunk
@@ -0,0 +1,39 @@
+from typing import Iterable, List, Optional
+from app.core.exceptions import ValidationException
+
+# Fields every sparse row carries: cursors need the ID and clients the
+# update time
+REQUIRED_FIELDS = ("id", "updated_at")
+
+
+def parse_fields(value: Optional[str], allowed: Iterable[str]) -> Optional[List[str]]:
+    """
+    Parse a comma-separated sparse fieldset, e.g. "id,name,price".
+
+    Args:
+        value: Raw fields parameter, or None for the full representation
+        allowed: Field names of the resource, in response order
+
+    Returns:
+        Requested fields plus REQUIRED_FIELDS in response order, or None
+        when all fields are requested
+
+    Raises:
+        ValidationException: If a field is unknown or none is given
+    """
+    if value is None:
+        return None
+
+    allowed = list(allowed)
+    requested = {field.strip() for field in value.split(",") if field.strip()}
+    if not requested:
+        raise ValidationException("At least one field is required")
+
+    unknown = requested.difference(allowed)
+    if unknown:
+        raise ValidationException(
+            f"Unknown fields: {', '.join(sorted(unknown))}. Allowed fields: {', '.join(allowed)}"
+        )
+
+    requested.update(REQUIRED_FIELDS)
+    return [field for field in allowed if field in requested]
@@ -0,0 +1,79 @@
+import base64
+import json
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any, Dict, List, Optional
+from app.core.exceptions import ValidationException
+
+
+class CountMode(str, Enum):
+    """Strategies for computing the total of a paginated list."""
+    EXACT = "exact"
+    ESTIMATED = "estimated"
+    CACHED = "cached"
+    NONE = "none"
+
+
+@dataclass
+class Page:
+    """A page of rows returned by a repository list method."""
+    items: List[Dict[str, Any]]
+    total: Optional[int]
+    has_more: bool
+    count_mode: CountMode
+
+
+def encode_cursor(last_id: int) -> str:
+    """
+    Encode the keyset position of a page into an opaque cursor.
+    
+    Args:
+        last_id: ID of the last row on the current page
+        
+    Returns:
+        URL-safe cursor string
+    """
+    payload = json.dumps({"id": last_id}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> int:
+    """
+    Decode a cursor produced by encode_cursor.
+    
+    Args:
+        cursor: Opaque cursor string
+        
+    Returns:
+        ID of the last row on the previous page
+        
+    Raises:
+        ValidationException: If the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        last_id = json.loads(base64.urlsafe_b64decode(padded.encode()))["id"]
+    except (ValueError, TypeError, KeyError):
+        raise ValidationException("Invalid pagination cursor")
+    
+    if not isinstance(last_id, int) or isinstance(last_id, bool):
+        raise ValidationException("Invalid pagination cursor")
+    
+    return last_id
+
+
+def next_cursor(items: List[Dict[str, Any]], limit: int) -> Optional[str]:
+    """
+    Build the cursor for the page after the given one.
+    
+    Args:
+        items: Items of the current page, ordered by ID
+        limit: Maximum number of items per page
+        
+    Returns:
+        Cursor for the next page, or None if the page is not full
+    """
+    if len(items) < limit or not items:
+        return None
+    
+    return encode_cursor(items[-1]["id"])
@@ -1,24 +1,101 @@
-from typing import Any, Dict, List, Optional
+import json
+from typing import Any, Callable, Dict, List, Mapping, Optional
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+import pydantic_core
+from app.core.config import settings
+from app.core.timing import timed
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional
+    orjson = None
 
-def success_response(data: Any) -> Dict[str, Any]:
+
+def _dumps_orjson(content: Any) -> bytes:
+    return orjson.dumps(content, default=jsonable_encoder, option=orjson.OPT_NON_STR_KEYS)
+
+
+def _dumps_pydantic(content: Any) -> bytes:
+    return pydantic_core.to_json(content, fallback=jsonable_encoder)
+
+
+def _dumps_json(content: Any) -> bytes:
+    return json.dumps(
+        content,
+        ensure_ascii=False,
+        allow_nan=False,
+        separators=(",", ":"),
+        default=jsonable_encoder
+    ).encode("utf-8")
+
+
+def get_json_dumps(backend: str) -> Callable[[Any], bytes]:
+    """
+    Get the JSON serializer for the JSON_RESPONSE_BACKEND setting.
+    
+    Args:
+        backend: "orjson", "pydantic" or "json"; orjson falls back to
+            pydantic-core when it is not installed
+        
+    Returns:
+        Function serializing a value to JSON bytes
+    """
+    if backend == "orjson":
+        return _dumps_orjson if orjson is not None else _dumps_pydantic
+    if backend == "pydantic":
+        return _dumps_pydantic
+    if backend == "json":
+        return _dumps_json
+    
+    raise ValueError(f"Unknown JSON response backend: {backend}")
+
+
+json_dumps = get_json_dumps(settings.JSON_RESPONSE_BACKEND)
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSON response rendered with the configured high-performance serializer.
+    
+    Datetimes and other common types are serialized natively; only values the
+    serializer does not know fall back to jsonable_encoder.
+    """
+    
+    def render(self, content: Any) -> bytes:
+        with timed("serialize"):
+            return json_dumps(content)
+
+
+def success_response(
+    data: Any,
+    status_code: int = 200,
+    headers: Optional[Mapping[str, str]] = None
+) -> FastJSONResponse:
     """
     Create a standardized success response.
     
     Args:
         data: The data to include in the response
+        status_code: HTTP status code of the response
+        headers: Extra response headers (optional)
         
     Returns:
-        Standardized response dictionary
+        Standardized response
     """
-    return {
+    return FastJSONResponse({
         "responseCode": "200",
         "responseStatus": "SUCCESS",
         "data": data
-    }
+    }, status_code=status_code, headers=headers)
 
 
-def error_response(status_code: str, error_type: str, message: str) -> Dict[str, Any]:
+def error_response(
+    status_code: str,
+    error_type: str,
+    message: Any,
+    headers: Optional[Mapping[str, str]] = None
+) -> FastJSONResponse:
     """
     Create a standardized error response.
     
@@ -26,18 +103,19 @@ def error_response(status_code: str, error_type: str, message: str) -> Dict[str,
         status_code: HTTP status code as string
         error_type: Type of error (e.g., "VALIDATION_ERROR", "NOT_FOUND")
         message: Error message
+        headers: Extra response headers (optional)
         
     Returns:
-        Standardized error response dictionary
+        Standardized error response
     """
-    return {
+    return FastJSONResponse({
         "responseCode": status_code,
         "responseStatus": error_type,
         "data": {"message": message}
-    }
+    }, status_code=int(status_code), headers=headers)
 
 
-def validation_error_response(errors: List[Dict[str, Any]]) -> Dict[str, Any]:
+def validation_error_response(errors: List[Dict[str, Any]]) -> FastJSONResponse:
     """
     Create a standardized validation error response.
     
@@ -45,31 +123,48 @@ def validation_error_response(errors: List[Dict[str, Any]]) -> Dict[str, Any]:
         errors: List of validation errors
         
     Returns:
-        Standardized validation error response dictionary
+        Standardized validation error response
     """
-    return {
+    return FastJSONResponse({
         "responseCode": "422",
         "responseStatus": "VALIDATION_ERROR",
         "data": {"errors": errors}
-    }
+    }, status_code=422)
 
 
-def pagination_response(items: List[Any], total: int, limit: int, offset: int) -> Dict[str, Any]:
+def pagination_response(
+    items: List[Any],
+    total: Optional[int],
+    limit: int,
+    offset: int,
+    next_cursor: Optional[str] = None,
+    has_more: Optional[bool] = None,
+    count_mode: str = "exact",
+    headers: Optional[Mapping[str, str]] = None
+) -> FastJSONResponse:
     """
     Create a standardized pagination response.
     
     Args:
         items: List of items for the current page
-        total: Total number of items
+        total: Total number of items, or None if it was not counted
         limit: Maximum number of items per page
         offset: Number of items skipped
+        next_cursor: Cursor for the page after this one (optional)
+        has_more: Whether another page exists; derived from total when omitted
+        count_mode: Strategy used to compute total
+        headers: Extra response headers (optional)
         
     Returns:
-        Standardized pagination response dictionary
+        Standardized pagination response
     """
-    has_more = offset + limit < total
+    if has_more is None:
+        has_more = total is not None and offset + limit < total
+    
+    if not has_more:
+        next_cursor = None
     
-    return {
+    return FastJSONResponse({
         "responseCode": "200",
         "responseStatus": "SUCCESS",
         "data": {
@@ -78,7 +173,9 @@ def pagination_response(items: List[Any], total: int, limit: int, offset: int) -
                 "total": total,
                 "limit": limit,
                 "offset": offset,
-                "has_more": has_more
+                "has_more": has_more,
+                "next_cursor": next_cursor,
+                "count_mode": count_mode
             }
         }
-    }
+    }, headers=headers)
@@ -0,0 +1,108 @@
+"""
+Compare ORM hydration with the Core mappings read path for list pages.
+
+Usage:
+    python -m benchmarks.read_path [--rows 1000] [--rounds 200]
+
+Seeds a throwaway SQLite database and reports rows per second for pages of
+100 and 1000 items, read either as ORM instances copied into dicts (the old
+read path) or as row mappings (the current repository read path).
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from typing import Any, Awaitable, Callable, Dict, List
+
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.models.base import Base
+from app.models.item import Item
+from app.repositories.item_repository import ITEM_COLUMNS
+
+PAGE_SIZES = (100, 1000)
+
+
+async def read_orm(db: AsyncSession, limit: int) -> List[Dict[str, Any]]:
+    """Read a page as ORM instances and copy them into dicts."""
+    result = await db.scalars(select(Item).order_by(Item.id).limit(limit))
+    items = [
+        {
+            "id": item.id,
+            "name": item.name,
+            "description": item.description,
+            "price": item.price,
+            "is_active": item.is_active,
+            "created_at": item.created_at,
+            "updated_at": item.updated_at
+        }
+        for item in result.all()
+    ]
+    # Each request gets a fresh session, so the identity map starts empty
+    db.expunge_all()
+    return items
+
+
+async def read_mappings(db: AsyncSession, limit: int) -> List[Dict[str, Any]]:
+    """Read a page as row mappings."""
+    result = await db.execute(select(*ITEM_COLUMNS).order_by(Item.id).limit(limit))
+    return [dict(row) for row in result.mappings().all()]
+
+
+async def measure(
+    session_factory: async_sessionmaker,
+    reader: Callable[[AsyncSession, int], Awaitable[List[Dict[str, Any]]]],
+    limit: int,
+    rounds: int
+) -> float:
+    """Return rows per second of reader over the given number of pages."""
+    async with session_factory() as db:
+        # Warm up connection and statement caches
+        await reader(db, limit)
+
+        start = time.perf_counter()
+        rows = 0
+        for _ in range(rounds):
+            rows += len(await reader(db, limit))
+        elapsed = time.perf_counter() - start
+
+    return rows / elapsed
+
+
+async def run(rows: int, rounds: int) -> None:
+    path = os.path.join(tempfile.mkdtemp(), "read_path.db")
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    session_factory = async_sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+
+    try:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+            await conn.execute(insert(Item), [
+                {"name": f"Item {i}", "description": "Benchmark item " * 8, "price": i}
+                for i in range(rows)
+            ])
+
+        print(f"{'page':>6} {'orm rows/s':>12} {'mappings rows/s':>16} {'speedup':>8}")
+        for limit in PAGE_SIZES:
+            page_rounds = max(1, rounds * PAGE_SIZES[0] // limit)
+            orm = await measure(session_factory, read_orm, limit, page_rounds)
+            mappings = await measure(session_factory, read_mappings, limit, page_rounds)
+            print(f"{limit:>6} {orm:>12,.0f} {mappings:>16,.0f} {mappings / orm:>7.2f}x")
+    finally:
+        await engine.dispose()
+        os.remove(path)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1000, help="Number of items to seed")
+    parser.add_argument("--rounds", type=int, default=200, help="Pages to read at the smallest page size")
+    args = parser.parse_args()
+
+    asyncio.run(run(args.rows, args.rounds))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,86 @@
+"""
+Production entry point.
+
+Starts uvicorn with one worker process per available CPU (SERVER_WORKERS),
+using uvloop and httptools when they are installed. Workers are restarted
+after SERVER_MAX_REQUESTS requests, and sending SIGHUP to this process
+restarts them gracefully one by one, e.g. after a deploy. With several
+workers the per-process memory entity cache is switched off.
+"""
+import importlib.util
+import logging
+import os
+import tempfile
 import uvicorn
-from app.main import app
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def get_worker_count() -> int:
+    """Number of worker processes; SERVER_WORKERS=0 means one per available CPU."""
+    if settings.SERVER_WORKERS > 0:
+        return settings.SERVER_WORKERS
+
+    # Respect CPU affinity, e.g. taskset or a container's cpuset
+    if hasattr(os, "sched_getaffinity"):
+        return max(len(os.sched_getaffinity(0)), 1)
+    return os.cpu_count() or 1
+
+
+def get_event_loop() -> str:
+    """Use uvloop when installed."""
+    return "uvloop" if importlib.util.find_spec("uvloop") else "asyncio"
+
+
+def get_http_protocol() -> str:
+    """Use the httptools parser when installed."""
+    return "httptools" if importlib.util.find_spec("httptools") else "h11"
+
+
+def main() -> None:
+    workers = 1 if settings.SERVER_RELOAD else get_worker_count()
+
+    # Workers are separate processes; metrics must be shared through files
+    if workers > 1 and settings.METRICS_ENABLED and not os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        os.environ["PROMETHEUS_MULTIPROC_DIR"] = tempfile.mkdtemp(prefix="prometheus-")
+
+    # The memory cache is per process: a write clears it in one worker only,
+    # and the others would serve the old entity for up to CACHE_TTL
+    if workers > 1 and settings.CACHE_BACKEND == "memory":
+        logger.warning(
+            "CACHE_BACKEND=memory cannot be kept consistent across %d workers; "
+            "disabling the entity cache (use CACHE_BACKEND=redis to cache)",
+            workers
+        )
+        os.environ["CACHE_BACKEND"] = "none"
+
+    loop = get_event_loop()
+    http = get_http_protocol()
+    logger.info("Starting %d worker(s) with loop=%s http=%s", workers, loop, http)
+
+    # Jitter spreads worker restarts so they do not all recycle at once;
+    # only passed when set, as older uvicorn releases do not support it
+    options = {}
+    if settings.SERVER_MAX_REQUESTS_JITTER:
+        options["limit_max_requests_jitter"] = settings.SERVER_MAX_REQUESTS_JITTER
+
+    uvicorn.run(
+        "app.main:app",
+        host=settings.SERVER_HOST,
+        port=settings.SERVER_PORT,
+        workers=workers,
+        loop=loop,
+        http=http,
+        backlog=settings.SERVER_BACKLOG,
+        timeout_keep_alive=settings.SERVER_KEEP_ALIVE,
+        timeout_graceful_shutdown=settings.SERVER_GRACEFUL_TIMEOUT,
+        limit_max_requests=settings.SERVER_MAX_REQUESTS or None,
+        reload=settings.SERVER_RELOAD,
+        **options
+    )
+
 
 if __name__ == "__main__":
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    logging.basicConfig(level=logging.INFO)
+    main()
@@ -1,32 +1,61 @@
+import asyncio
+import os
+import tempfile
+
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import StaticPool
+
+# The API talks to the database through aiosqlite while the tests seed and
+# inspect it through the sync driver, so both need the same file-backed database.
+TEST_DATABASE_PATH = os.path.join(tempfile.gettempdir(), "fastapi_template_test.db")
+os.environ["DATABASE_URL"] = f"sqlite:///{TEST_DATABASE_PATH}"
 
 from app.main import app
-from app.models.base import Base, get_db
+from app.core.cache import entity_cache
+from app.core.metrics import observe_engine
+from app.core.query_monitor import monitor_engine
+from app.core.rate_limit import rate_limiter
+from app.core.timing import instrument_engine
+from app.models.base import Base, get_db, get_session_factory
 
 
-# Create in-memory SQLite database for testing
-SQLALCHEMY_DATABASE_URL = "sqlite:///:memory:"
+# Create file-backed SQLite database for testing
+SQLALCHEMY_DATABASE_URL = f"sqlite:///{TEST_DATABASE_PATH}"
+ASYNC_SQLALCHEMY_DATABASE_URL = f"sqlite+aiosqlite:///{TEST_DATABASE_PATH}"
 
 engine = create_engine(
     SQLALCHEMY_DATABASE_URL,
     connect_args={"check_same_thread": False},
-    poolclass=StaticPool,
 )
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+async_engine = create_async_engine(ASYNC_SQLALCHEMY_DATABASE_URL)
+instrument_engine(async_engine.sync_engine)
+observe_engine(async_engine.sync_engine)
+monitor_engine(async_engine.sync_engine)
+AsyncTestingSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False
+)
+
 
 @pytest.fixture(scope="function")
 def db_session():
     """
     Create a clean database session for a test.
-    
+
     We need to create all tables for each test, and then drop them after the test.
     """
     Base.metadata.create_all(bind=engine)
+    # IDs are reused once tables are recreated, so cached entities must go too
+    asyncio.run(entity_cache.clear())
+    # Every test starts with full rate limit buckets
+    asyncio.run(rate_limiter.clear())
     db = TestingSessionLocal()
     try:
         yield db
@@ -40,13 +69,18 @@ def client(db_session):
     """
     Create a test client with the test database.
     """
-    def override_get_db():
-        try:
-            yield db_session
-        finally:
-            pass
+    async def override_get_db():
+        async with AsyncTestingSessionLocal() as db:
+            yield db
+
+    def detach_db_session(response):
+        # The API writes through its own connection, so later queries must
+        # load fresh rows instead of the objects the test seeded
+        db_session.expunge_all()
 
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_session_factory] = lambda: AsyncTestingSessionLocal
     with TestClient(app) as test_client:
+        test_client.event_hooks["response"].append(detach_db_session)
         yield test_client
     app.dependency_overrides.clear()
@@ -1,5 +1,10 @@
+import csv
+import io
+import json
 import pytest
 from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
 from app.models.item import Item
 
 
@@ -137,6 +142,38 @@ def test_delete_item(client, db_session):
     assert db_item is None
 
 
+def test_update_and_delete_item_single_statement(client, db_session):
+    """Test that updates and deletes take one statement and report missing items."""
+    item = Item(name="Test Item", description="Test Description", price=1000)
+    db_session.add(item)
+    db_session.commit()
+    db_session.refresh(item)
+    
+    statements = []
+    
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+    
+    event.listen(Engine, "before_cursor_execute", record)
+    try:
+        response = client.put(f"/api/v1/items/{item.id}", json={"price": 1500})
+        assert response.status_code == 200
+        assert response.json()["data"]["price"] == 1500
+        assert len(statements) == 1
+        assert statements[0].startswith("UPDATE items")
+        
+        statements.clear()
+        response = client.delete(f"/api/v1/items/{item.id}")
+        assert response.status_code == 200
+        assert len(statements) == 1
+        assert statements[0].startswith("DELETE FROM items")
+    finally:
+        event.remove(Engine, "before_cursor_execute", record)
+    
+    assert client.put(f"/api/v1/items/{item.id}", json={"price": 1}).status_code == 404
+    assert client.delete(f"/api/v1/items/{item.id}").status_code == 404
+
+
 def test_get_nonexistent_item(client):
     """Test getting an item that doesn't exist."""
     # Make request with non-existent ID
@@ -148,3 +185,489 @@ def test_get_nonexistent_item(client):
     assert data["responseCode"] == "404"
     assert data["responseStatus"] == "NOT_FOUND"
     assert "message" in data["data"]
+
+
+def test_get_items_with_cursor(client, db_session):
+    """Test crawling items with keyset (cursor) pagination."""
+    # Create test items
+    db_session.add_all([Item(name=f"Item {i}", price=i * 100) for i in range(1, 6)])
+    db_session.commit()
+    
+    # First page in offset mode advertises a cursor
+    response = client.get("/api/v1/items/", params={"limit": 2})
+    assert response.status_code == 200
+    pagination = response.json()["data"]["pagination"]
+    assert pagination["has_more"] is True
+    assert pagination["next_cursor"] is not None
+    
+    # Follow cursors until the end
+    names = [item["name"] for item in response.json()["data"]["items"]]
+    cursor = pagination["next_cursor"]
+    while cursor:
+        response = client.get("/api/v1/items/", params={"limit": 2, "after": cursor})
+        assert response.status_code == 200
+        data = response.json()["data"]
+        names.extend(item["name"] for item in data["items"])
+        cursor = data["pagination"]["next_cursor"]
+    
+    assert names == [f"Item {i}" for i in range(1, 6)]
+
+
+def test_get_items_with_invalid_cursor(client, db_session):
+    """Test that a malformed cursor is rejected."""
+    response = client.get("/api/v1/items/", params={"after": "not-a-cursor"})
+    
+    assert response.status_code == 422
+    data = response.json()
+    assert data["responseStatus"] == "VALIDATION_ERROR"
+
+
+@pytest.mark.parametrize("count_mode, expected_total", [
+    ("exact", 3),
+    ("cached", 3),
+    ("none", None),
+])
+def test_get_items_count_modes(client, db_session, count_mode, expected_total):
+    """Test the total count strategies of the item list."""
+    from app.repositories.counting import clear_count_cache
+    clear_count_cache()
+    
+    # Create test items
+    db_session.add_all([Item(name=f"Item {i}", price=i * 100) for i in range(1, 4)])
+    db_session.commit()
+    
+    # Make request
+    response = client.get("/api/v1/items/", params={"limit": 2, "count": count_mode})
+    
+    # Check response
+    assert response.status_code == 200
+    pagination = response.json()["data"]["pagination"]
+    assert pagination["total"] == expected_total
+    assert pagination["count_mode"] == count_mode
+    assert pagination["has_more"] is True
+
+
+def test_get_items_estimated_count_falls_back_to_exact(client, db_session):
+    """Test that estimated counts fall back to exact counts on SQLite."""
+    db_session.add_all([Item(name=f"Item {i}", price=i * 100) for i in range(1, 4)])
+    db_session.commit()
+    
+    response = client.get("/api/v1/items/", params={"count": "estimated"})
+    
+    assert response.status_code == 200
+    pagination = response.json()["data"]["pagination"]
+    assert pagination["total"] == 3
+    assert pagination["count_mode"] == "exact"
+    assert pagination["has_more"] is False
+
+
+def test_search_items_by_name(client, db_session):
+    """Test substring search on item names."""
+    db_session.add_all([
+        Item(name="Red Apple", price=100),
+        Item(name="Green apple pie", price=200),
+        Item(name="Banana", price=300),
+    ])
+    db_session.commit()
+    
+    # Indexed search is case-insensitive and matches inside words
+    response = client.get("/api/v1/items/", params={"name": "APPL"})
+    assert response.status_code == 200
+    data = response.json()["data"]
+    assert [item["name"] for item in data["items"]] == ["Red Apple", "Green apple pie"]
+    assert data["pagination"]["total"] == 2
+    
+    # Terms too short for the index fall back to ILIKE
+    response = client.get("/api/v1/items/", params={"name": "an"})
+    assert response.status_code == 200
+    assert [item["name"] for item in response.json()["data"]["items"]] == ["Banana"]
+
+
+def test_search_items_tracks_updates(client, db_session):
+    """Test that renamed and deleted items are reflected in search results."""
+    item = Item(name="Old Name", price=100)
+    db_session.add(item)
+    db_session.commit()
+    db_session.refresh(item)
+    
+    client.put(f"/api/v1/items/{item.id}", json={"name": "Fresh Name"})
+    
+    response = client.get("/api/v1/items/", params={"name": "Old"})
+    assert response.json()["data"]["items"] == []
+    response = client.get("/api/v1/items/", params={"name": "Fresh"})
+    assert [found["id"] for found in response.json()["data"]["items"]] == [item.id]
+    
+    client.delete(f"/api/v1/items/{item.id}")
+    
+    response = client.get("/api/v1/items/", params={"name": "Fresh"})
+    assert response.json()["data"]["items"] == []
+
+
+def test_search_items_by_relevance(client, db_session):
+    """Test ordering name matches by relevance."""
+    db_session.add_all([
+        Item(name="Lamp shade for a lamp stand and more", price=100),
+        Item(name="Lamp", price=200),
+    ])
+    db_session.commit()
+    
+    response = client.get("/api/v1/items/", params={"name": "lamp", "sort": "relevance"})
+    
+    assert response.status_code == 200
+    data = response.json()["data"]
+    assert [item["name"] for item in data["items"]][0] == "Lamp"
+    assert data["pagination"]["next_cursor"] is None
+    
+    # Relevance order cannot be combined with cursors
+    response = client.get("/api/v1/items/", params={"name": "lamp", "sort": "relevance", "after": "eyJpZCI6MX0"})
+    assert response.status_code == 422
+
+
+def test_bulk_create_items(client, db_session):
+    """Test creating several items in one request."""
+    items_data = [
+        {"name": f"Bulk Item {i}", "description": f"Description {i}", "price": i * 100}
+        for i in range(1, 4)
+    ]
+    
+    # Make request
+    response = client.post("/api/v1/items/bulk", json=items_data)
+    
+    # Check response
+    assert response.status_code == 201
+    results = response.json()["data"]["results"]
+    assert [result["status"] for result in results] == ["created"] * 3
+    assert [result["item"]["name"] for result in results] == [item["name"] for item in items_data]
+    assert all(result["item"]["created_at"] for result in results)
+    
+    # Check database
+    assert db_session.query(Item).count() == 3
+
+
+def test_bulk_update_items(client, db_session):
+    """Test updating several items in one request."""
+    items = [Item(name="Item 1", price=100), Item(name="Item 2", price=200)]
+    db_session.add_all(items)
+    db_session.commit()
+    ids = [item.id for item in items]
+    
+    # Make request
+    response = client.patch("/api/v1/items/bulk", json=[
+        {"id": ids[0], "price": 150},
+        {"id": ids[1], "name": "Renamed", "is_active": False},
+        {"id": 999, "price": 1},
+    ])
+    
+    # Check response
+    assert response.status_code == 200
+    results = response.json()["data"]["results"]
+    assert [result["status"] for result in results] == ["updated", "updated", "not_found"]
+    assert results[0]["item"]["price"] == 150
+    assert results[0]["item"]["name"] == "Item 1"
+    assert results[1]["item"]["name"] == "Renamed"
+    assert results[1]["item"]["is_active"] is False
+    
+    # Check database
+    db_item = db_session.query(Item).filter(Item.id == ids[1]).first()
+    assert db_item.name == "Renamed"
+    assert db_item.price == 200
+
+
+def test_bulk_delete_items(client, db_session):
+    """Test deleting several items in one request."""
+    items = [Item(name="Item 1", price=100), Item(name="Item 2", price=200), Item(name="Item 3", price=300)]
+    db_session.add_all(items)
+    db_session.commit()
+    ids = [item.id for item in items]
+    
+    # Make request
+    response = client.request("DELETE", "/api/v1/items/bulk", json={"ids": [ids[0], ids[2], 999]})
+    
+    # Check response
+    assert response.status_code == 200
+    results = response.json()["data"]["results"]
+    assert [result["status"] for result in results] == ["deleted", "deleted", "not_found"]
+    
+    # Check database
+    assert [item.id for item in db_session.query(Item).all()] == [ids[1]]
+
+
+def test_bulk_create_items_rejects_oversized_batch(client, db_session, monkeypatch):
+    """Test that batches above BULK_MAX_ITEMS are rejected."""
+    from app.core.config import settings
+    monkeypatch.setattr(settings, "BULK_MAX_ITEMS", 2)
+    
+    response = client.post("/api/v1/items/bulk", json=[{"name": "Item", "price": 1}] * 3)
+    
+    assert response.status_code == 422
+    assert response.json()["responseStatus"] == "VALIDATION_ERROR"
+
+
+def test_get_item_conditional(client, db_session):
+    """Test ETag validation of a single item."""
+    item = Item(name="Test Item", price=1000)
+    db_session.add(item)
+    db_session.commit()
+    db_session.refresh(item)
+    
+    # First request returns validators
+    response = client.get(f"/api/v1/items/{item.id}")
+    assert response.status_code == 200
+    etag = response.headers["ETag"]
+    assert "Last-Modified" not in response.headers
+    
+    # Matching validators return an empty 304
+    response = client.get(f"/api/v1/items/{item.id}", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.headers["ETag"] == etag
+    assert response.content == b""
+    
+    # Stale validators return the full item
+    response = client.get(f"/api/v1/items/{item.id}", headers={"If-None-Match": 'W/"stale"'})
+    assert response.status_code == 200
+    assert response.json()["data"]["id"] == item.id
+    
+    # Unknown items are still 404
+    response = client.get("/api/v1/items/999", headers={"If-None-Match": etag})
+    assert response.status_code == 404
+
+
+
+def test_get_item_conditional_after_update(client, db_session):
+    """Test that an update within the same second invalidates the item ETag."""
+    item = Item(name="Test Item", price=1000)
+    db_session.add(item)
+    db_session.commit()
+    db_session.refresh(item)
+    
+    etag = client.get(f"/api/v1/items/{item.id}").headers["ETag"]
+    client.put(f"/api/v1/items/{item.id}", json={"price": 2000})
+    
+    # Revalidating right away must not return 304 for the old content
+    response = client.get(f"/api/v1/items/{item.id}", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json()["data"]["price"] == 2000
+    assert response.headers["ETag"] != etag
+
+def test_get_items_conditional(client, db_session):
+    """Test ETag validation of an item list page."""
+    db_session.add_all([Item(name=f"Item {i}", price=i * 100) for i in range(1, 4)])
+    db_session.commit()
+    
+    response = client.get("/api/v1/items/", params={"limit": 2})
+    etag = response.headers["ETag"]
+    
+    response = client.get("/api/v1/items/", params={"limit": 2}, headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    
+    # Deleting a row on the page changes the page validator
+    first_id = db_session.query(Item).order_by(Item.id).first().id
+    client.delete(f"/api/v1/items/{first_id}")
+    
+    response = client.get("/api/v1/items/", params={"limit": 2}, headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+
+
+def test_get_items_conditional_ignores_update_times(client, db_session):
+    """Test that list pages are validated by content, not by the newest update time."""
+    db_session.add_all([Item(name=f"Item {i}", price=i * 100) for i in range(1, 5)])
+    db_session.commit()
+    ids = [item.id for item in db_session.query(Item).order_by(Item.id)]
+    
+    response = client.get("/api/v1/items/", params={"limit": 2})
+    etag = response.headers["ETag"]
+    assert "Last-Modified" not in response.headers
+    
+    # Deleting a row shifts the next one onto the page without raising any update time
+    client.delete(f"/api/v1/items/{ids[0]}")
+    response = client.get(
+        "/api/v1/items/",
+        params={"limit": 2},
+        headers={"If-Modified-Since": "Fri, 01 Jan 2100 00:00:00 GMT"}
+    )
+    assert response.status_code == 200
+    assert [item["id"] for item in response.json()["data"]["items"]] == ids[1:3]
+    
+    # Updates within the same second of the previous one still change the page
+    client.put(f"/api/v1/items/{ids[1]}", json={"price": 1})
+    etag = client.get("/api/v1/items/", params={"limit": 2}).headers["ETag"]
+    client.put(f"/api/v1/items/{ids[1]}", json={"price": 2})
+    response = client.get("/api/v1/items/", params={"limit": 2}, headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json()["data"]["items"][0]["price"] == 2
+    
+    # So do changes to the total off the page
+    etag = response.headers["ETag"]
+    client.delete(f"/api/v1/items/{ids[3]}")
+    response = client.get("/api/v1/items/", params={"limit": 2}, headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json()["data"]["pagination"]["total"] == 2
+
+
+def test_get_items_sparse_fields(client, db_session):
+    """Test returning only the requested item fields."""
+    item = Item(name="Test Item", description="Test Description", price=1000)
+    db_session.add(item)
+    db_session.commit()
+    db_session.refresh(item)
+    
+    response = client.get("/api/v1/items/?fields=name,price&name=Test")
+    assert response.status_code == 200
+    items = response.json()["data"]["items"]
+    assert items == [{
+        "id": item.id,
+        "name": "Test Item",
+        "price": 1000,
+        "updated_at": items[0]["updated_at"]
+    }]
+    
+    response = client.get(f"/api/v1/items/{item.id}?fields=price")
+    assert response.status_code == 200
+    assert set(response.json()["data"]) == {"id", "price", "updated_at"}
+    
+    # Sparse and full representations are validated separately
+    full_etag = client.get(f"/api/v1/items/{item.id}").headers["etag"]
+    assert response.headers["etag"] != full_etag
+    response = client.get(
+        f"/api/v1/items/{item.id}?fields=price",
+        headers={"If-None-Match": response.headers["etag"]}
+    )
+    assert response.status_code == 304
+
+
+def test_get_items_unknown_fields(client, db_session):
+    """Test that unknown fields are rejected."""
+    response = client.get("/api/v1/items/?fields=name,secret")
+    
+    assert response.status_code == 422
+    assert "secret" in response.json()["data"]["message"]
+
+
+def test_export_items_ndjson(client, db_session, monkeypatch):
+    """Test streaming items as newline-delimited JSON across several batches."""
+    from app.core.config import settings
+    monkeypatch.setattr(settings, "EXPORT_BATCH_SIZE", 2)
+    db_session.add_all([Item(name=f"Item {i}", price=i) for i in range(5)])
+    db_session.add(Item(name="Other", price=99))
+    db_session.commit()
+    
+    response = client.get("/api/v1/items/export?name=Item")
+    
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert response.headers["content-disposition"] == 'attachment; filename="items.ndjson"'
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [row["name"] for row in rows] == [f"Item {i}" for i in range(5)]
+    assert set(rows[0]) == {"id", "name", "description", "price", "is_active", "created_at", "updated_at"}
+
+
+
+def test_export_items_outlives_request_session(client, db_session):
+    """Test that exports read with their own session, not the request's."""
+    from app.main import app
+    from app.models.base import get_db
+    
+    class ClosedSession:
+        def __getattr__(self, name):
+            raise AssertionError("the request session was used by the stream")
+    
+    async def closed_db():
+        yield ClosedSession()
+    
+    db_session.add_all([Item(name="Item 1", price=10), Item(name="Item 2", price=20)])
+    db_session.commit()
+    app.dependency_overrides[get_db] = closed_db
+    
+    response = client.get("/api/v1/items/export")
+    
+    assert response.status_code == 200
+    assert [json.loads(line)["name"] for line in response.text.splitlines()] == ["Item 1", "Item 2"]
+
+def test_export_items_csv(client, db_session):
+    """Test streaming items as CSV with the requested fields."""
+    db_session.add_all([Item(name="Item, 1", price=10), Item(name="Item 2", price=20)])
+    db_session.commit()
+    
+    response = client.get("/api/v1/items/export?format=csv&fields=name,price")
+    
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "text/csv; charset=utf-8"
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [(row["name"], row["price"]) for row in rows] == [("Item, 1", "10"), ("Item 2", "20")]
+    assert list(rows[0]) == ["id", "name", "price", "updated_at"]
+    
+    # An empty export still has its header row
+    response = client.get("/api/v1/items/export?format=csv&name=missing")
+    assert response.text.splitlines() == ["id,name,description,price,is_active,created_at,updated_at"]
+    
+    response = client.get("/api/v1/items/export?format=xml")
+    assert response.status_code == 422
+
+
+def test_import_items_ndjson(client, db_session, monkeypatch):
+    """Test importing items in batches, reporting bad rows without aborting."""
+    from app.core.config import settings
+    monkeypatch.setattr(settings, "IMPORT_BATCH_SIZE", 2)
+    body = "\n".join([
+        json.dumps({"name": "Item 1", "price": 100}),
+        json.dumps({"name": "Item 2", "price": "not a price"}),
+        "",
+        "{not json",
+        json.dumps({"name": "Item 3", "price": 300, "is_active": False}),
+    ])
+    
+    response = client.post("/api/v1/items/import", content=body.encode())
+    
+    assert response.status_code == 200
+    data = response.json()["data"]
+    assert data["imported"] == 2
+    assert data["failed"] == 2
+    assert [error["line"] for error in data["errors"]] == [2, 4]
+    assert data["errors"][0]["error"].startswith("price:")
+    items = db_session.query(Item).order_by(Item.id).all()
+    assert [(item.name, item.price, item.is_active) for item in items] == [
+        ("Item 1", 100, True),
+        ("Item 3", 300, False),
+    ]
+
+
+
+def test_import_items_stops_at_overlong_line(client, db_session, monkeypatch):
+    """Test that an over-long line ends the import and keeps the committed batches."""
+    from app.core.config import settings
+    from app.utils import bulk_import
+    monkeypatch.setattr(settings, "IMPORT_BATCH_SIZE", 1)
+    monkeypatch.setattr(bulk_import, "MAX_RECORD_SIZE", 64)
+    lines = [json.dumps({"name": f"Item {i}", "price": i}) for i in range(1, 3)]
+    body = "".join(f"{line}\n" for line in lines) + "x" * 100
+    
+    response = client.post("/api/v1/items/import", content=body.encode())
+    
+    assert response.status_code == 200
+    data = response.json()["data"]
+    assert data["imported"] == 2
+    assert data["failed"] == 1
+    assert data["errors"] == [{"line": 3, "error": "Line is longer than 64 bytes"}]
+    assert db_session.query(Item).count() == 2
+
+def test_import_items_csv_round_trip(client, db_session):
+    """Test that a CSV export can be imported again."""
+    db_session.add_all([
+        Item(name="Multi\nline, \"quoted\"", description="First", price=10),
+        Item(name="Plain", price=20),
+    ])
+    db_session.commit()
+    exported = client.get("/api/v1/items/export?format=csv").content
+    
+    # Feed the body in small chunks so records span chunk boundaries
+    chunks = [exported[start:start + 7] for start in range(0, len(exported), 7)]
+    response = client.post("/api/v1/items/import?format=csv", content=iter(chunks))
+    
+    assert response.status_code == 200
+    assert response.json()["data"] == {"imported": 2, "failed": 0, "errors": []}
+    items = db_session.query(Item).order_by(Item.id).all()
+    assert [(item.name, item.description, item.price) for item in items[2:]] == [
+        ("Multi\nline, \"quoted\"", "First", 10),
+        ("Plain", None, 20),
+    ]
@@ -1,3 +1,4 @@
+import json
 import pytest
 from fastapi.testclient import TestClient
 from app.models.user import User
@@ -181,3 +182,113 @@ def test_delete_user(client, db_session):
     # Check database
     db_user = db_session.query(User).filter(User.id == user.id).first()
     assert db_user is None
+
+
+
+def test_update_missing_user_skips_hashing(client, monkeypatch):
+    """Test that a password update of an unknown user is rejected before hashing."""
+    from app.core.security import password_hasher
+    
+    async def hash(password):
+        raise AssertionError("password was hashed")
+    
+    monkeypatch.setattr(password_hasher, "hash", hash)
+    
+    response = client.put("/api/v1/users/999", json={"password": "newpassword123"})
+    
+    assert response.status_code == 404
+
+def test_create_user_when_hashing_saturated(client, db_session, monkeypatch):
+    """Test that signups get a fast 503 when the hashing pool is full."""
+    from app.core.security import password_hasher
+    monkeypatch.setattr(password_hasher, "max_pending", 0)
+    
+    user_data = {
+        "email": "busy@example.com",
+        "username": "busyuser",
+        "password": "password123"
+    }
+    
+    # Make request
+    response = client.post("/api/v1/users/", json=user_data)
+    
+    # Check response
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+    data = response.json()
+    assert data["responseCode"] == "503"
+    assert data["responseStatus"] == "SERVICE_UNAVAILABLE"
+    
+    # Check database
+    assert db_session.query(User).count() == 0
+
+
+def test_get_users_sparse_fields(client, db_session):
+    """Test returning only the requested user fields."""
+    user = User(email="user1@example.com", username="user1", hashed_password="hash")
+    db_session.add(user)
+    db_session.commit()
+    db_session.refresh(user)
+    
+    response = client.get("/api/v1/users/?fields=username")
+    assert response.status_code == 200
+    assert [set(row) for row in response.json()["data"]["items"]] == [{"id", "username", "updated_at"}]
+    
+    response = client.get(f"/api/v1/users/{user.id}?fields=email")
+    assert response.status_code == 200
+    assert response.json()["data"]["email"] == "user1@example.com"
+    assert "username" not in response.json()["data"]
+    
+    # The password hash is never a selectable field
+    response = client.get("/api/v1/users/?fields=hashed_password")
+    assert response.status_code == 422
+
+
+def test_export_users(client, db_session):
+    """Test streaming users without their password hashes."""
+    db_session.add_all([
+        User(email=f"user{i}@example.com", username=f"user{i}", hashed_password="hash")
+        for i in range(3)
+    ])
+    db_session.commit()
+    
+    response = client.get("/api/v1/users/export?email=user1")
+    assert response.status_code == 200
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [row["username"] for row in rows] == ["user1"]
+    assert "hashed_password" not in rows[0]
+    
+    response = client.get("/api/v1/users/export?format=csv&fields=username")
+    assert response.status_code == 200
+    lines = response.text.splitlines()
+    assert lines[0] == "id,username,updated_at"
+    assert [line.split(",")[1] for line in lines[1:]] == ["user0", "user1", "user2"]
+
+
+def test_import_users(client, db_session, monkeypatch):
+    """Test importing users with hashed passwords, isolating duplicates."""
+    from app.core.config import settings
+    from app.core.security import password_hasher, pwd_context
+    monkeypatch.setattr(settings, "IMPORT_BATCH_SIZE", 10)
+    # Imports wait for hashing capacity instead of failing fast
+    monkeypatch.setattr(password_hasher, "max_pending", 0)
+    db_session.add(User(email="taken@example.com", username="taken", hashed_password="hash"))
+    db_session.commit()
+    body = "\n".join(json.dumps(row) for row in [
+        {"email": "new1@example.com", "username": "new1", "password": "secret1"},
+        {"email": "taken@example.com", "username": "other", "password": "secret2"},
+        {"email": "not-an-email", "username": "bad", "password": "secret3"},
+        {"email": "new2@example.com", "username": "new2", "password": "secret4"},
+    ])
+    
+    response = client.post("/api/v1/users/import", content=body.encode())
+    
+    assert response.status_code == 200
+    data = response.json()["data"]
+    assert data["imported"] == 2
+    assert [error["line"] for error in data["errors"]] == [3, 2]
+    # Database errors name the constraint, never the statement parameters
+    assert "hash" not in data["errors"][1]["error"]
+    users = db_session.query(User).filter(User.email.like("new%")).order_by(User.id).all()
+    assert [user.username for user in users] == ["new1", "new2"]
+    assert pwd_context.verify("secret4", users[1].hashed_password)
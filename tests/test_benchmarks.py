@@ -0,0 +1,29 @@
+from benchmarks.endpoints import compare, percentile
+
+
+def test_percentile():
+    """Test nearest-rank percentiles."""
+    samples = [float(i) for i in range(1, 101)]
+    
+    assert percentile(samples, 0.50) == 50.0
+    assert percentile(samples, 0.95) == 95.0
+    assert percentile(samples, 0.99) == 99.0
+    assert percentile([3.0], 0.99) == 3.0
+
+
+def test_compare_reports_regressions():
+    """Test the benchmark regression gate."""
+    baseline = {
+        "items.get": {"rps": 100.0, "p95_ms": 10.0},
+        "items.list": {"rps": 100.0, "p95_ms": 10.0},
+        "items.removed": {"rps": 100.0, "p95_ms": 10.0},
+    }
+    results = {
+        "items.get": {"rps": 85.0, "p95_ms": 11.5},
+        "items.list": {"rps": 70.0, "p95_ms": 13.0},
+    }
+    
+    regressions = compare(results, baseline, threshold=0.2)
+    
+    assert len(regressions) == 2
+    assert all(regression.startswith("items.list") for regression in regressions)
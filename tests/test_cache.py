@@ -0,0 +1,143 @@
+import asyncio
+import fnmatch
+from datetime import datetime, timezone
+from app.core.cache import EntityCache, MemoryCacheBackend, RedisCacheBackend
+from app.models.item import Item
+
+
+class FakeRedis:
+    """Minimal in-memory stand-in for the asyncio redis client."""
+    
+    def __init__(self):
+        self.data = {}
+    
+    async def get(self, key):
+        return self.data.get(key)
+    
+    async def set(self, key, value, ex=None):
+        self.data[key] = value
+    
+    async def delete(self, *keys):
+        for key in keys:
+            self.data.pop(key, None)
+    
+    async def scan_iter(self, match):
+        for key in list(self.data):
+            if fnmatch.fnmatch(key, match):
+                yield key
+
+
+def test_memory_backend_evicts_least_recently_used():
+    """Test the size bound and LRU order of the memory backend."""
+    backend = MemoryCacheBackend(max_size=2)
+    
+    async def main():
+        await backend.set("a", {"id": 1}, 60)
+        await backend.set("b", {"id": 2}, 60)
+        await backend.get("a")
+        await backend.set("c", {"id": 3}, 60)
+        return await backend.get("a"), await backend.get("b"), await backend.get("c")
+    
+    a, b, c = asyncio.run(main())
+    assert a == {"id": 1}
+    assert b is None
+    assert c == {"id": 3}
+
+
+def test_memory_backend_expires_entries():
+    """Test that entries are dropped once their TTL has passed."""
+    backend = MemoryCacheBackend()
+    
+    async def main():
+        await backend.set("a", {"id": 1}, 0)
+        return await backend.get("a")
+    
+    assert asyncio.run(main()) is None
+    assert len(backend) == 0
+
+
+def test_entity_cache_with_redis_backend():
+    """Test read-through, invalidation and counters against a fake Redis."""
+    cache = EntityCache(RedisCacheBackend(client=FakeRedis()), ttl=60)
+    loads = []
+    updated_at = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    
+    async def loader():
+        loads.append(1)
+        return {"id": 1, "name": "Item", "updated_at": updated_at}
+    
+    async def main():
+        first = await cache.get_or_load("item:1", loader)
+        second = await cache.get_or_load("item:1", loader)
+        await cache.invalidate("item:1")
+        third = await cache.get_or_load("item:1", loader)
+        return first, second, third
+    
+    first, second, third = asyncio.run(main())
+    assert first == second == third
+    assert second["updated_at"] == updated_at
+    assert len(loads) == 2
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 2
+
+
+def test_entity_cache_skips_loads_raced_by_invalidation():
+    """Test that a load overtaken by a write is returned but not stored."""
+    cache = EntityCache(MemoryCacheBackend(), ttl=60)
+    
+    async def main():
+        started = asyncio.Event()
+        written = asyncio.Event()
+        
+        async def load_before_write():
+            started.set()
+            await written.wait()
+            return {"id": 1, "name": "old"}
+        
+        async def write():
+            await started.wait()
+            await cache.invalidate("item:1")
+            written.set()
+        
+        value, _ = await asyncio.gather(cache.get_or_load("item:1", load_before_write), write())
+        
+        async def load_after_write():
+            return {"id": 1, "name": "new"}
+        
+        return value, await cache.get_or_load("item:1", load_after_write)
+    
+    stale, fresh = asyncio.run(main())
+    
+    assert stale["name"] == "old"
+    assert fresh["name"] == "new"
+    assert len(cache.backend) == 1
+
+
+def test_get_item_is_cached_and_invalidated(client, db_session):
+    """Test that item reads are served from cache until the item changes."""
+    item = Item(name="Cached Item", price=1000)
+    db_session.add(item)
+    db_session.commit()
+    db_session.refresh(item)
+    
+    # First read populates the cache
+    assert client.get(f"/api/v1/items/{item.id}").json()["data"]["name"] == "Cached Item"
+    
+    # Changes made behind the API's back are not seen while cached
+    db_session.query(Item).filter(Item.id == item.id).update({"name": "Changed Directly"})
+    db_session.commit()
+    assert client.get(f"/api/v1/items/{item.id}").json()["data"]["name"] == "Cached Item"
+    
+    # Updates through the API invalidate the entry
+    client.put(f"/api/v1/items/{item.id}", json={"price": 2000})
+    data = client.get(f"/api/v1/items/{item.id}").json()["data"]
+    assert data["name"] == "Changed Directly"
+    assert data["price"] == 2000
+    
+    # Deletes invalidate the entry
+    client.delete(f"/api/v1/items/{item.id}")
+    assert client.get(f"/api/v1/items/{item.id}").status_code == 404
+    
+    stats = client.get("/health/cache").json()["data"]
+    assert stats["hits"] >= 1
+    assert stats["misses"] >= 1
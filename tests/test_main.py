@@ -1,5 +1,7 @@
 import pytest
 from fastapi.testclient import TestClient
+from app.core.compression import choose_encoding
+from app.core.config import settings
 from app.main import app
 
 
@@ -44,3 +46,120 @@ def test_openapi_json(client):
     assert "openapi" in data
     assert "paths" in data
     assert "components" in data
+
+
+def test_server_timing_header(client, db_session):
+    """Test that responses carry the Server-Timing breakdown."""
+    response = client.get("/api/v1/items/")
+    
+    assert response.status_code == 200
+    metrics = {
+        metric.split(";")[0]: metric
+        for metric in response.headers["server-timing"].split(", ")
+    }
+    assert {"db", "serialize", "total"} <= set(metrics)
+    # One query for the count and one for the page
+    assert 'desc="2 queries"' in metrics["db"]
+
+
+def test_metrics_endpoint(client, db_session):
+    """Test that /metrics exposes request, pool and query metrics."""
+    client.get("/api/v1/items/")
+    client.get("/api/v1/items/999")
+    
+    response = client.get("/metrics")
+    
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    body = response.text
+    assert 'http_request_duration_seconds_count{method="GET",route="/api/v1/items/",status="200"}' in body
+    assert 'route="/api/v1/items/{item_id}",status="404"' in body
+    assert "http_requests_in_progress" in body
+    assert "db_pool_checked_out_connections" in body
+    assert 'db_queries_total{method="get_items",repository="ItemRepository"}' in body
+
+
+def test_db_health_endpoint(client, db_session):
+    """Test that /health/db reports connectivity and pool statistics."""
+    response = client.get("/health/db")
+    
+    assert response.status_code == 200
+    data = response.json()["data"]
+    assert data["status"] == "ok"
+    assert data["pool"] == "AsyncAdaptedQueuePool"
+    assert data["size"] == settings.DB_POOL_SIZE
+    assert {"checked_out", "idle", "overflow", "waiters", "latency_ms"} <= set(data)
+
+
+def test_choose_encoding():
+    """Test Accept-Encoding negotiation with q-values and wildcards."""
+    available = ("zstd", "br", "gzip")
+    
+    assert choose_encoding("gzip, deflate, br", available) == "br"
+    assert choose_encoding("gzip;q=1.0, br;q=0.5", available) == "gzip"
+    assert choose_encoding("*", available) == "zstd"
+    assert choose_encoding("*;q=0.5, gzip", ("br", "gzip")) == "gzip"
+    assert choose_encoding("br;q=0, identity", ("br", "gzip")) is None
+    assert choose_encoding("", available) is None
+
+
+def test_response_compression(client, db_session):
+    """Test that large responses are compressed and small ones are not."""
+    from app.models.item import Item
+    db_session.add_all([Item(name=f"Item {i}", description="x" * 100, price=i) for i in range(20)])
+    db_session.commit()
+    
+    response = client.get("/api/v1/items/?limit=20", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["vary"]
+    assert response.headers["etag"].startswith('W/"')
+    assert len(response.json()["data"]["items"]) == 20
+    
+    # Below the size threshold, and for clients not asking, the body is sent as is
+    response = client.get("/api/v1/items/?limit=1", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in response.headers
+    assert "Accept-Encoding" in response.headers["vary"]
+    response = client.get("/api/v1/items/?limit=20", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in response.headers
+    
+    # Streamed exports are compressed chunk by chunk
+    response = client.get("/api/v1/items/export", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert "content-length" not in response.headers
+    assert len(response.text.splitlines()) == 20
+
+
+@pytest.mark.parametrize("encoding, module", [("br", "brotli"), ("zstd", "zstandard")])
+def test_response_compression_optional_encodings(client, db_session, encoding, module):
+    """Test Brotli and zstd compression when their packages are installed."""
+    pytest.importorskip(module)
+    from app.models.item import Item
+    db_session.add_all([Item(name=f"Item {i}", description="x" * 100, price=i) for i in range(20)])
+    db_session.commit()
+    
+    response = client.get("/api/v1/items/?limit=20", headers={"Accept-Encoding": encoding})
+    
+    assert response.headers["content-encoding"] == encoding
+    assert len(response.json()["data"]["items"]) == 20
+
+
+def test_run_disables_memory_cache_with_several_workers(monkeypatch):
+    """Test that the launcher turns off the per-process cache for multiple workers."""
+    import run
+    calls = []
+    monkeypatch.setattr(run.uvicorn, "run", lambda *args, **kwargs: calls.append(kwargs))
+    monkeypatch.setattr(settings, "SERVER_RELOAD", False)
+    monkeypatch.setattr(settings, "SERVER_WORKERS", 4)
+    monkeypatch.setattr(settings, "METRICS_ENABLED", False)
+    monkeypatch.setattr(settings, "CACHE_BACKEND", "memory")
+    monkeypatch.delenv("CACHE_BACKEND", raising=False)
+    
+    run.main()
+    
+    assert calls[0]["workers"] == 4
+    assert run.os.environ.pop("CACHE_BACKEND") == "none"
+    
+    # A single worker keeps it
+    monkeypatch.setattr(settings, "SERVER_WORKERS", 1)
+    run.main()
+    assert "CACHE_BACKEND" not in run.os.environ
@@ -0,0 +1,79 @@
+import logging
+from sqlalchemy import create_engine, text
+from app.core.config import settings
+from app.core.query_monitor import monitor_engine, redact_parameters, statement_shape, track_request
+
+
+def make_engine():
+    engine = create_engine("sqlite://")
+    monitor_engine(engine)
+    return engine
+
+
+def test_statement_shape_collapses_in_lists():
+    """Test that IN lists of different lengths share a shape."""
+    assert statement_shape("SELECT * FROM items WHERE id IN (?, ?, ?)") == \
+        statement_shape("SELECT *\n  FROM items WHERE id IN (?)")
+
+
+def test_redact_parameters():
+    """Test that sensitive parameters are masked."""
+    redacted = redact_parameters({"hashed_password": "abc", "email": "a@example.com", "name": "x" * 200})
+    
+    assert redacted["hashed_password"] == "***"
+    assert redacted["email"] == "a@example.com"
+    assert len(redacted["name"]) == 103
+
+
+def test_slow_query_log(monkeypatch, caplog):
+    """Test that slow statements are logged with redacted parameters and plan."""
+    monkeypatch.setattr(settings, "SLOW_QUERY_MS", 1e-6)
+    engine = make_engine()
+    
+    with caplog.at_level(logging.WARNING, logger="app.core.query_monitor"):
+        with engine.connect() as conn:
+            conn.execute(text("SELECT :password AS secret_value, :name AS name"), {"password": "hunter2", "name": "ok"})
+    
+    message = caplog.records[-1].getMessage()
+    assert "Slow query" in message
+    assert "hunter2" not in message
+    assert "'password': '***'" in message
+    assert "plan=" in message and "<not available>" not in message.split("plan=")[1]
+
+
+def test_slow_query_plans_are_cached(monkeypatch, caplog):
+    """Test that a statement shape is explained once, however often it is slow."""
+    from app.core import query_monitor
+    monkeypatch.setattr(settings, "SLOW_QUERY_MS", 1e-6)
+    explained = []
+    explain = query_monitor._explain
+    monkeypatch.setattr(query_monitor, "_explain", lambda *args: explained.append(args) or explain(*args))
+    engine = make_engine()
+    
+    with caplog.at_level(logging.WARNING, logger="app.core.query_monitor"):
+        with engine.connect() as conn:
+            for value in range(3):
+                conn.execute(text("SELECT :value AS cached_plan"), {"value": value})
+    
+    assert len(explained) == 1
+    plans = [record.getMessage().split("plan=")[1] for record in caplog.records if "cached_plan" in record.getMessage()]
+    assert len(plans) == 3
+    assert len(set(plans)) == 1 and "<not available>" not in plans[0]
+
+
+def test_repeated_statements_are_flagged(monkeypatch, caplog):
+    """Test N+1 detection within a request."""
+    monkeypatch.setattr(settings, "N_PLUS_ONE_THRESHOLD", 2)
+    engine = make_engine()
+    scope = {"type": "http", "method": "GET", "path": "/api/v1/items/"}
+    
+    with caplog.at_level(logging.WARNING, logger="app.core.query_monitor"):
+        with engine.connect() as conn, track_request(scope):
+            for item_id in range(3):
+                conn.execute(text("SELECT :id"), {"id": item_id})
+            conn.execute(text("SELECT 1"))
+    
+    warnings = [record.getMessage() for record in caplog.records if "N+1" in record.getMessage()]
+    assert len(warnings) == 1
+    assert "ran the same statement 3 times" in warnings[0]
+    assert "GET unmatched" in warnings[0]
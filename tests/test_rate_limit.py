@@ -0,0 +1,129 @@
+import asyncio
+from app.core.config import settings
+from app.core.rate_limit import (
+    MemoryRateLimitBackend,
+    RateLimiter,
+    RedisRateLimitBackend,
+    client_key,
+    rate_limiter,
+    request_cost,
+)
+
+
+def http_scope(path, method="GET", query=b"", headers=(), client=("203.0.113.7", 50000)):
+    return {
+        "type": "http",
+        "method": method,
+        "path": path,
+        "query_string": query,
+        "headers": [(name.lower().encode(), value.encode()) for name, value in headers],
+        "client": client,
+    }
+
+
+def test_memory_backend_token_bucket():
+    """Test that buckets drain by cost and report how long to wait."""
+    limiter = RateLimiter(MemoryRateLimitBackend(), capacity=3, refill_rate=1)
+    
+    async def main():
+        return [await limiter.take("client", cost) for cost in (2, 1, 2)] + [await limiter.take("other", 2)]
+    
+    first, second, third, other = asyncio.run(main())
+    
+    assert first.allowed and second.allowed
+    assert not third.allowed
+    assert 1.9 < third.retry_after <= 2.0
+    # Buckets are per client
+    assert other.allowed
+    assert limiter.stats()["allowed"] == 3
+    assert limiter.stats()["limited"] == 1
+    assert limiter.stats()["clients"] == 2
+
+
+def test_memory_backend_bounds_clients():
+    """Test that the least recently seen clients are dropped past max_keys."""
+    backend = MemoryRateLimitBackend(max_keys=2)
+    
+    async def main():
+        for key in ("a", "b", "c"):
+            await backend.take(key, 1, 10, 1)
+    
+    asyncio.run(main())
+    assert len(backend) == 2
+
+
+def test_rate_limiter_with_redis_backend():
+    """Test decoding the bucket script's reply."""
+    class FakeRedis:
+        async def eval(self, script, numkeys, key, capacity, refill_rate, cost):
+            assert key == "ratelimit:client"
+            return [0, "0.5"]
+    
+    limiter = RateLimiter(RedisRateLimitBackend(client=FakeRedis()), capacity=10, refill_rate=2)
+    decision = asyncio.run(limiter.take("client", 5))
+    
+    assert not decision.allowed
+    assert decision.retry_after == 2.25
+
+
+def test_rate_limiter_fails_open():
+    """Test that backend errors let requests through."""
+    class BrokenBackend(MemoryRateLimitBackend):
+        async def take(self, *args):
+            raise ConnectionError("down")
+    
+    decision = asyncio.run(RateLimiter(BrokenBackend()).take("client"))
+    
+    assert decision.allowed
+
+
+def test_request_cost():
+    """Test that searches and lists cost more than point reads."""
+    api = settings.API_V1_STR
+    
+    assert request_cost(http_scope(f"{api}/items/1")) == 1
+    assert request_cost(http_scope(f"{api}/items/")) == settings.RATE_LIMIT_LIST_COST
+    assert request_cost(http_scope(f"{api}/items/", query=b"name=chair")) == settings.RATE_LIMIT_SEARCH_COST
+    assert request_cost(http_scope(f"{api}/users/", query=b"email=")) == settings.RATE_LIMIT_LIST_COST
+    assert request_cost(http_scope(f"{api}/items/", method="POST")) == 1
+    assert request_cost(http_scope(f"{api}/items/export")) == settings.RATE_LIMIT_BULK_COST
+    assert request_cost(http_scope(f"{api}/items/bulk", method="PATCH")) == settings.RATE_LIMIT_BULK_COST
+
+
+def test_client_key(monkeypatch):
+    """Test identifying clients by IP, or by a key header once configured."""
+    with_key = http_scope("/", headers=[("X-API-Key", "secret")])
+    assert client_key(with_key) == "ip:203.0.113.7"
+    
+    monkeypatch.setattr(settings, "RATE_LIMIT_KEY_HEADER", "X-API-Key")
+    assert client_key(with_key).startswith("key:")
+    assert "secret" not in client_key(with_key)
+    assert client_key(http_scope("/")) == "ip:203.0.113.7"
+    monkeypatch.setattr(settings, "RATE_LIMIT_KEY_HEADER", "")
+    
+    # X-Forwarded-For is only believed behind a trusted proxy
+    forwarded = http_scope("/", headers=[("X-Forwarded-For", "198.51.100.1, 10.0.0.1")])
+    assert client_key(forwarded) == "ip:203.0.113.7"
+    monkeypatch.setattr(settings, "RATE_LIMIT_TRUST_PROXY", True)
+    assert client_key(forwarded) == "ip:198.51.100.1"
+
+
+def test_rate_limit_middleware(client, db_session, monkeypatch):
+    """Test that exhausted clients get a 429 with Retry-After."""
+    monkeypatch.setattr(rate_limiter, "capacity", settings.RATE_LIMIT_SEARCH_COST)
+    monkeypatch.setattr(rate_limiter, "refill_rate", 0.1)
+    
+    assert client.get("/api/v1/items/?name=chair").status_code == 200
+    response = client.get("/api/v1/items/?name=chair")
+    
+    assert response.status_code == 429
+    assert response.json()["responseStatus"] == "RATE_LIMITED"
+    assert int(response.headers["retry-after"]) >= 1
+    
+    # Rotating an unvalidated key header does not get a fresh bucket
+    assert client.get("/api/v1/items/?name=chair", headers={"X-API-Key": "random"}).status_code == 429
+    
+    # Paths outside the API are not affected
+    stats = client.get("/health/rate-limit").json()["data"]
+    assert stats["limited"] == 2
+    assert stats["backend"] == "memory"
@@ -0,0 +1,95 @@
+import asyncio
+import pytest
+from app.core.exceptions import ServiceUnavailableException
+from app.core.security import PasswordHasher
+
+
+def test_password_hasher_hash_and_verify():
+    """Test hashing and verifying passwords in the worker pool."""
+    hasher = PasswordHasher(max_workers=2)
+    
+    async def main():
+        hashed = await hasher.hash("password123")
+        return hashed, await hasher.verify("password123", hashed), await hasher.verify("wrong", hashed)
+    
+    try:
+        hashed, valid, invalid = asyncio.run(main())
+    finally:
+        hasher.shutdown()
+    
+    assert hashed != "password123"
+    assert valid is True
+    assert invalid is False
+    assert hasher.pending == 0
+
+
+def test_password_hasher_hash_many():
+    """Test hashing a batch of passwords, keeping order."""
+    hasher = PasswordHasher(max_workers=2)
+    passwords = ["first", "second", "third"]
+    
+    async def main():
+        hashed = await hasher.hash_many(passwords)
+        return hashed, [await hasher.verify(password, hash) for password, hash in zip(passwords, hashed)]
+    
+    try:
+        hashed, valid = asyncio.run(main())
+    finally:
+        hasher.shutdown()
+    
+    assert len(hashed) == 3
+    assert valid == [True, True, True]
+    assert hasher.pending == 0
+
+
+def test_password_hasher_rejects_when_saturated():
+    """Test that the hasher fails fast once its queue is full."""
+    hasher = PasswordHasher(max_workers=1, max_pending=1)
+    
+    async def main():
+        return await asyncio.gather(
+            hasher.hash("password1"),
+            hasher.hash("password2"),
+            return_exceptions=True
+        )
+    
+    try:
+        results = asyncio.run(main())
+    finally:
+        hasher.shutdown()
+    
+    assert isinstance(results[0], str)
+    assert isinstance(results[1], ServiceUnavailableException)
+    assert results[1].status_code == 503
+    assert results[1].headers["Retry-After"] == "1"
+
+
+def test_password_hasher_hash_many_shares_the_pool(monkeypatch):
+    """Test that bulk hashing waits for capacity, holds bulk_workers workers and reports failures."""
+    import app.core.security as security
+    hasher = PasswordHasher(max_workers=2, max_pending=0, bulk_workers=1)
+    running = []
+    
+    def hash_password(password):
+        running.append(password)
+        assert len(running) == 1
+        if password == "bad":
+            running.remove(password)
+            raise ValueError("bcrypt failed")
+        running.remove(password)
+        return f"hashed-{password}"
+    
+    monkeypatch.setattr(security, "_hash_password", hash_password)
+    
+    try:
+        hashed = asyncio.run(hasher.hash_many(["first", "bad", "third"]))
+    finally:
+        hasher.shutdown()
+    
+    assert hashed == ["hashed-first", None, "hashed-third"]
+
+
+def test_password_hasher_rejects_unknown_executor():
+    """Test that only thread and process pools are accepted."""
+    with pytest.raises(ValueError):
+        PasswordHasher(executor_type="fiber")
@@ -0,0 +1,130 @@
+import asyncio
+from sqlalchemy import event
+from app.core.cache import entity_cache
+from app.core.single_flight import SingleFlight
+from app.models.item import Item
+from app.models.routing import _primary_pinned
+from app.services.item_service import ItemService
+
+
+def test_concurrent_calls_share_one_result():
+    """Test that identical calls in flight run once and distinct keys run apart."""
+    flights = SingleFlight()
+    calls = []
+    
+    async def load(value):
+        calls.append(value)
+        await asyncio.sleep(0.01)
+        return {"value": value}
+    
+    async def main():
+        return await asyncio.gather(
+            *[flights.do(("item", 1), lambda: load(1)) for _ in range(10)],
+            flights.do(("item", 2), lambda: load(2))
+        )
+    
+    results = asyncio.run(main())
+    
+    assert calls == [1, 2]
+    assert all(result is results[0] for result in results[:10])
+    assert results[10] == {"value": 2}
+    # Finished calls are not remembered
+    assert len(flights) == 0
+
+
+def test_errors_are_shared():
+    """Test that every caller of a failed call gets its exception."""
+    flights = SingleFlight()
+    calls = []
+    
+    async def load():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        raise ValueError("boom")
+    
+    async def main():
+        return await asyncio.gather(*[flights.do(("item", 1), load) for _ in range(3)], return_exceptions=True)
+    
+    results = asyncio.run(main())
+    
+    assert len(calls) == 1
+    assert all(isinstance(result, ValueError) for result in results)
+
+
+def test_cancelled_leader_hands_over():
+    """Test that followers run the call themselves when the leader is cancelled."""
+    flights = SingleFlight()
+    calls = []
+    
+    async def load():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return len(calls)
+    
+    async def main():
+        leader = asyncio.ensure_future(flights.do(("item", 1), load))
+        await asyncio.sleep(0)
+        follower = asyncio.ensure_future(flights.do(("item", 1), load))
+        await asyncio.sleep(0)
+        leader.cancel()
+        return await follower, leader.cancelled()
+    
+    result, cancelled = asyncio.run(main())
+    
+    assert cancelled
+    assert result == 2
+
+
+def test_forget_starts_fresh_calls():
+    """Test that calls after forget() do not join the call already in flight."""
+    flights = SingleFlight()
+    calls = []
+    
+    async def load():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return len(calls)
+    
+    async def main():
+        first = asyncio.ensure_future(flights.do(("item", 1), load))
+        await asyncio.sleep(0)
+        flights.forget("item")
+        return await asyncio.gather(first, flights.do(("item", 1), load))
+    
+    # Both calls ran, so each saw both
+    assert asyncio.run(main()) == [2, 2]
+
+
+def test_get_item_coalesces_queries(db_session, monkeypatch):
+    """Test that concurrent reads of one item run one SELECT without a cache."""
+    from tests.conftest import AsyncTestingSessionLocal, async_engine
+    
+    item = Item(name="Viral Item", price=1000)
+    db_session.add(item)
+    db_session.commit()
+    db_session.refresh(item)
+    monkeypatch.setattr(entity_cache, "backend", None)
+    
+    statements = []
+    
+    def count(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append(statement)
+    
+    async def read(pinned=False):
+        _primary_pinned.set(pinned)
+        async with AsyncTestingSessionLocal() as db:
+            return await ItemService(db).get_item(item.id)
+    
+    async def main():
+        return await asyncio.gather(*[read() for _ in range(20)], read(pinned=True))
+    
+    event.listen(async_engine.sync_engine, "before_cursor_execute", count)
+    try:
+        results = asyncio.run(main())
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", count)
+    
+    assert all(result["name"] == "Viral Item" for result in results)
+    # One query for the shared read, one for the request pinned to the primary
+    assert len(statements) == 2
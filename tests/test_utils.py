@@ -1,5 +1,17 @@
+import json
+from datetime import datetime
+
 import pytest
-from app.utils.response import success_response, error_response, validation_error_response, pagination_response
+from fastapi.encoders import jsonable_encoder
+from app.core.exceptions import ValidationException
+from app.utils.pagination import decode_cursor, encode_cursor, next_cursor
+from app.utils.response import (
+    error_response,
+    get_json_dumps,
+    pagination_response,
+    success_response,
+    validation_error_response,
+)
 
 
 def test_success_response():
@@ -7,10 +19,11 @@ def test_success_response():
     # Test with simple data
     data = {"message": "Success"}
     response = success_response(data)
+    body = json.loads(response.body)
     
-    assert response["responseCode"] == "200"
-    assert response["responseStatus"] == "SUCCESS"
-    assert response["data"] == data
+    assert body["responseCode"] == "200"
+    assert body["responseStatus"] == "SUCCESS"
+    assert body["data"] == data
     
     # Test with complex data
     data = {
@@ -22,19 +35,21 @@ def test_success_response():
         }
     }
     response = success_response(data)
+    body = json.loads(response.body)
     
-    assert response["responseCode"] == "200"
-    assert response["responseStatus"] == "SUCCESS"
-    assert response["data"] == data
+    assert body["responseCode"] == "200"
+    assert body["responseStatus"] == "SUCCESS"
+    assert body["data"] == data
 
 
 def test_error_response():
     """Test the error_response utility function."""
     response = error_response("404", "NOT_FOUND", "Resource not found")
+    body = json.loads(response.body)
     
-    assert response["responseCode"] == "404"
-    assert response["responseStatus"] == "NOT_FOUND"
-    assert response["data"]["message"] == "Resource not found"
+    assert body["responseCode"] == "404"
+    assert body["responseStatus"] == "NOT_FOUND"
+    assert body["data"]["message"] == "Resource not found"
 
 
 def test_validation_error_response():
@@ -45,10 +60,11 @@ def test_validation_error_response():
     ]
     
     response = validation_error_response(errors)
+    body = json.loads(response.body)
     
-    assert response["responseCode"] == "422"
-    assert response["responseStatus"] == "VALIDATION_ERROR"
-    assert response["data"]["errors"] == errors
+    assert body["responseCode"] == "422"
+    assert body["responseStatus"] == "VALIDATION_ERROR"
+    assert body["data"]["errors"] == errors
 
 
 def test_pagination_response():
@@ -60,14 +76,15 @@ def test_pagination_response():
     offset = 0
     
     response = pagination_response(items, total, limit, offset)
+    body = json.loads(response.body)
     
-    assert response["responseCode"] == "200"
-    assert response["responseStatus"] == "SUCCESS"
-    assert response["data"]["items"] == items
-    assert response["data"]["pagination"]["total"] == total
-    assert response["data"]["pagination"]["limit"] == limit
-    assert response["data"]["pagination"]["offset"] == offset
-    assert response["data"]["pagination"]["has_more"] is False
+    assert body["responseCode"] == "200"
+    assert body["responseStatus"] == "SUCCESS"
+    assert body["data"]["items"] == items
+    assert body["data"]["pagination"]["total"] == total
+    assert body["data"]["pagination"]["limit"] == limit
+    assert body["data"]["pagination"]["offset"] == offset
+    assert body["data"]["pagination"]["has_more"] is False
     
     # Test with has_more = True
     items = [{"id": 1, "name": "Item 1"}, {"id": 2, "name": "Item 2"}]
@@ -76,11 +93,128 @@ def test_pagination_response():
     offset = 0
     
     response = pagination_response(items, total, limit, offset)
+    body = json.loads(response.body)
+    
+    assert body["responseCode"] == "200"
+    assert body["responseStatus"] == "SUCCESS"
+    assert body["data"]["items"] == items
+    assert body["data"]["pagination"]["total"] == total
+    assert body["data"]["pagination"]["limit"] == limit
+    assert body["data"]["pagination"]["offset"] == offset
+    assert body["data"]["pagination"]["has_more"] is True
+
+
+def test_pagination_response_cursor_mode():
+    """Test the pagination_response utility function with a cursor."""
+    items = [{"id": 3, "name": "Item 3"}, {"id": 4, "name": "Item 4"}]
+    
+    response = pagination_response(items, 10, 2, 0, next_cursor="abc", has_more=True)
+    body = json.loads(response.body)
+    assert body["data"]["pagination"]["has_more"] is True
+    assert body["data"]["pagination"]["next_cursor"] == "abc"
+    
+    response = pagination_response(items, 10, 2, 0, next_cursor="abc", has_more=False)
+    body = json.loads(response.body)
+    assert body["data"]["pagination"]["has_more"] is False
+    assert body["data"]["pagination"]["next_cursor"] is None
+    
+    # Offset mode drops the cursor on the last page
+    response = pagination_response(items, 2, 2, 0, next_cursor="abc")
+    body = json.loads(response.body)
+    assert body["data"]["pagination"]["has_more"] is False
+    assert body["data"]["pagination"]["next_cursor"] is None
+
+
+def test_cursor_round_trip():
+    """Test encoding and decoding pagination cursors."""
+    cursor = encode_cursor(42)
+    assert decode_cursor(cursor) == 42
+    assert next_cursor([{"id": 1}, {"id": 2}], 2) == encode_cursor(2)
+    assert next_cursor([{"id": 1}], 2) is None
+    
+    with pytest.raises(ValidationException):
+        decode_cursor("not-a-cursor")
+
+
+def test_pagination_response_without_total():
+    """Test the pagination_response utility function when no total was counted."""
+    items = [{"id": 1, "name": "Item 1"}]
+    
+    response = pagination_response(items, None, 1, 0, has_more=True, count_mode="none")
+    body = json.loads(response.body)
+    
+    assert body["data"]["pagination"]["total"] is None
+    assert body["data"]["pagination"]["has_more"] is True
+    assert body["data"]["pagination"]["count_mode"] == "none"
+
+
+def test_conditional_validators():
+    """Test ETag construction and If-None-Match evaluation."""
+    from datetime import datetime, timezone
+    from starlette.requests import Request
+    from app.utils.conditional import collection_etag, entity_etag, is_not_modified
+    from app.utils.pagination import CountMode, Page
+    
+    def make_request(headers):
+        return Request({
+            "type": "http",
+            "headers": [(key.lower().encode(), value.encode()) for key, value in headers.items()]
+        })
+    
+    updated_at = datetime(2024, 1, 1, 12, 0, 0, tzinfo=timezone.utc)
+    item = {"id": 1, "price": 100, "updated_at": updated_at}
+    etag = entity_etag("item", item)
+    assert etag.startswith('W/"')
+    
+    # ETags follow the content, even when the update time is unchanged
+    assert entity_etag("item", {**item, "id": 2}) != etag
+    assert entity_etag("item", {**item, "price": 200}) != etag
+    assert entity_etag("item", item, ["id", "price"]) != etag
+    
+    # Weak comparison, lists of tags and wildcards
+    assert is_not_modified(make_request({"If-None-Match": etag[2:]}), etag)
+    assert is_not_modified(make_request({"If-None-Match": f'"other", {etag}'}), etag)
+    assert is_not_modified(make_request({"If-None-Match": "*"}), etag)
+    assert not is_not_modified(make_request({"If-None-Match": '"other"'}), etag)
+    assert not is_not_modified(make_request({}), etag)
+    
+    # Pages depend on their rows, whether more rows follow and the total
+    rows = [{"id": 1, "price": 100, "updated_at": updated_at}]
+    etag = collection_etag("items", Page(rows, 1, False, CountMode.EXACT))
+    assert collection_etag("items", Page(rows, 1, True, CountMode.EXACT)) != etag
+    assert collection_etag("items", Page(rows, 2, False, CountMode.EXACT)) != etag
+    assert collection_etag("items", Page([{**rows[0], "price": 200}], 1, False, CountMode.EXACT)) != etag
+    assert collection_etag("items", Page(rows, None, False, CountMode.NONE)) != etag
+
+
+@pytest.mark.parametrize("backend", ["orjson", "pydantic", "json"])
+def test_json_backends_match_jsonable_encoder(backend):
+    """Test that every JSON backend renders the envelope like jsonable_encoder."""
+    data = {
+        "id": 1,
+        "name": "Test",
+        "tags": ["a", "b"],
+        "created_at": datetime(2024, 1, 2, 3, 4, 5, 678000),
+        "description": None
+    }
+    
+    rendered = get_json_dumps(backend)(data)
+    
+    assert json.loads(rendered) == jsonable_encoder(data)
+
+
+def test_envelope_response_rendering():
+    """Test that envelope helpers render the body, status and headers."""
+    response = success_response({"id": 1}, status_code=201, headers={"X-Test": "1"})
+    
+    assert response.status_code == 201
+    assert response.headers["x-test"] == "1"
+    assert json.loads(response.body) == {
+        "responseCode": "200",
+        "responseStatus": "SUCCESS",
+        "data": {"id": 1}
+    }
     
-    assert response["responseCode"] == "200"
-    assert response["responseStatus"] == "SUCCESS"
-    assert response["data"]["items"] == items
-    assert response["data"]["pagination"]["total"] == total
-    assert response["data"]["pagination"]["limit"] == limit
-    assert response["data"]["pagination"]["offset"] == offset
-    assert response["data"]["pagination"]["has_more"] is True
+    response = error_response("404", "NOT_FOUND", "Missing")
+    assert response.status_code == 404
+    assert json.loads(response.body)["data"] == {"message": "Missing"}